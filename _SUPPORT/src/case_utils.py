@@ -1,18 +1,69 @@
+from __future__ import annotations
+
+import importlib.abc
+import importlib.util
 import os, pprint
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
 import numpy as np
-import matplotlib.pyplot as plt
 import yaml
 import zipfile
 
-from shapely.geometry import Point, Polygon
-import geopandas as gpd
-from typing import Tuple, List, Dict, Optional
+from typing import TYPE_CHECKING, Tuple, List, Dict, Optional
+
+if TYPE_CHECKING:
+    import flopy
+
+# matplotlib, flopy, shapely, pandas and numba are imported inside the
+# functions that need them: importing flopy alone pulls in matplotlib and
+# hundreds of submodules, while many callers only lint configs or load YAML.
+# The figure defaults below still apply as soon as matplotlib gets imported.
+
+
+def _apply_mpl_defaults(mpl):
+    """This module's figure defaults (historically set when it was imported)."""
+    mpl.rcParams['figure.figsize'] = (8, 6)
+
+
+class _MplDefaultsFinder(importlib.abc.MetaPathFinder):
+    """One-shot import hook: apply the figure defaults right after matplotlib
+    is first imported, by anyone, so notebooks that import this module and
+    then plot with matplotlib directly look as they did before the lazy import."""
+
+    def find_spec(self, name, path, target=None):
+        if name != 'matplotlib':
+            return None
+        sys.meta_path.remove(self)
+        spec = importlib.util.find_spec(name)
+        if spec is None or spec.loader is None:
+            return spec
+        exec_module = spec.loader.exec_module
+
+        def _exec_module(module):
+            exec_module(module)
+            _apply_mpl_defaults(module)
+
+        spec.loader.exec_module = _exec_module
+        return spec
+
+
+if 'matplotlib' in sys.modules:
+    _apply_mpl_defaults(sys.modules['matplotlib'])
+else:
+    sys.meta_path.insert(0, _MplDefaultsFinder())
+
+
+@lru_cache(maxsize=1)
+def _configure_mpl():
+    """Import pyplot (the figure defaults are applied by the import hook)."""
+    import matplotlib.pyplot as plt
+    return plt
 
-import flopy
-from flopy.utils import HeadFile, CellBudgetFile
 
-plt.rcParams['figure.figsize'] = (8, 6)
 def ensure_dir(p):
     Path(p).mkdir(parents=True, exist_ok=True)
 
@@ -20,39 +71,107 @@ def load_yaml(path):
     with open(path, 'r', encoding='utf-8') as f:
         return yaml.safe_load(f)
 
-def unzip_file(zip_path, extract_to=None):
-    print(f"Checking zip file: {zip_path}")
-    print(f"File size: {os.path.getsize(zip_path)} bytes")
+def _extract_members_parallel(zip_ref, names, extract_to, max_workers):
+    """
+    Extract ``names`` from the open archive ``zip_ref`` on a thread pool.
+
+    ZipFile objects are not safe to share between reading threads, so the
+    first worker reuses ``zip_ref`` (the caller is blocked meanwhile) and
+    every other worker opens its own handle; zlib releases the GIL while
+    inflating. Parent directories are created up front to avoid ``mkdir``
+    races.
+    """
+    for name in names:
+        parts = [p for p in name.replace('\\', '/').split('/')[:-1] if p not in ('', '.', '..')]
+        if parts:
+            os.makedirs(os.path.join(extract_to, *parts), exist_ok=True)
+
+    local = threading.local()
+    spare = [zip_ref]
+    opened = []
+    lock = threading.Lock()
+
+    def _extract(name):
+        zf = getattr(local, 'zf', None)
+        if zf is None:
+            with lock:
+                zf = spare.pop() if spare else None
+            if zf is None:
+                zf = zipfile.ZipFile(zip_ref.filename, 'r')
+                with lock:
+                    opened.append(zf)
+            local.zf = zf
+        zf.extract(name, extract_to)
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(_extract, names))
+    finally:
+        for zf in opened:
+            zf.close()
+
+
+def unzip_file(zip_path, extract_to=None, members=None, verbose=False, max_workers=None):
+    """
+    Extract a zip archive, opening it (and parsing its central directory) once.
+
+    Archives with several members are extracted on a thread pool.
+
+    Parameters:
+    -----------
+    zip_path : str
+        Path to the zip archive
+    extract_to : str, optional
+        Target folder. Defaults to the folder containing ``zip_path``.
+    members : list of str, optional
+        Subset of archive members to extract. If None, extracts everything.
+    verbose : bool, default False
+        Print a short preview of the archive contents and progress messages.
+    max_workers : int, optional
+        Extraction threads. Defaults to min(8, CPU count); 1 extracts serially.
+
+    Returns:
+    --------
+    list of str
+        Names of the extracted archive members
+    """
     if extract_to is None:
         extract_to = os.path.dirname(zip_path)
-    print(f"Extracting to: {extract_to}")
-    # Check if it's a valid zip file
+    if verbose:
+        print(f"Checking zip file: {zip_path}")
+        print(f"File size: {os.path.getsize(zip_path)} bytes")
+        print(f"Extracting to: {extract_to}")
     try:
         with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            print("✓ Zip file is valid")
-            files = zip_ref.namelist()
-            print(f"Contains {len(files)} files:")
-            for f in files[:5]:  # Show first 5 files
-                print(f"  {f}")
-            if len(files) > 5:
-                print(f"  ... and {len(files)-5} more")
-                
-            # Try extraction
-            extract_path = os.path.dirname(zip_path)
-            zip_ref.extractall(extract_path)
-            print(f"✓ Extraction successful to {extract_path}")
-            
+            names = zip_ref.namelist() if members is None else list(members)
+            if verbose:
+                print("✓ Zip file is valid")
+                print(f"Contains {len(names)} files:")
+                for f in names[:5]:  # Show first 5 files
+                    print(f"  {f}")
+                if len(names) > 5:
+                    print(f"  ... and {len(names)-5} more")
+
+            n_workers = max_workers or min(8, os.cpu_count() or 1)
+            if n_workers > 1 and len(names) > 1:
+                _extract_members_parallel(zip_ref, names, extract_to, n_workers)
+            else:
+                zip_ref.extractall(extract_to, members=None if members is None else names)
+            if verbose:
+                print(f"✓ Extraction successful to {extract_to}")
+        return names
+
     except zipfile.BadZipFile as e:
         print(f"✗ Bad zip file: {e}")
-        
+
         # Check first few bytes
         with open(zip_path, 'rb') as f:
             header = f.read(10)
             print(f"File header: {header.hex()}")
             print(f"As text: {header}")
-            
-        raise e   
-    
+
+        raise e
+
 def get_scenario_for_group(config_path, group_number):
     """
     Load the YAML config and return the scenario parameters for the given group number.
@@ -336,6 +455,8 @@ def plot_wells_on_model(m, wells_gdf, concession_id, modelgrid=None, source_poin
     source_point : geopandas.GeoDataFrame, optional
         GeoDataFrame containing the contamination source location
     """
+    import flopy
+    plt = _configure_mpl()
     fig, ax = plt.subplots(figsize=(14, 12))
 
     # Use the model's own modelgrid if not provided
@@ -422,33 +543,145 @@ def plot_wells_on_model(m, wells_gdf, concession_id, modelgrid=None, source_poin
 
 
 def recarray_from_wells(wells):
+    """
+    Build a (k, i, j, flux) structured array from a list of well dicts
+    with 'layer', 'row', 'col' and 'rate' keys. Columns are filled one
+    at a time rather than record by record.
+    """
     dtype = [('k', int), ('i', int), ('j', int), ('flux', float)]
-    arr = np.zeros((len(wells),), dtype=dtype)
-    for idx, w in enumerate(wells):
-        arr[idx] = (w['layer'], w['row'], w['col'], w['rate'])
+    n = len(wells)
+    arr = np.empty((n,), dtype=dtype)
+    for field, key in (('k', 'layer'), ('i', 'row'), ('j', 'col'), ('flux', 'rate')):
+        arr[field] = np.fromiter((w[key] for w in wells), dtype=arr.dtype[field], count=n)
     return arr
 
+# Below this many sample points the numpy gather is faster than the
+# JIT-compiled kernel (compilation is cached, but dispatch is not free).
+_NUMBA_GATHER_MIN_POINTS = 10_000
+
+
+@lru_cache(maxsize=1)
+def _numba_gather_kernel():
+    """Compile the parallel gather kernel on first use; None without numba."""
+    try:  # optional JIT for large head-sampling requests
+        from numba import njit, prange
+    except ImportError:
+        return None
+
+    @njit(parallel=True, cache=True)
+    def _gather_heads_numba(arr, ks, is_, js, out):
+        for n in prange(ks.shape[0]):
+            out[n] = arr[ks[n], is_[n], js[n]]
+
+    return _gather_heads_numba
+
+
+def _gather_heads(arr, ks, is_, js):
+    """arr[ks, is_, js] as float64, using the numba kernel for large in-bounds requests."""
+    if (ks.shape[0] >= _NUMBA_GATHER_MIN_POINTS and arr.ndim == 3
+            and min(ks.min(), is_.min(), js.min()) >= 0
+            and ks.max() < arr.shape[0] and is_.max() < arr.shape[1] and js.max() < arr.shape[2]):
+        kernel = _numba_gather_kernel()
+        if kernel is not None:
+            out = np.empty(ks.shape[0], dtype=np.float64)
+            kernel(np.asarray(arr), ks, is_, js, out)
+            return out
+    return np.asarray(arr[ks, is_, js], dtype=float)
+
+
+@lru_cache(maxsize=16)
+def _cached_headfile(path, mtime_ns, size):
+    from flopy.utils import HeadFile
+    hf = HeadFile(path)
+    hf.close()  # keep the parsed record index only; reopened per read
+    return hf
+
+
+@lru_cache(maxsize=16)
+def _cached_budgetfile(path, mtime_ns, size):
+    from flopy.utils import CellBudgetFile
+    cbc = CellBudgetFile(path)
+    cbc.close()
+    return cbc
+
+
+_OUTPUT_FILE_LOCK = threading.Lock()
+
+
+@contextmanager
+def _open_output_file(opener, path):
+    """
+    Yield a MODFLOW binary output reader whose record index is reused while
+    the file is unchanged (keyed on absolute path, mtime_ns and size).
+
+    The underlying file is only open inside the ``with`` block, so a model
+    rerun can overwrite ``.hds``/``.cbc`` between calls (Windows refuses to
+    replace files that are held open).
+    """
+    abspath = os.path.abspath(path)
+    st = os.stat(abspath)
+    with _OUTPUT_FILE_LOCK:
+        reader = opener(abspath, st.st_mtime_ns, st.st_size)
+        reader.file = open(reader.filename, 'rb')
+        try:
+            yield reader
+        finally:
+            reader.file.close()
+
+
+def clear_output_file_cache():
+    """Forget the cached head/budget file indexes (e.g. after deleting outputs)."""
+    with _OUTPUT_FILE_LOCK:
+        _cached_headfile.cache_clear()
+        _cached_budgetfile.cache_clear()
+
+
 def summarize_budget(cbc_path, terms, kstpkper=(0,0)):
-    cbc = CellBudgetFile(cbc_path)
+    """
+    Sum the first budget record matching each term at ``kstpkper``.
+
+    The record index is filtered to the requested time step once and all
+    terms are looked up in that subset. Terms that are missing (or whose
+    data cannot be summed) map to None.
+    """
     out = {}
-    for t in terms:
-        try:
-            data = cbc.get_data(text=t, kstpkper=kstpkper)
-            if data:
-                out[t] = float(np.sum(data[0]))
-            else:
+    with _open_output_file(_cached_budgetfile, cbc_path) as cbc:
+        rec = cbc.recordarray
+        kstp, kper = kstpkper
+        in_step = np.flatnonzero((rec['kstp'] == kstp + 1) & (rec['kper'] == kper + 1))
+        step_texts = [(idx, bytes(rec['text'][idx]).upper()) for idx in in_step]
+        for t in terms:
+            try:
+                key = t.upper().encode()
+                idx = next((idx for idx, text in step_texts if key in text), None)
+                if idx is None:
+                    out[t] = None
+                else:
+                    out[t] = float(np.sum(cbc.get_record(idx)))
+            except Exception:
                 out[t] = None
-        except Exception:
-            out[t] = None
     return out
 
-def sample_heads(hds_path, lrc_list, kstpkper=None):
-    hf = HeadFile(hds_path)
-    arr = hf.get_data(kstpkper=kstpkper) if kstpkper is not None else hf.get_data()[-1]
-    samples = []
-    for (k,i,j) in lrc_list:
-        samples.append({'k':k, 'i':i, 'j':j, 'head': float(arr[k, i, j])})
-    return samples
+def sample_heads(hds_path, lrc_list, kstpkper=None, as_dataframe=False):
+    """
+    Sample simulated heads at (layer, row, col) cells.
+
+    All cells are gathered in one vectorised call (a parallel numba kernel
+    for very large requests when numba is installed). Returns a list of
+    {'k', 'i', 'j', 'head'} dicts, or a DataFrame with those columns if
+    ``as_dataframe`` is True.
+    """
+    with _open_output_file(_cached_headfile, hds_path) as hf:
+        # get_data() without arguments returns the last saved record (nlay, nrow, ncol)
+        arr = hf.get_data(kstpkper=kstpkper) if kstpkper is not None else hf.get_data()
+    lrc = np.asarray(lrc_list, dtype=np.intp).reshape(-1, 3)
+    ks, is_, js = lrc[:, 0], lrc[:, 1], lrc[:, 2]
+    heads = _gather_heads(arr, ks, is_, js)
+    if as_dataframe:
+        import pandas as pd
+        return pd.DataFrame({'k': ks, 'i': is_, 'j': js, 'head': heads})
+    return [{'k': k, 'i': i, 'j': j, 'head': h}
+            for k, i, j, h in zip(ks.tolist(), is_.tolist(), js.tolist(), heads.tolist())]
 
 
 class BoundaryHeadExtractor:
@@ -583,7 +816,8 @@ class BoundaryHeadExtractor:
             3D array of heads [nlay, nrow, ncol]
         """
         try:
-            hds = flopy.utils.HeadFile(self.head_file_path)
+            from flopy.utils import HeadFile
+            hds = HeadFile(self.head_file_path)
             
             # Get available time steps and stress periods
             available_kstpkper = hds.get_kstpkper()
@@ -767,7 +1001,7 @@ class BoundaryHeadExtractor:
             Submodel grid information
         """
         try:
-            import matplotlib.pyplot as plt
+            plt = _configure_mpl()
         except ImportError:
             print("Matplotlib not available for visualization")
             return
@@ -810,6 +1044,8 @@ def plot_submodel_extent_on_parent_model(m, modelgrid, wells_gdf, concession_id,
     submodel_grid : dict
         Dictionary containing submodel grid information
     """
+    import flopy
+    plt = _configure_mpl()
     fig, ax = plt.subplots(figsize=(14, 12))
 
     # Use the provided modelgrid for proper coordinate handling
@@ -951,7 +1187,8 @@ def extract_boundary_heads_from_clipped_polygon(parent_model, parent_heads, clip
     Extract boundary heads only along the clipped submodel boundary.
     This ensures we only get CHD cells where the parent model is active.
     """
-    
+    from shapely.geometry import Polygon
+
     # Get boundary cells by finding submodel cells that intersect the clipped boundary
     boundary_cells = []
     
@@ -1,6 +1,9 @@
+import io
 import os
+import re
+import numpy as np
 import pandas as pd
-import glob
+from concurrent.futures import ThreadPoolExecutor
 
 import matplotlib.pyplot as plt
 try:  # unified caption styling
@@ -9,8 +12,129 @@ except Exception:  # fallback if style_utils not available
     apply_caption_style = None
     FIGURE_CAPTION_STYLE = {}
 
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep',
+          'Oct', 'Nov', 'Dec']
+
+# Bump whenever the parsed output changes (columns, dtypes) so stale caches
+# written by an older parser are not served
+_CLIMATE_CACHE_VERSION = 2  # 2: float32 monthly block
+
+# Variable short name in e.g. climate-reports-normtables_rre150m0_1991-2020.txt
+_VARNAME_RE = re.compile(r'^climate-reports-normtables_([^_-]+)')
+
 # region data processing
-def read_climate_data(data_path, station_string="Fluntern"):
+def _sniff_encoding(raw):
+    """
+    Return the text encoding of a MeteoSwiss file given its raw bytes.
+
+    The files are either UTF-8 or a Western-European single-byte encoding;
+    latin-1 decodes any byte sequence, so it is the fallback.
+    """
+    try:
+        raw.decode('utf-8')
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return 'latin-1'
+
+
+def _parse_normtable(filepath, station_string):
+    """
+    Parse one MeteoSwiss normtable file.
+
+    Returns ``(shortname, longname, monthly_values)`` with the 12 monthly
+    values as a float32 array (non-numeric entries become NaN), or None
+    (after printing the reason) if the file cannot be parsed or does not
+    contain the requested station.
+    """
+    # Extract varname from filename
+    filename = os.path.basename(filepath)
+    m = _VARNAME_RE.match(filename)
+    varname = m.group(1) if m else filename.split('-')[-2].split('_')[1]
+
+    try:
+        # Read the file once and decode it with the sniffed encoding
+        with open(filepath, 'rb') as f:
+            raw = f.read()
+        text = raw.decode(_sniff_encoding(raw))
+
+        # Read the variable name from line 6 (header lines only)
+        lines = text.split('\n', 7)
+        try:
+            varname_long = lines[6].strip()  # Line 6 (index 5)
+            #print(f"Extracted varname: {varname_long}")
+        except IndexError:
+            print(f"Warning: Could not extract varname from {filename}. Skipping file.")
+            return None
+
+        # Read the data from line 8 onwards (station + monthly columns only)
+        df = pd.read_csv(io.StringIO(text), skiprows=7, sep='\t', engine='c',
+                         usecols=['Station'] + MONTHS)
+
+        # Filter for the specified station (first match only)
+        station_data = df[df['Station'].str.contains(station_string, na=False)]
+
+        if station_data.empty:
+            print(f"Station {station_string} not found in {filename}")
+            return None
+
+        monthly_values = pd.to_numeric(station_data.iloc[0][MONTHS], errors='coerce')
+        return varname, varname_long, monthly_values.to_numpy(dtype=np.float32)
+
+    except Exception as e:
+        print(f"Error reading {filename}: {e}")
+        return None
+
+
+def _climate_cache_path(data_path, station_string):
+    """Location of the parsed-data cache for one station."""
+    safe = re.sub(r'[^0-9A-Za-z_-]+', '_', station_string)
+    return os.path.join(data_path, f'.climate_cache_{safe}.npz')
+
+
+def _files_signature(entries):
+    """Cache format version plus (name, mtime_ns, size) for every input DirEntry."""
+    sig = []
+    for e in sorted(entries, key=lambda e: e.name):
+        st = e.stat()
+        sig.append((e.name, st.st_mtime_ns, st.st_size))
+    return repr((_CLIMATE_CACHE_VERSION, tuple(sig)))
+
+
+def _climate_frame(shortnames, longnames, station_string, months_arr):
+    """Metadata columns plus one contiguous (n_files, 12) float32 block."""
+    meta = pd.DataFrame(
+        {'shortname': list(shortnames), 'longname': list(longnames),
+         'station': [station_string] * len(months_arr)},
+    )
+    return pd.concat([meta, pd.DataFrame(months_arr, columns=MONTHS)], axis=1)
+
+
+def _load_climate_cache(cache_path, signature, station_string):
+    """Cached DataFrame if its signature matches, else None (plain arrays, no pickle)."""
+    try:
+        with np.load(cache_path, allow_pickle=False) as npz:
+            if str(npz['signature']) != signature:
+                return None
+            return _climate_frame(npz['shortname'].tolist(), npz['longname'].tolist(),
+                                  station_string, npz['values'])
+    except Exception:
+        return None  # missing, unreadable or outdated cache: re-parse
+
+
+def _save_climate_cache(cache_path, signature, df):
+    """Store the frame as plain NumPy arrays next to the data files."""
+    try:
+        with open(cache_path, 'wb') as f:
+            np.savez(f, signature=np.array(signature),
+                     shortname=df['shortname'].to_numpy(dtype=str),
+                     longname=df['longname'].to_numpy(dtype=str),
+                     values=df[MONTHS].to_numpy())
+    except OSError:
+        pass  # read-only data folder: caching is best effort
+
+
+def read_climate_data(data_path, station_string="Fluntern", max_workers=None,
+                      use_cache=True):
     """
     Reads climate data for a specific station from a directory of MeteoSwiss 
     text files.
@@ -19,6 +143,11 @@ def read_climate_data(data_path, station_string="Fluntern"):
         data_path (str): Path to the directory containing the climate data files.
         station_string (str, optional): String to search for in the station name. 
             Defaults to "Fluntern".
+        max_workers (int, optional): Number of threads used to parse the 
+            files in parallel. Defaults to min(32, number of files).
+        use_cache (bool, optional): Reuse the parsed result stored next to 
+            the data files (``.climate_cache_<station>.npz``) as long as 
+            no normtable file was added, removed or modified. Defaults to True.
 
     Returns:
         pandas.DataFrame: A DataFrame containing the monthly climate data for 
@@ -36,91 +165,45 @@ def read_climate_data(data_path, station_string="Fluntern"):
     Accessed: 2025-05-01
     """
 
-    # Test if the data_path exists
-    if not os.path.exists(data_path):
+    # List the normtable files in one directory scan (DirEntry caches stat)
+    try:
+        with os.scandir(data_path) as it:
+            entries = [
+                e for e in it
+                if e.name.startswith('climate-reports-normtables_')
+                and e.name.endswith('.txt') and e.is_file()
+            ]
+    except FileNotFoundError:
         raise FileNotFoundError(f"The specified data path does not exist: {data_path}")
+    except NotADirectoryError:
+        entries = []
 
-    all_files = glob.glob(os.path.join(data_path, 'climate-reports-normtables_*.txt'))
-    
-    if not all_files:
+    if not entries:
         raise FileNotFoundError(f"No climate data files found in {data_path}")
-
-    all_data = []
-    for filepath in all_files:
-        # Extract varname from filename
-        filename = os.path.basename(filepath)
-        varname = filename.split('-')[-2].split('_')[1]
-
-        try:
-            # Read the variable name from line 6
-            try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    lines = f.readlines()
-            except UnicodeDecodeError:
-                try:
-                    with open(filepath, 'r', encoding='latin-1') as f:
-                        lines = f.readlines()
-                except UnicodeDecodeError:
-                    with open(filepath, 'r', encoding='cp1252') as f:
-                        lines = f.readlines()
-            try:
-                varname_long = lines[6].strip()  # Line 6 (index 5)
-                #print(f"Extracted varname: {varname_long}")
-            except IndexError:
-                print(f"Warning: Could not extract varname from {filename}. Skipping file.")
-                continue
-
-            # Read the data from line 8 onwards
-            try:
-                df = pd.read_csv(filepath, skiprows=7, sep=r'\t', encoding='utf-8', engine='python')
-            except UnicodeDecodeError:
-                try:
-                    df = pd.read_csv(filepath, skiprows=7, sep=r'\t', encoding='latin-1', engine='python')
-                except UnicodeDecodeError:
-                    df = pd.read_csv(filepath, skiprows=7, sep=r'\t', encoding='cp1252', engine='python')
-
-            # Filter for the specified station
-            station_data = df[df['Station'].str.contains(station_string, na=False)]
-
-            if station_data.empty:
-                print(f"Station {station_string} not found in {filename}")
-                continue
-
-            # Extract monthly data
-            monthly_values = station_data[
-                ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 
-                 'Oct', 'Nov', 'Dec']
-                 ].values.flatten().tolist()
-            
-            # Create a dictionary for the current file
-            file_data = {
-                'shortname': varname,
-                'longname': varname_long,
-                'station': station_string,
-                'Jan': monthly_values[0],
-                'Feb': monthly_values[1],
-                'Mar': monthly_values[2],
-                'Apr': monthly_values[3],
-                'May': monthly_values[4],
-                'Jun': monthly_values[5],
-                'Jul': monthly_values[6],
-                'Aug': monthly_values[7],
-                'Sep': monthly_values[8],
-                'Oct': monthly_values[9],
-                'Nov': monthly_values[10],
-                'Dec': monthly_values[11]
-            }
-            all_data.append(file_data)
-        
-        except Exception as e:
-            print(f"Error reading {filename}: {e}")
-            continue
-
-    # Create DataFrame
-    df = pd.DataFrame(all_data)
-    if df.empty:
+    all_files = [e.path for e in entries]
+
+    cache_path = _climate_cache_path(data_path, station_string)
+    signature = _files_signature(entries)
+    if use_cache:
+        cached = _load_climate_cache(cache_path, signature, station_string)
+        if cached is not None:
+            return cached
+
+    n_workers = max_workers or min(32, len(all_files))
+    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+        results = executor.map(
+            lambda fp: _parse_normtable(fp, station_string), all_files
+        )
+        parsed = [r for r in results if r is not None]
+
+    if not parsed:
         return pd.DataFrame()  # Return an empty DataFrame if no data was loaded
-    
+
+    months_arr = np.vstack([values for _, _, values in parsed])
+    df = _climate_frame([p[0] for p in parsed], [p[1] for p in parsed],
+                        station_string, months_arr)
+    if use_cache:
+        _save_climate_cache(cache_path, signature, df)
     return df
 
 # endregion 
@@ -178,35 +261,24 @@ def plot_climate_data(df, station_string="Fluntern", custom_title=None):
         print(f"No data found for station {station_string}.")
         return None, None
 
-    # Extract precipitation and temperature data
-    # The correct syntax is to put the closing bracket after 'shortname'
-    precipitation = df.loc[
-        df['shortname'] == 'rre150m0', 
-        ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 
-        'Nov', 'Dec']].T
-    temperature = df.loc[
-        df['shortname'] == 'tre200m0', 
-        ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 
-        'Nov', 'Dec']].T
-    temp_min = df.loc[
-        df['shortname'] == 'tre2dymn', 
-        ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 
-         'Nov', 'Dec']].T
-    temp_max = df.loc[
-        df['shortname'] == 'tre2dymx', 
-        ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 
-         'Nov', 'Dec']].T
+    # Pivot once to months x shortname (first row per variable) and pick
+    # the precipitation and temperature series by shortname
+    wide = df.drop_duplicates('shortname').set_index('shortname')[MONTHS].T
+    precipitation = wide['rre150m0']
+    temperature = wide['tre200m0']
+    temp_min = wide['tre2dymn']
+    temp_max = wide['tre2dymx']
 
     # Sum precipation over the year
-    annual_precipitation = precipitation.sum(axis=1)
+    annual_precipitation = precipitation.sum()
     # Calculate the annual mean temperature
-    annual_mean_temp = temperature.mean(axis=1)
+    annual_mean_temp = temperature.mean()
 
     # Create the plot
     fig, ax1 = plt.subplots(figsize=(10, 6))
 
     # Plot precipitation as blue bars with inverted y-axis
-    ax1.bar(precipitation.index, precipitation.iloc[:, 0], color='darkblue', 
+    ax1.bar(precipitation.index, precipitation.values, color='darkblue', 
             alpha=0.7, label='Precipitation')
     ax1.set_xlabel('Month')
     ax1.set_ylabel('Precipitation (mm)', color='darkblue')
@@ -217,11 +289,11 @@ def plot_climate_data(df, station_string="Fluntern", custom_title=None):
     ax2 = ax1.twinx()
 
     # Add shaded area between min and max temperatures
-    ax2.fill_between(temp_min.index, temp_min.iloc[:, 0], temp_max.iloc[:, 0], 
+    ax2.fill_between(temp_min.index, temp_min.values, temp_max.values, 
                  color='red', alpha=0.2, label='Temperature Range')
 
     # Plot temperature as a red line
-    ax2.plot(temperature.index, temperature, color='red', alpha=0.7, 
+    ax2.plot(temperature.index, temperature.values, color='red', alpha=0.7, 
              label='Temperature')
     ax2.set_ylabel('Temperature (°C)', color='red')
     ax2.tick_params(axis='y', labelcolor='red')
@@ -232,8 +304,8 @@ def plot_climate_data(df, station_string="Fluntern", custom_title=None):
     ax2.legend(loc='upper right')
 
     # Set title and legend
-    precip_val = int(annual_precipitation.sum().round())
-    mean_temp_val = round(annual_mean_temp.mean(), 1)
+    precip_val = int(round(float(annual_precipitation)))
+    mean_temp_val = round(float(annual_mean_temp), 1)
     if custom_title:
         base_title = custom_title.strip()
     else:
@@ -2,10 +2,17 @@ import os
 os.environ.setdefault("GDAL_NUM_THREADS", "ALL_CPUS")
 os.environ.setdefault("OMP_NUM_THREADS", str(os.cpu_count() or 1))
 
+import math
 import sys
+import shutil
+import types
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from tqdm.notebook import tqdm
 from urllib.parse import urlparse
 from typing import Union, Optional, Literal
 
@@ -14,36 +21,44 @@ import numpy as np
 from rasterio.windows import from_bounds
 from rasterio.vrt import WarpedVRT
 from rasterio.enums import Resampling
-from rasterio.transform import rowcol
-from scipy.ndimage import map_coordinates
+from rasterio.transform import Affine, from_origin
 
 
-def find_project_root(marker_files=['config.py', 'config_template.py']):
-    """Find the project root by searching for a list of marker files."""
+def _search_up(path, marker_files):
+    """First directory from ``path`` upwards holding one of ``marker_files``, else None."""
+    while os.path.dirname(path) != path: # Stop at filesystem root
+        if any(os.path.isfile(os.path.join(path, m)) for m in marker_files):
+            return path
+        path = os.path.dirname(path)
+    return None
+
+
+@lru_cache(maxsize=8)
+def _find_project_root(cwd, marker_files):
     # Start from current working directory. In a locally run Jupyter notebook, 
     # this will be the directory where the notebook is located.
     # In a JupyterHub environment, it will be the user's home directory.
-    path = os.getcwd()
-    # Traverse up the directory tree until we find the marker file
-    # or reach the filesystem root.
-    while os.path.dirname(path) != path: # Stop at filesystem root
-        for marker in marker_files:
-            if os.path.exists(os.path.join(path, marker)):
-                return path
-        path = os.path.dirname(path)
-    
+    path = _search_up(cwd, marker_files)
+    if path is not None:
+        return path
+
     # Fallback 
     # If running as a script, __file__ might be available
     try:
-        path = os.path.dirname(os.path.abspath(__file__))
-        while os.path.dirname(path) != path:
-            for marker in marker_files:
-                if os.path.exists(os.path.join(path, marker)):
-                    return path
-            path = os.path.dirname(path)
+        path = _search_up(os.path.dirname(os.path.abspath(__file__)), marker_files)
     except NameError:
-        pass # __file__ is not defined in interactive environments
-    raise FileNotFoundError(f"Project root with one of {marker_files} not found.")
+        path = None # __file__ is not defined in interactive environments
+    if path is not None:
+        return path
+    raise FileNotFoundError(f"Project root with one of {list(marker_files)} not found.")
+
+
+def find_project_root(marker_files=('config.py', 'config_template.py')):
+    """Find the project root by searching for a list of marker files.
+
+    The result is cached per working directory and marker list.
+    """
+    return _find_project_root(os.getcwd(), tuple(marker_files))
 
 project_root = find_project_root()
 if project_root not in sys.path:
@@ -57,15 +72,71 @@ except ImportError:
     from config_template import CASE_STUDY, DATA_SOURCE, DATA_URLS
 
 
-def get_data_urls():
-    """Get data URLs based on current case study and data source settings."""
+# Shared HTTP session: keeps TCP/TLS connections alive across downloads
+# (including concurrent ones from download_named_files).
+_SESSION = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=8, pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.5),
+)
+_SESSION.mount('https://', _adapter)
+_SESSION.mount('http://', _adapter)
+_DOWNLOAD_TIMEOUT = (5, 60)  # (connect, read) seconds
+
+# Bytes copied per read/write when streaming a download to disk.
+_DOWNLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+
+def _file_size(path):
+    """Size of ``path`` in bytes, or None if it does not exist (one stat call)."""
+    try:
+        return os.stat(path).st_size
+    except FileNotFoundError:
+        return None
+
+
+def _get_tqdm():
+    """
+    Return the tqdm progress-bar class for the current frontend.
+
+    Imported lazily so plain scripts and pytest don't pay for ipywidgets;
+    tqdm.auto picks the widget bar inside Jupyter and the text bar elsewhere.
+    """
+    from tqdm.auto import tqdm
+    return tqdm
+
+
+class _ProgressWriter:
+    """File-like wrapper that forwards writes and advances a tqdm bar."""
+
+    def __init__(self, f, bar):
+        self._f = f
+        self._bar = bar
+
+    def write(self, b):
+        n = self._f.write(b)
+        self._bar.update(n)
+        return n
+
+
+def _resolve_data_urls():
+    """Resolve DATA_URLS[CASE_STUDY][DATA_SOURCE] once; returns (urls, error)."""
     if CASE_STUDY not in DATA_URLS:
-        raise ValueError(f"Unknown case study: {CASE_STUDY}")
-    
+        return None, ValueError(f"Unknown case study: {CASE_STUDY}")
     if DATA_SOURCE not in DATA_URLS[CASE_STUDY]:
-        raise ValueError(f"Data source '{DATA_SOURCE}' not available for case study '{CASE_STUDY}'")
-    
-    return DATA_URLS[CASE_STUDY][DATA_SOURCE]
+        return None, ValueError(f"Data source '{DATA_SOURCE}' not available for case study '{CASE_STUDY}'")
+    return types.MappingProxyType(DATA_URLS[CASE_STUDY][DATA_SOURCE]), None
+
+
+# Read-only view of the active URL table, resolved once at import
+_URLS, _URLS_ERROR = _resolve_data_urls()
+
+
+def get_data_urls():
+    """Get data URLs based on current case study and data source settings."""
+    if _URLS is None:
+        raise _URLS_ERROR
+    return _URLS
 
 def get_default_data_folder():
     """Get the default data folder for the current case study."""
@@ -84,16 +155,17 @@ def download_named_file(name, dest_folder=None, data_type=None, force=False):
             defeat a stale cached zip when the remote content changed at the SAME url —
             e.g. an in-place Dropbox replacement of the calibrated-model archives).
 
+    Interrupted downloads leave a ``<filename>.part`` file behind; the next call
+    resumes it with an HTTP Range request when the server supports it.
+
     Returns:
         Path to the downloaded file
     """
     # Get the appropriate URLs for current case study and data source
-    url_dict = get_data_urls()
-    
-    if name not in url_dict:
-        raise ValueError(f"No URL configured for '{name}' in {DATA_SOURCE} data for case study '{CASE_STUDY}'.")
-
-    file_info = url_dict[name]
+    try:
+        file_info = get_data_urls()[name]
+    except KeyError:
+        raise ValueError(f"No URL configured for '{name}' in {DATA_SOURCE} data for case study '{CASE_STUDY}'.") from None
     url = file_info['url']
     filename = file_info['filename']
     
@@ -112,29 +184,60 @@ def download_named_file(name, dest_folder=None, data_type=None, force=False):
             print(f"{filename} already exists in {dest_folder}.")
             return dest_path
         
+        # Bytes go to a sidecar .part file that is only renamed once complete,
+        # so an interrupted transfer can resume (HTTP Range) on the next call
+        # and a half-downloaded file never masquerades as the real one.
+        part_path = dest_path + '.part'
+        start = _file_size(part_path) or 0
+        if force and start:
+            os.remove(part_path)  # remote content may have changed; don't resume
+            start = 0
+
         print(f"Downloading {description} ({filename})...")
         try:
-            r = requests.get(url, stream=True)
+            # identity encoding keeps byte offsets meaningful for Range requests
+            headers = {'Accept-Encoding': 'identity'}
+            if start:
+                headers['Range'] = f'bytes={start}-'
+            r = _SESSION.get(url, stream=True, timeout=_DOWNLOAD_TIMEOUT, headers=headers)
+            if start and r.status_code == 416:
+                # Partial file is unusable for this resource — start over
+                r.close()
+                start = 0
+                del headers['Range']
+                r = _SESSION.get(url, stream=True, timeout=_DOWNLOAD_TIMEOUT, headers=headers)
             r.raise_for_status()
-            total = int(r.headers.get('content-length', 0))
-            with open(dest_path, 'wb') as f, tqdm(
-                desc=filename, total=total, unit='iB', unit_scale=True, unit_divisor=1024
+            if start and r.status_code != 206:
+                start = 0  # server ignored the Range header: full body follows
+            elif start:
+                print(f"Resuming {filename} from byte {start}")
+            length = int(r.headers.get('content-length', 0))
+            total = start + length if length else 0
+            r.raw.decode_content = True  # honour Content-Encoding like iter_content
+            tqdm = _get_tqdm()
+            with open(part_path, 'ab' if start else 'wb') as f, tqdm(
+                desc=filename, total=total, initial=start, mininterval=0.5,
+                unit='iB', unit_scale=True, unit_divisor=1024
             ) as bar:
-                for chunk in r.iter_content(chunk_size=1024):
-                    size = f.write(chunk)
-                    bar.update(size)
+                # No sendfile/splice fast path: the body arrives through urllib3
+                # (TLS, chunked transfer decoding) in userspace, so there is no
+                # kernel socket fd to splice from. With 1 MiB chunks the
+                # per-chunk Python overhead is already negligible.
+                shutil.copyfileobj(r.raw, _ProgressWriter(f, bar), length=_DOWNLOAD_CHUNK_SIZE)
+            got = _file_size(part_path)
+            if total and got != total:
+                raise IOError(f"Incomplete download: got {got} of {total} bytes")
+            os.replace(part_path, dest_path)
             print(f"Download complete: {dest_path}")
             return dest_path
         except Exception as e:
             print(f"Error downloading {filename}: {e}")
-            if os.path.exists(dest_path):
-                os.remove(dest_path)
+            if os.path.exists(part_path):
+                print(f"Partial download kept at {part_path}; re-run to resume.")
             raise
 
-    # --- Download data file ---
-    data_path = _download(file_info['url'], file_info['filename'], "data file")
-
-    # --- Download README if it exists ---
+    # --- Work out the README sidecar, if any ---
+    readme = None
     if 'readme_url' in file_info:
         readme_url = file_info['readme_url']
         
@@ -148,11 +251,43 @@ def download_named_file(name, dest_folder=None, data_type=None, force=False):
         if not readme_ext:
             print(f"Warning: Could not determine file extension for README from URL: {readme_url}")
         else:
-            readme_filename = f"{original_name}_readme{readme_ext}"
-            _download(readme_url, readme_filename, "README")
+            readme = (readme_url, f"{original_name}_readme{readme_ext}")
+
+    if readme is None:
+        return _download(file_info['url'], file_info['filename'], "data file")
+
+    # --- Fetch the README alongside the data file ---
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        readme_future = executor.submit(_download, *readme, "README")
+        data_path = _download(file_info['url'], file_info['filename'], "data file")
+        readme_future.result()
 
     return data_path
 
+
+def download_named_files(names, dest_folder=None, data_type=None, force=False, max_workers=4):
+    """
+    Download several named files concurrently.
+
+    Args:
+        names: Iterable of file/dataset names (see download_named_file)
+        dest_folder: Destination folder (if None, uses default structure)
+        data_type: Type of data (climate, groundwater, rivers, geology) for organization
+        force: If True, re-download even if the files already exist locally
+        max_workers: Maximum number of simultaneous downloads
+
+    Returns:
+        List of paths to the downloaded files, in the order of ``names``
+    """
+    names = list(names)
+    if not names:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(names))) as executor:
+        return list(executor.map(
+            lambda n: download_named_file(n, dest_folder=dest_folder, data_type=data_type, force=force),
+            names,
+        ))
+
 PREFETCH_GIS_FILES = [
     "model_boundary", "model_boundary_segments",
     "wells", "rivers",
@@ -186,37 +321,43 @@ def format_cache_report(report) -> str:
     return "\n".join(lines)
 
 
-def warm_data_cache(gis_names=None, data_type="gis", data_dir=None, verbose=True) -> dict:
+def _warm_one(name, data_type, data_dir) -> dict:
+    """Fetch one prefetch item and return its report row (never raises)."""
+    try:
+        info = get_data_urls().get(name)
+        if info is None:
+            return {
+                "key": name, "group": "gis", "status": "FAILED",
+                "path": None, "size_mb": None, "error": "not in DATA_URLS",
+            }
+        dest = os.path.join(data_dir, data_type, info["filename"])
+        existed_before = os.path.exists(dest)
+        path = download_named_file(name, data_type=data_type)
+        size_mb = round(os.path.getsize(path) / 1024**2, 1)
+        status  = "CACHED" if existed_before else "DOWNLOADED"
+        return {
+            "key": name, "group": "gis", "status": status,
+            "path": path, "size_mb": size_mb, "error": None,
+        }
+    except Exception as e:
+        return {
+            "key": name, "group": "gis", "status": "FAILED",
+            "path": None, "size_mb": None, "error": str(e),
+        }
+
+
+def warm_data_cache(gis_names=None, data_type="gis", data_dir=None, verbose=True,
+                    max_workers=4) -> dict:
     """Pre-download the common GIS files so notebooks (esp. 04f Section 3) don't pause to
     fetch them. Idempotent: already-present files are skipped. Per-file failures are isolated
-    and reported, never raised. GIS-only (model bundles intentionally out of scope for v1)."""
+    and reported, never raised. GIS-only (model bundles intentionally out of scope for v1).
+    Up to ``max_workers`` files are fetched at once; report items keep the order of
+    ``gis_names``."""
     gis_names = gis_names or PREFETCH_GIS_FILES
     data_dir  = data_dir or get_default_data_folder()
 
-    items = []
-    for name in gis_names:
-        try:
-            info = get_data_urls().get(name)
-            if info is None:
-                items.append({
-                    "key": name, "group": "gis", "status": "FAILED",
-                    "path": None, "size_mb": None, "error": "not in DATA_URLS",
-                })
-                continue
-            dest = os.path.join(data_dir, data_type, info["filename"])
-            existed_before = os.path.exists(dest)
-            path = download_named_file(name, data_type=data_type)
-            size_mb = round(os.path.getsize(path) / 1024**2, 1)
-            status  = "CACHED" if existed_before else "DOWNLOADED"
-            items.append({
-                "key": name, "group": "gis", "status": status,
-                "path": path, "size_mb": size_mb, "error": None,
-            })
-        except Exception as e:
-            items.append({
-                "key": name, "group": "gis", "status": "FAILED",
-                "path": None, "size_mb": None, "error": str(e),
-            })
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(gis_names)))) as executor:
+        items = list(executor.map(lambda name: _warm_one(name, data_type, data_dir), gis_names))
 
     counts = {
         "CACHED":     sum(1 for i in items if i["status"] == "CACHED"),
@@ -268,6 +409,321 @@ def list_available_datasets():
         print(f"Error listing datasets: {e}")
 
 
+def _bilinear_gather(arr, rows, cols, cval, return_outside=False):
+    """Bilinear samples of a 2-D array at fractional (row, col) indices.
+
+    Integer indices address pixel centres. Points in the outer half-pixel ring
+    (still inside the raster footprint) take the edge values; points beyond it
+    get ``cval``. With ``return_outside=True`` the mask of those points is
+    returned as well.
+    """
+    nr, nc = arr.shape
+    rows_c = np.clip(rows, 0, nr - 1)
+    cols_c = np.clip(cols, 0, nc - 1)
+    r0 = np.floor(rows_c)
+    c0 = np.floor(cols_c)
+    fr = (rows_c - r0).astype(arr.dtype, copy=False)
+    fc = (cols_c - c0).astype(arr.dtype, copy=False)
+    r0 = r0.astype(np.intp)
+    c0 = c0.astype(np.intp)
+
+    # Flat offsets of the four corners; the +1 steps collapse to 0 on the last
+    # row/column so edge pixels never read past the array.
+    flat = np.ascontiguousarray(arr).ravel()
+    i00 = r0 * nc + c0
+    i01 = i00 + (c0 < nc - 1)
+    i10 = i00 + (r0 < nr - 1) * nc
+    i11 = i10 + (i01 - i00)
+
+    top = flat.take(i00)
+    top += (flat.take(i01) - top) * fc
+    bottom = flat.take(i10)
+    bottom += (flat.take(i11) - bottom) * fc
+    vals = top
+    vals += (bottom - top) * fr
+
+    outside = (rows < -0.5) | (rows >= nr - 0.5) | (cols < -0.5) | (cols >= nc - 0.5)
+    vals[outside] = cval
+    return (vals, outside) if return_outside else vals
+
+
+def _nearest_gather(arr, rows, cols, cval=None, return_outside=False):
+    """Nearest-neighbour samples of a 2-D array at fractional (row, col) indices.
+
+    With ``cval=None`` indices are clamped to the array edge (mode='nearest');
+    otherwise points outside the array get ``cval``. With ``return_outside=True``
+    the mask of those points is returned as well (None when clamping).
+    """
+    nr, nc = arr.shape
+    ri = np.floor(rows + 0.5)
+    ci = np.floor(cols + 0.5)
+    idx = np.clip(ri, 0, nr - 1).astype(np.intp) * nc + np.clip(ci, 0, nc - 1).astype(np.intp)
+    vals = np.ascontiguousarray(arr).ravel().take(idx)
+    outside = None
+    if cval is not None:
+        outside = (ri < 0) | (ri > nr - 1) | (ci < 0) | (ci > nc - 1)
+        vals[outside] = cval
+    return (vals, outside) if return_outside else vals
+
+
+def _axis_aligned_transform(modelgrid):
+    """Affine transform of an unrotated, uniformly spaced grid, else None."""
+    if getattr(modelgrid, "angrot", 0.0):
+        return None
+    delr = np.asarray(modelgrid.delr, dtype=float)
+    delc = np.asarray(modelgrid.delc, dtype=float)
+    if not (np.allclose(delr, delr[0]) and np.allclose(delc, delc[0])):
+        return None
+    xmin, _, _, ymax = modelgrid.extent
+    return from_origin(xmin, ymax, delr[0], delc[0])
+
+
+def _dem_cache_key(dem_path):
+    """(path, mtime) identifying a DEM on disk; mtime is None for non-local sources."""
+    path = str(dem_path)
+    try:
+        return os.path.abspath(path), os.path.getmtime(path)
+    except OSError:
+        return path, None
+
+
+# DEM pixels kept per model cell (per axis) when a fine DEM is read decimated
+_DEM_PIXELS_PER_CELL = 4
+
+
+# Each cached entry is a full decoded DEM band; keep only the latest couple
+# (e.g. linear + nearest for one domain) and let clear_dem_cache() drop them.
+@lru_cache(maxsize=2)
+def _cached_dem_window(path, mtime, crs, extent, max_pixel=None, method="nearest"):
+    """Read the DEM window covering ``extent`` in ``crs``.
+
+    When the DEM pixels are much finer than ``max_pixel`` (map units), the
+    window is read decimated so GDAL can serve it from overviews; ``method``
+    picks the decimation kernel.
+
+    Returns the band as read-only float32 with nodata set to NaN, the window
+    transform and whether the band holds any NaN. Cached per arguments so
+    repeated resampling onto the same model domain skips the raster I/O and warp.
+    """
+    import rasterio
+
+    xmin, xmax, ymin, ymax = extent
+    with rasterio.open(path) as src:
+        needs_warp = str(src.crs) != str(crs)
+        ds = WarpedVRT(src, crs=crs, resampling=Resampling.bilinear) if needs_warp else src
+        try:
+            # Read only the window covering the model domain
+            win = from_bounds(xmin, ymin, xmax, ymax, transform=ds.transform)
+            tr = ds.window_transform(win)
+            out_shape = None
+            if max_pixel:
+                step = max_pixel / min(abs(ds.transform.a), abs(ds.transform.e))
+                if step >= 2:
+                    out_shape = (max(1, math.ceil(win.height / step)),
+                                 max(1, math.ceil(win.width / step)))
+                    tr = tr * Affine.scale(win.width / out_shape[1], win.height / out_shape[0])
+            # GDAL decodes straight into a float32 buffer (no native-dtype copy)
+            arr = ds.read(
+                1, window=win, boundless=True, out_dtype="float32", out_shape=out_shape,
+                resampling=Resampling.bilinear if method == "linear" else Resampling.nearest,
+            )
+            nodata = ds.nodata
+        finally:
+            if needs_warp:
+                ds.close()
+
+    # Replace raster nodata with NaN prior to interpolation to avoid contamination.
+    # Nodata is an exact sentinel, so compare in the band dtype and mask in place.
+    if nodata is not None:
+        np.putmask(arr, arr == np.float32(nodata), np.nan)
+    arr.flags.writeable = False
+    return arr, tr, bool(np.isnan(arr).any())
+
+
+
+@lru_cache(maxsize=2)  # full warped arrays, bounded like _cached_dem_window
+def _cached_dem_warp(path, mtime, crs, transform, width, height, method):
+    """DEM warped by GDAL directly onto an axis-aligned grid (read-only, NaN outside),
+    plus whether the result holds any NaN."""
+    import rasterio
+
+    resampling = Resampling.bilinear if method == "linear" else Resampling.nearest
+    with rasterio.open(path) as src, WarpedVRT(
+        src, crs=crs, transform=transform, width=width, height=height,
+        resampling=resampling, nodata=np.nan, dtype="float32",
+    ) as vrt:
+        vals = vrt.read(1)
+    vals.flags.writeable = False
+    return vals, bool(np.isnan(vals).any())
+
+
+def clear_dem_cache():
+    """Release the DEM arrays cached by fast_resample_dem_to_modelgrid."""
+    _cached_dem_window.cache_clear()
+    _cached_dem_warp.cache_clear()
+
+
+def _center_rowcol(xs, ys, tr):
+    """Fractional (row, col) indices of points ``xs``, ``ys`` under transform ``tr``.
+
+    Integer indices address pixel centres (the gather convention), i.e. the
+    inverse affine shifted by half a pixel. Both results are written into one
+    preallocated (2, N) buffer.
+    """
+    xs = np.asarray(xs, dtype=np.float64).reshape(-1)
+    ys = np.asarray(ys, dtype=np.float64).reshape(-1)
+    inv = ~tr
+    coords = np.empty((2, xs.size), dtype=np.float64)
+    rows, cols = coords
+    np.multiply(xs, inv.d, out=rows)
+    rows += inv.e * ys
+    rows += inv.f - 0.5
+    np.multiply(xs, inv.a, out=cols)
+    cols += inv.b * ys
+    cols += inv.c - 0.5
+    return rows, cols
+
+
+# Edge length (cells) of the output blocks sampled by _sample_blocks
+_SAMPLE_BLOCK = 512
+
+
+def _sample_blocks(arr, tr, xc, yc, method, cval):
+    """Sample ``arr`` at the 2-D cell-centre arrays ``xc``, ``yc`` block by block.
+
+    Each block touches a compact patch of the DEM (cache-friendly) and only
+    allocates block-sized temporaries; blocks run on a thread pool since the
+    NumPy gathers release the GIL. Returns (vals, outside) shaped like ``xc``.
+    """
+    nrow, ncol = xc.shape
+    vals = np.empty((nrow, ncol), dtype=arr.dtype)
+    outside = np.empty((nrow, ncol), dtype=bool)
+    gather = _bilinear_gather if method == "linear" else _nearest_gather
+
+    def _work(block):
+        rs, cs = block
+        rows, cols = _center_rowcol(xc[rs, cs], yc[rs, cs], tr)
+        v, o = gather(arr, rows, cols, cval, return_outside=True)
+        shape = vals[rs, cs].shape
+        vals[rs, cs] = v.reshape(shape)
+        outside[rs, cs] = o.reshape(shape)
+
+    blocks = [
+        (slice(r, r + _SAMPLE_BLOCK), slice(c, c + _SAMPLE_BLOCK))
+        for r in range(0, nrow, _SAMPLE_BLOCK)
+        for c in range(0, ncol, _SAMPLE_BLOCK)
+    ]
+    if len(blocks) == 1:
+        _work(blocks[0])
+    else:
+        with ThreadPoolExecutor(max_workers=min(len(blocks), os.cpu_count() or 1)) as executor:
+            list(executor.map(_work, blocks))
+    return vals, outside
+
+
+# Grids smaller than this are sampled with plain NumPy (no JIT compile cost)
+_NUMBA_SAMPLE_MIN_CELLS = 100_000
+
+
+@lru_cache(maxsize=1)
+def _numba_sample_kernel():
+    """Compile the fused DEM sampling kernel on first use; None without numba."""
+    try:  # optional JIT for large rotated grids
+        from numba import njit, prange
+    except ImportError:
+        return None
+
+    # No fastmath: the kernel relies on NaN checks for the nearest-pixel fallback
+    @njit(parallel=True, cache=True)
+    def _sample_dem_numba(arr, a, b, c, d, e, f, xs, ys, linear, cval, mask_nonpos, out):
+        nr, nc = arr.shape
+        for n in prange(xs.shape[0]):
+            col = a * xs[n] + b * ys[n] + c
+            row = d * xs[n] + e * ys[n] + f
+            if linear:
+                if row < -0.5 or row >= nr - 0.5 or col < -0.5 or col >= nc - 0.5:
+                    v = cval
+                else:
+                    # Outer half-pixel ring takes the edge values
+                    rc = min(max(row, 0.0), nr - 1.0)
+                    cc = min(max(col, 0.0), nc - 1.0)
+                    r0 = int(np.floor(rc))
+                    c0 = int(np.floor(cc))
+                    fr = rc - r0
+                    fc = cc - c0
+                    r1 = min(r0 + 1, nr - 1)
+                    c1 = min(c0 + 1, nc - 1)
+                    top = arr[r0, c0] + (arr[r0, c1] - arr[r0, c0]) * fc
+                    bottom = arr[r1, c0] + (arr[r1, c1] - arr[r1, c0]) * fc
+                    v = top + (bottom - top) * fr
+            else:
+                ri = np.floor(row + 0.5)
+                ci = np.floor(col + 0.5)
+                if ri < 0 or ri > nr - 1 or ci < 0 or ci > nc - 1:
+                    v = cval
+                else:
+                    v = arr[int(ri), int(ci)]
+            if not np.isfinite(v):
+                # Nearest-neighbor fallback, clamped to the window edge
+                ri = min(max(np.floor(row + 0.5), 0.0), nr - 1.0)
+                ci = min(max(np.floor(col + 0.5), 0.0), nc - 1.0)
+                v = arr[int(ri), int(ci)]
+            if mask_nonpos and v <= 0.0:
+                v = np.nan
+            out[n] = v
+
+    return _sample_dem_numba
+
+
+def _fallback_mask(vals, outside, window_has_nan, cval):
+    """Cells needing the nearest-pixel fallback, or None if there are none.
+
+    NaNs can only come from nodata in the window or from out-of-window cells
+    filled with a NaN cval; the full scan is skipped when neither applies.
+    """
+    if window_has_nan:
+        mask = ~np.isfinite(vals)
+        return mask if mask.any() else None
+    if np.isnan(cval) and outside.any():
+        return outside
+    return None
+
+
+def _cast_dem(vals, dtype, scale):
+    """Cast resampled elevations to ``dtype``, quantizing for integer dtypes."""
+    dt = np.dtype(dtype)
+    if not np.issubdtype(dt, np.integer):
+        return vals.astype(dt, copy=False)
+    info = np.iinfo(dt)
+    q = np.rint(vals * float(scale))
+    missing = ~np.isfinite(q)
+    valid = q[~missing]
+    if valid.size and (valid.min() <= info.min or valid.max() > info.max):
+        raise ValueError(
+            f"Elevations x scale={scale} range [{valid.min():.0f}, {valid.max():.0f}] "
+            f"do not fit in {dt.name}; use a wider dtype or a smaller scale."
+        )
+    q[missing] = info.min
+    return q.astype(dt)
+
+
+def dequantize_dem(arr: np.ndarray, scale: float = 1.0) -> np.ndarray:
+    """
+    Convert an integer DEM from fast_resample_dem_to_modelgrid back to float32 metres.
+
+    Parameters:
+    - arr (np.ndarray): Integer elevations as returned with an integer ``dtype``
+    - scale (float): The ``scale`` used when quantizing
+
+    Returns:
+    - np.ndarray: float32 elevations [m a.s.l.], NaN where ``arr`` holds the dtype minimum
+    """
+    out = arr.astype(np.float32)
+    out /= scale
+    out[arr == np.iinfo(arr.dtype).min] = np.nan
+    return out
+
+
 def fast_resample_dem_to_modelgrid(
     dem_path: Union[str, Path],
     modelgrid,
@@ -275,14 +731,16 @@ def fast_resample_dem_to_modelgrid(
     fill_value: Optional[float] = np.nan,
     mask_nonpositive: bool = True,
     dtype: str = "float32",
+    scale: float = 1.0,
 ) -> np.ndarray:
     """
     Fast resample of a DEM to a (possibly rotated) FloPy StructuredGrid by sampling
     the DEM at grid cell centers in a single vectorized call.
 
-    This uses GDAL's C-backed warper (via rasterio.WarpedVRT) for on-the-fly CRS
-    reprojection and reads only the model extent. Sampling is performed with
-    scipy.ndimage.map_coordinates:
+    For unrotated grids with uniform spacing, GDAL's C-backed warper (via
+    rasterio.WarpedVRT) resamples the DEM directly onto the model grid. Otherwise
+    the warper only handles on-the-fly CRS reprojection of the model extent and
+    sampling is a direct vectorized gather of the neighbouring pixels:
     - method='nearest' → nearest-neighbor
     - method='linear' → bilinear
 
@@ -292,7 +750,10 @@ def fast_resample_dem_to_modelgrid(
     - method ('nearest' | 'linear'): Resampling kernel ('linear' ≈ bilinear)
     - fill_value (float | None): Value to fill outside-coverage or nodata cells (default: NaN)
     - mask_nonpositive (bool): If True, set elevations <= 0 m to NaN (simple sanity mask)
-    - dtype (str): Output dtype (e.g., 'float32')
+    - dtype (str): Output dtype (e.g., 'float32'). Integer dtypes store
+      round(elevation * scale) with NaN mapped to the dtype minimum; see dequantize_dem
+    - scale (float): Quantization factor for integer dtypes, e.g. dtype='int16' with
+      scale=1 (whole metres, up to 32 km) or dtype='int32' with scale=100 (cm)
 
     Returns:
     - np.ndarray: Array of shape (nrow, ncol) with elevations [m a.s.l.]
@@ -303,64 +764,155 @@ def fast_resample_dem_to_modelgrid(
     - Performance: Avoids Python loops; leverages GDAL threading (GDAL_NUM_THREADS=ALL_CPUS).
       Typical speedup is 5–20× over pure Python resampling in notebooks/JupyterHub.
     - Rotated grids: Works for rotated FloPy grids by sampling exact cell centers.
+      Cells left without a value by either path get the nearest DEM pixel.
+    - Repeated calls: The warped/windowed DEM is cached per file (path + mtime),
+      CRS and model extent, so calling this in a loop only repeats the sampling.
+    - Coarse grids: A DEM much finer than the model cells is read decimated
+      (about 4 DEM pixels per cell and axis), letting GDAL use overviews.
 
     Example:
     >>> # model_top_m: elevation at model cell centers [m a.s.l.]
     >>> model_top_m = fast_resample_dem_to_modelgrid("/path/to/dem.tif", modelgrid, method="linear")
     >>> model_top_m = np.round(model_top_m, 0)  # keep 0.1–1 m precision as needed
     """
-    import rasterio  # local import to speed startup if rasterio is not used elsewhere
-
     xmin, xmax, ymin, ymax = modelgrid.extent  # (xmin, xmax, ymin, ymax)
-
-    with rasterio.open(str(dem_path)) as src:
-        needs_warp = str(src.crs) != str(modelgrid.crs)
-        if needs_warp:
-            ds = WarpedVRT(src, crs=modelgrid.crs, resampling=Resampling.bilinear)
-        else:
-            ds = src
-
-        # Read only the window covering the model domain
-        win = from_bounds(xmin, ymin, xmax, ymax, transform=ds.transform)
-        arr = ds.read(1, window=win, boundless=True).astype("float32", copy=False)
-        nodata = ds.nodata
-        tr = ds.window_transform(win)
-
-    # Replace raster nodata with NaN prior to interpolation to avoid contamination
-    if nodata is not None:
-        arr = np.where(np.isclose(arr, nodata), np.nan, arr)
-
-    # Cell-center coordinates (vectorized)
-    xs = modelgrid.xcellcenters.ravel()
-    ys = modelgrid.ycellcenters.ravel()
-
-    # Map to fractional row/col indices in the read window
-    rows, cols = rowcol(tr, xs, ys, op=float)
-    coords = np.vstack([rows, cols])
-
-    # Interpolate
-    order = 1 if method == "linear" else 0
-    vals = map_coordinates(
-        arr, coords, order=order, mode="constant",
-        cval=np.nan if fill_value is None or np.isnan(fill_value) else float(fill_value),
-        prefilter=False,
-    ).reshape(modelgrid.nrow, modelgrid.ncol)
-
-    # Fill any NaNs with nearest-neighbor fallback
-    if np.isnan(vals).any():
-        vals_nn = map_coordinates(
-            arr, coords, order=0, mode="nearest", prefilter=False
-        ).reshape(vals.shape)
-        nan_mask = ~np.isfinite(vals)
-        vals[nan_mask] = vals_nn[nan_mask]
+    cval = np.nan if fill_value is None or np.isnan(fill_value) else float(fill_value)
+    # The direct warp marks uncovered cells as NaN, so it is only used when
+    # those cells would be NaN-filled anyway
+    dst_transform = _axis_aligned_transform(modelgrid) if np.isnan(cval) else None
+    path, mtime = _dem_cache_key(dem_path)
+    xc = np.asarray(modelgrid.xcellcenters, dtype=np.float64).reshape(modelgrid.nrow, modelgrid.ncol)
+    yc = np.asarray(modelgrid.ycellcenters, dtype=np.float64).reshape(modelgrid.nrow, modelgrid.ncol)
+
+    if dst_transform is not None:
+        # Axis-aligned grid: GDAL's warper resamples straight onto the model grid
+        warped, warp_has_nan = _cached_dem_warp(
+            path, mtime, modelgrid.crs, dst_transform, modelgrid.ncol, modelgrid.nrow, method
+        )
+        vals = warped.copy()
+        nan_mask = ~np.isfinite(vals) if warp_has_nan else None
+    if dst_transform is None or nan_mask is not None:
+        # No need to read the DEM much finer than the model cells
+        cell_size = min(np.min(modelgrid.delr), np.min(modelgrid.delc))
+        arr, tr, window_has_nan = _cached_dem_window(
+            path, mtime, modelgrid.crs, (xmin, xmax, ymin, ymax),
+            max_pixel=float(cell_size) / _DEM_PIXELS_PER_CELL, method=method,
+        )
+
+    if dst_transform is None:
+        # Rotated or irregular grid: sample the DEM at the exact cell centers
+        ncell = modelgrid.nrow * modelgrid.ncol
+        kernel = _numba_sample_kernel() if ncell >= _NUMBA_SAMPLE_MIN_CELLS else None
+        if kernel is not None:
+            # One fused pass: inverse transform, interpolation, NaN fallback and masking.
+            # The half-pixel shift makes integer indices address pixel centres.
+            inv = ~tr
+            vals = np.empty(ncell, dtype=np.float32)
+            kernel(
+                arr, inv.a, inv.b, inv.c - 0.5, inv.d, inv.e, inv.f - 0.5,
+                np.ascontiguousarray(xc).reshape(-1), np.ascontiguousarray(yc).reshape(-1),
+                method == "linear", cval, mask_nonpositive, vals,
+            )
+            return _cast_dem(vals.reshape(modelgrid.nrow, modelgrid.ncol), dtype, scale)
+
+        vals, outside = _sample_blocks(arr, tr, xc, yc, method, cval)
+        nan_mask = _fallback_mask(vals, outside, window_has_nan, cval)
+
+    # Fill any NaNs with nearest-neighbor fallback (edge-clamped), only where needed
+    if nan_mask is not None:
+        rows, cols = _center_rowcol(xc[nan_mask], yc[nan_mask], tr)
+        vals[nan_mask] = _nearest_gather(arr, rows, cols, None)
 
     # Optional masking of non-physical elevations
     if mask_nonpositive:
-        vals = np.where(vals <= 0.0, np.nan, vals)
+        np.putmask(vals, vals <= 0.0, np.nan)
 
     # Cast and return
-    return vals.astype(dtype, copy=False)
+    return _cast_dem(vals, dtype, scale)
+
+
+@dataclass(frozen=True)
+class SamplingPlan:
+    """DEM window and cell-centre indices for one model grid (see build_sampling_plan)."""
+    crs: object
+    extent: tuple
+    max_pixel: float
+    method: str
+    transform: object          # DEM window transform the indices refer to
+    window_shape: tuple
+    grid_shape: tuple          # (nrow, ncol)
+    rows: np.ndarray           # fractional DEM row index per cell (flat, read-only)
+    cols: np.ndarray           # fractional DEM col index per cell (flat, read-only)
+
+
+def build_sampling_plan(
+    dem_path: Union[str, Path],
+    modelgrid,
+    method: Literal["nearest", "linear"] = "nearest",
+) -> SamplingPlan:
+    """
+    Precompute how the cells of ``modelgrid`` map onto a DEM's pixel grid.
+
+    Use with apply_sampling_plan when several rasters share the same CRS,
+    footprint and resolution (e.g. model top and bottom, or DEM epochs): the
+    window geometry and cell-centre indices are then computed only once.
 
+    Parameters:
+    - dem_path (str | Path): A raster with the pixel grid shared by all later inputs
+    - modelgrid: FloPy StructuredGrid (with .xcellcenters, .ycellcenters, .extent, .crs)
+    - method ('nearest' | 'linear'): Resampling kernel used by apply_sampling_plan
+
+    Returns:
+    - SamplingPlan
+    """
+    extent = tuple(float(v) for v in modelgrid.extent)
+    max_pixel = float(min(np.min(modelgrid.delr), np.min(modelgrid.delc))) / _DEM_PIXELS_PER_CELL
+    path, mtime = _dem_cache_key(dem_path)
+    arr, tr, _ = _cached_dem_window(path, mtime, modelgrid.crs, extent, max_pixel=max_pixel, method=method)
+    rows, cols = _center_rowcol(modelgrid.xcellcenters, modelgrid.ycellcenters, tr)
+    rows.flags.writeable = False
+    cols.flags.writeable = False
+    return SamplingPlan(
+        crs=modelgrid.crs, extent=extent, max_pixel=max_pixel, method=method,
+        transform=tr, window_shape=arr.shape, grid_shape=(modelgrid.nrow, modelgrid.ncol),
+        rows=rows, cols=cols,
+    )
 
 
+def apply_sampling_plan(
+    plan: SamplingPlan,
+    dem_path: Union[str, Path],
+    fill_value: Optional[float] = np.nan,
+    mask_nonpositive: bool = True,
+    dtype: str = "float32",
+    scale: float = 1.0,
+) -> np.ndarray:
+    """
+    Resample a DEM onto the model grid of ``plan`` (see build_sampling_plan).
+
+    Same outputs as fast_resample_dem_to_modelgrid's cell-centre sampling;
+    the remaining parameters have the same meaning there.
 
+    Raises:
+    - ValueError: If the raster's window does not match the plan's pixel grid
+    """
+    path, mtime = _dem_cache_key(dem_path)
+    arr, tr, window_has_nan = _cached_dem_window(
+        path, mtime, plan.crs, plan.extent, max_pixel=plan.max_pixel, method=plan.method
+    )
+    if tr != plan.transform or arr.shape != plan.window_shape:
+        raise ValueError(
+            f"{dem_path} does not share the pixel grid of the sampling plan; "
+            "build a new plan for it."
+        )
+
+    cval = np.nan if fill_value is None or np.isnan(fill_value) else float(fill_value)
+    gather = _bilinear_gather if plan.method == "linear" else _nearest_gather
+    vals, outside = gather(arr, plan.rows, plan.cols, cval, return_outside=True)
+
+    nan_mask = _fallback_mask(vals, outside, window_has_nan, cval)
+    if nan_mask is not None:
+        vals[nan_mask] = _nearest_gather(arr, plan.rows[nan_mask], plan.cols[nan_mask], None)
+    if mask_nonpositive:
+        np.putmask(vals, vals <= 0.0, np.nan)
+    return _cast_dem(vals.reshape(plan.grid_shape), dtype, scale)
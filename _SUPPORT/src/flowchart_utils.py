@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 import graphviz
 
 
@@ -8,7 +10,13 @@ def create_modelling_process_flowchart():
     Returns:
         dot (graphviz.Digraph): The flowchart object.
     """
-    
+    # The graph never changes: build it once, hand out copies so callers
+    # can still add to or restyle their own.
+    return _build_flowchart().copy()
+
+
+@lru_cache(maxsize=1)
+def _build_flowchart():
     # Create a flowchart
     dot = graphviz.Digraph(comment='The Modeling Process')
     dot.attr(rankdir='TB', size='8,5')
@@ -28,16 +36,10 @@ def create_modelling_process_flowchart():
         dot.node('J', '10. Result Communication', shape='box')
 
     # Add edges
-    # Main flow
-    dot.edge('A:s', 'B:n', weight='10')
-    dot.edge('B:s', 'C:n', weight='10')
-    dot.edge('C:s', 'D:n', weight='10')
-    dot.edge('D:s', 'E:n', weight='10')
-    dot.edge('E:s', 'F:n', weight='10')
-    dot.edge('F:s', 'G:n', weight='10')
-    dot.edge('G:s', 'H:n', weight='10')
-    dot.edge('H:s', 'I:n', weight='10')
-    dot.edge('I:s', 'J:n', weight='10')
+    # Main flow: A -> B -> ... -> J, all with the same weight
+    dot.attr('edge', weight='10')
+    seq = 'ABCDEFGHIJ'
+    dot.edges([(f'{a}:s', f'{b}:n') for a, b in zip(seq, seq[1:])])
 
     return dot
 
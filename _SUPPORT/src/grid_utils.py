@@ -1,12 +1,14 @@
 from __future__ import annotations
 import numpy as np
 import matplotlib.pyplot as plt
-from shapely.geometry import MultiLineString
 import folium
 import flopy
 from flopy.utils import GridIntersect
 
 
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import os
 from typing import Tuple
 import warnings
 
@@ -23,8 +25,60 @@ from rasterio.features import rasterize
 
 
 
+def _grid_intersect(modelgrid) -> GridIntersect:
+    """Vertex-method GridIntersect for ``modelgrid``, reused across calls.
+
+    The cached object is rebuilt if the grid was moved, rotated or resized
+    since (e.g. via ``set_coord_info``).
+    """
+    key = (modelgrid.xoffset, modelgrid.yoffset, modelgrid.angrot,
+           modelgrid.nnodes, tuple(modelgrid.extent))
+    return _cached_grid_intersect(modelgrid, key)
+
+
+# GridIntersect keeps a reference to its grid, so a weak-keyed cache could
+# never drop entries; a small LRU bounds what is kept alive instead.
+@lru_cache(maxsize=4)
+def _cached_grid_intersect(modelgrid, key) -> GridIntersect:
+    return GridIntersect(modelgrid, method="vertex", rtree=True)
+
+
+def clear_gix_cache() -> None:
+    """Drop all cached GridIntersect objects."""
+    _cached_grid_intersect.cache_clear()
+
+
+def _boundary_line_parts(gdf, clip_bounds=None) -> np.ndarray:
+    """LineString parts of the (Multi)LineString features in ``gdf``, in row order.
+
+    Other geometry types are skipped. With ``clip_bounds`` (xmin, ymin, xmax,
+    ymax) parts outside the box are dropped and parts crossing its edge are
+    cut to it, so GridIntersect only walks segments that can hit the grid.
+    """
+    import shapely
+
+    geoms = np.asarray(gdf.geometry.values)
+    is_line = np.isin(shapely.get_type_id(geoms), (1, 5))  # LineString, MultiLineString
+    parts = shapely.get_parts(geoms[is_line])
+    if clip_bounds is None or len(parts) == 0:
+        return parts
+
+    x0, y0, x1, y1 = clip_bounds
+    b = shapely.bounds(parts)
+    inside = (b[:, 0] >= x0) & (b[:, 1] >= y0) & (b[:, 2] <= x1) & (b[:, 3] <= y1)
+    if inside.all():
+        return parts
+    # intersection (not clip_by_rect) keeps lines lying on the box edge
+    clipped = parts.copy()
+    clipped[~inside] = shapely.intersection(parts[~inside], shapely.box(x0, y0, x1, y1))
+    clipped = shapely.get_parts(clipped)
+    keep = (shapely.get_type_id(clipped) == 1) & ~shapely.is_empty(clipped)
+    return clipped[keep]  # drop empties and touch points
+
+
 def intersect_boundary_with_flopy_grid_buffer_opt(boundary_segments_gdf, modelgrid, desc_filter="west", 
-                                      buffer_distance=None, check_crs=True, debug=True):
+                                      buffer_distance=None, check_crs=True, debug=True,
+                                      detailed=False):
     """
     Use FloPy's GridIntersect to find cells that intersect with boundary segments
     
@@ -35,9 +89,12 @@ def intersect_boundary_with_flopy_grid_buffer_opt(boundary_segments_gdf, modelgr
     buffer_distance: float, buffer distance to apply to lines (in CRS units). If None, auto-calculate
     check_crs: bool, whether to check and align coordinate reference systems
     debug: bool, whether to print debugging information
+    detailed: bool, whether to also run gix.intersect() (clipped geometries, lengths)
     
     Returns:
-    dict with intersection results
+    dict with intersection results ('detailed_intersection' is None unless detailed=True;
+    'boundary_buffered' is None unless the line intersection found no cells and the
+    buffered fallback was run)
     """
     
     # Filter boundary segments for specified description
@@ -151,56 +208,60 @@ def intersect_boundary_with_flopy_grid_buffer_opt(boundary_segments_gdf, modelgr
     else:
         print(f"Using provided buffer distance: {buffer_distance} units")
     
-    # Create GridIntersect object
-    gix = GridIntersect(modelgrid, method="vertex", rtree=True)
+    # GridIntersect object (rtree built once per modelgrid)
+    gix = _grid_intersect(modelgrid)
     
-    # Convert all boundary segments to geometries and apply buffer
-    line_geometries = []
-    buffered_geometries = []
-    
-    for idx, row in west_boundary.iterrows():
-        if row.geometry.geom_type == 'LineString':
-            line_geometries.append(row.geometry)
-            buffered_geometries.append(row.geometry.buffer(buffer_distance))
-        elif row.geometry.geom_type == 'MultiLineString':
-            for geom in row.geometry.geoms:
-                line_geometries.append(geom)
-                buffered_geometries.append(geom.buffer(buffer_distance))
+    # Convert all boundary segments to line parts
+    import shapely
+
+    # Only segments within buffer reach of the grid extent can intersect it
+    gx_min, gx_max, gy_min, gy_max = modelgrid.extent
+    line_geometries = _boundary_line_parts(
+        west_boundary,
+        clip_bounds=(gx_min - buffer_distance, gy_min - buffer_distance,
+                     gx_max + buffer_distance, gy_max + buffer_distance),
+    )
     
-    # Create MultiLineString and MultiPolygon for intersections
+    # Create MultiLineString for the line intersection
     if len(line_geometries) == 1:
         boundary_multiline = line_geometries[0]
-        boundary_buffered = buffered_geometries[0]
     else:
-        boundary_multiline = MultiLineString(line_geometries)
-        from shapely.geometry import MultiPolygon
-        if len(buffered_geometries) == 1:
-            boundary_buffered = buffered_geometries[0]
-        else:
-            boundary_buffered = MultiPolygon(buffered_geometries) if len(buffered_geometries) > 1 else buffered_geometries[0]
+        boundary_multiline = shapely.multilinestrings(line_geometries)
+    boundary_buffered = None
     
     # Try intersection with original lines first
     print(f"\n=== INTERSECTION ATTEMPTS ===")
     print("Attempting intersection with original line geometries...")
     try:
         intersected_cellids_lines = gix.intersects(boundary_multiline, shapetype="linestring")
-        detailed_intersection_lines = gix.intersect(boundary_multiline, shapetype="linestring")
+        detailed_intersection_lines = (
+            gix.intersect(boundary_multiline, shapetype="linestring") if detailed else None
+        )
         print(f"Original lines: Found {len(intersected_cellids_lines)} intersected cells")
     except Exception as e:
         print(f"Original lines intersection failed: {e}")
         intersected_cellids_lines = np.array([], dtype=object)
         detailed_intersection_lines = None
     
-    # Try intersection with buffered geometries (as polygons)
-    print("Attempting intersection with buffered geometries...")
-    try:
-        intersected_cellids_buffered = gix.intersects(boundary_buffered, shapetype="polygon")
-        detailed_intersection_buffered = gix.intersect(boundary_buffered, shapetype="polygon")
-        print(f"Buffered polygons: Found {len(intersected_cellids_buffered)} intersected cells")
-    except Exception as e:
-        print(f"Buffered intersection failed: {e}")
-        intersected_cellids_buffered = np.array([], dtype=object)
-        detailed_intersection_buffered = None
+    # Fall back to buffered geometries (as polygons) only if the lines hit nothing
+    intersected_cellids_buffered = np.array([], dtype=object)
+    detailed_intersection_buffered = None
+    if len(intersected_cellids_lines) == 0:
+        print("Attempting intersection with buffered geometries...")
+        # quad_segs=16 matches BaseGeometry.buffer (the ufunc defaults to 8)
+        buffered_geometries = shapely.buffer(line_geometries, buffer_distance, quad_segs=16)
+        if len(buffered_geometries) == 1:
+            boundary_buffered = buffered_geometries[0]
+        else:
+            boundary_buffered = shapely.multipolygons(buffered_geometries)
+        try:
+            intersected_cellids_buffered = gix.intersects(boundary_buffered, shapetype="polygon")
+            detailed_intersection_buffered = (
+                gix.intersect(boundary_buffered, shapetype="polygon") if detailed else None
+            )
+            print(f"Buffered polygons: Found {len(intersected_cellids_buffered)} intersected cells")
+        except Exception as e:
+            print(f"Buffered intersection failed: {e}")
     
     # Choose the best result
     if len(intersected_cellids_lines) > 0:
@@ -260,16 +321,12 @@ def debug_grid_and_boundary(boundary_segments_gdf, modelgrid, desc_filter="west"
         y_edges = modelgrid.yvertices if hasattr(modelgrid, 'yvertices') else None
         
         if x_edges is not None and y_edges is not None:
-            # Plot grid cells
-            for i in range(min(10, x_edges.shape[0]-1)):  # Plot max 10 cells for clarity
-                for j in range(min(10, x_edges.shape[1]-1)):
-                    rect = plt.Rectangle(
-                        (x_edges[i,j], y_edges[i,j]), 
-                        x_edges[i,j+1] - x_edges[i,j],
-                        y_edges[i+1,j] - y_edges[i,j],
-                        fill=False, edgecolor='blue', alpha=0.5
-                    )
-                    ax1.add_patch(rect)
+            # Plot all grid cells as a single collection
+            from matplotlib.collections import PolyCollection
+            verts = _cell_corners(np.asarray(x_edges, dtype=float), np.asarray(y_edges, dtype=float))
+            ax1.add_collection(PolyCollection(
+                verts, facecolors='none', edgecolors='blue', alpha=0.5, linewidths=0.5
+            ))
         
         # Plot grid extent
         x_min, x_max = modelgrid.xcellcenters.min(), modelgrid.xcellcenters.max()
@@ -322,7 +379,8 @@ def debug_grid_and_boundary(boundary_segments_gdf, modelgrid, desc_filter="west"
         print(f"Grid cell size (first cell): delr={modelgrid.delr[0] if hasattr(modelgrid.delr, '__len__') else modelgrid.delr}, delc={modelgrid.delc[0] if hasattr(modelgrid.delc, '__len__') else modelgrid.delc}")
 
 
-def intersect_boundary_with_flopy_grid(boundary_segments_gdf, modelgrid, desc_filter="west"):
+def intersect_boundary_with_flopy_grid(boundary_segments_gdf, modelgrid, desc_filter="west",
+                                       detailed=False):
     """
     Use FloPy's GridIntersect to find cells that intersect with boundary segments
     
@@ -330,9 +388,10 @@ def intersect_boundary_with_flopy_grid(boundary_segments_gdf, modelgrid, desc_fi
     boundary_segments_gdf: GeoDataFrame with boundary segments
     modelgrid: FloPy modelgrid object (StructuredGrid, VertexGrid, or UnstructuredGrid)
     desc_filter: description to filter boundary segments
+    detailed: bool, whether to also run gix.intersect() (clipped geometries, lengths)
     
     Returns:
-    dict with intersection results
+    dict with intersection results ('detailed_intersection' is None unless detailed=True)
     """
     
     # Filter boundary segments for specified description
@@ -344,28 +403,31 @@ def intersect_boundary_with_flopy_grid(boundary_segments_gdf, modelgrid, desc_fi
     
     print(f"Found {len(west_boundary)} boundary segments with desc='{desc_filter}'")
     
-    # Create GridIntersect object
-    gix = GridIntersect(modelgrid, method="vertex", rtree=True)
+    # GridIntersect object (rtree built once per modelgrid)
+    gix = _grid_intersect(modelgrid)
     
     # Convert all boundary segments to a single MultiLineString for efficient intersection
-    line_geometries = []
-    for idx, row in west_boundary.iterrows():
-        if row.geometry.geom_type == 'LineString':
-            line_geometries.append(row.geometry)
-        elif row.geometry.geom_type == 'MultiLineString':
-            line_geometries.extend(list(row.geometry.geoms))
+    import shapely
+
+    # Segments outside the grid extent cannot intersect it
+    gx_min, gx_max, gy_min, gy_max = modelgrid.extent
+    line_geometries = _boundary_line_parts(
+        west_boundary, clip_bounds=(gx_min, gy_min, gx_max, gy_max)
+    )
     
     if len(line_geometries) == 1:
         boundary_multiline = line_geometries[0]
     else:
-        boundary_multiline = MultiLineString(line_geometries)
+        boundary_multiline = shapely.multilinestrings(line_geometries)
     
     # Perform intersection using FloPy's GridIntersect
     # Use intersects() method to get cellids only (faster than full intersect())
     intersected_cellids = gix.intersects(boundary_multiline, shapetype="linestring")
     
     # For more detailed intersection (with lengths, etc.), use intersect() method
-    detailed_intersection = gix.intersect(boundary_multiline, shapetype="linestring")
+    detailed_intersection = (
+        gix.intersect(boundary_multiline, shapetype="linestring") if detailed else None
+    )
     
     print(f"Found {len(intersected_cellids)} grid cells intersecting with '{desc_filter}' boundary")
     
@@ -476,7 +538,64 @@ def create_ibound_mapping_diagnostic(ibound, modelgrid, intersection_results):
                             value = ibound[r, c]
                             print(f"    ibound[{r}, {c}] = {value}")
 
-def assign_ibound_from_intersection(ibound, intersection_results, modelgrid):
+def _cellid_index_array(cellids):
+    """``(N, 2)`` row/col or ``(N, 3)`` layer/row/col array from GridIntersect cellids.
+
+    Accepts the ``'cellids'`` record array returned by ``GridIntersect.intersects``
+    or a sequence of index tuples; returns None for anything else (e.g. node
+    numbers), which the caller handles cell by cell.
+    """
+    raw = cellids
+    if isinstance(cellids, np.ndarray) and cellids.dtype.names:
+        if 'cellids' not in cellids.dtype.names:
+            return None
+        raw = cellids['cellids']
+    if len(raw) == 0:
+        return None
+    try:
+        index = np.array(np.asarray(raw, dtype=object).tolist(), dtype=np.int64)
+    except (TypeError, ValueError):
+        return None
+    if index.ndim != 2 or index.shape[1] not in (2, 3):
+        return None
+    return index
+
+
+def _set_constant_head_cells(ibound, index, modelgrid):
+    """Set active (== 1) cells listed in ``index`` to -1 in place; return the count.
+
+    Same rules as the per-cell path of :func:`assign_ibound_from_intersection`:
+    out-of-range cells are skipped, row/col cellids apply to every layer of a
+    3D ibound, and a layer/row/col cellid on a 2D ibound uses its row/col.
+    """
+    rows, cols = index[:, -2], index[:, -1]
+    layers = index[:, 0] if index.shape[1] == 3 else None
+    valid = (rows >= 0) & (rows < modelgrid.nrow) & (cols >= 0) & (cols < modelgrid.ncol)
+    if layers is not None and hasattr(modelgrid, 'nlay'):
+        valid &= (layers >= 0) & (layers < modelgrid.nlay)
+
+    if ibound.ndim == 3:
+        if layers is not None:
+            valid &= layers < ibound.shape[0]
+            k, r, c = layers[valid], rows[valid], cols[valid]
+        else:
+            nlay = ibound.shape[0]
+            k = np.repeat(np.arange(nlay), valid.sum())
+            r, c = np.tile(rows[valid], nlay), np.tile(cols[valid], nlay)
+        flat = np.ravel_multi_index((k, r, c), ibound.shape)
+    elif ibound.ndim == 2:
+        flat = np.ravel_multi_index((rows[valid], cols[valid]), ibound.shape)
+    else:
+        return 0
+
+    flat = np.unique(flat)
+    values = ibound.reshape(-1)  # view: ibound is a fresh C-contiguous copy
+    hits = flat[values[flat] == 1]
+    values[hits] = -1
+    return int(hits.size)
+
+
+def assign_ibound_from_intersection(ibound, intersection_results, modelgrid, debug=False):
     """
     Assign ibound = -1 for cells that intersect with boundary
     
@@ -484,6 +603,7 @@ def assign_ibound_from_intersection(ibound, intersection_results, modelgrid):
     ibound: numpy array with boundary conditions
     intersection_results: results from intersect_boundary_with_flopy_grid
     modelgrid: FloPy modelgrid object (needed to convert cellids to array indices)
+    debug: bool, whether to print a per-cellid trace (slow for many cells)
     
     Returns:
     updated ibound array
@@ -511,209 +631,218 @@ def assign_ibound_from_intersection(ibound, intersection_results, modelgrid):
         for i, cellid in enumerate(intersected_cellids[:5]):
             print(f"  cellid[{i}]: {cellid} (type: {type(cellid)})")
     
-    # Process cellids using modelgrid methods
-    modifications_made = 0
-    
-    def extract_row_col_from_cellid(cellid):
-        """Helper function to extract row, col from various cellid formats including numpy.record"""
-        print(f"    Raw cellid: {cellid} (type: {type(cellid)})")
+    # Structured GridIntersect output (the usual case): convert and assign
+    # all cellids at once
+    cell_index = _cellid_index_array(intersected_cellids)
+    if cell_index is not None:
+        modifications_made = _set_constant_head_cells(new_ibound, cell_index, modelgrid)
+    else:
+        # Process other cellid formats one by one using modelgrid methods;
+        # the per-cell trace is only printed with debug=True
+        log = print if debug else (lambda *args, **kwargs: None)
+        modifications_made = 0
+    
+        def extract_row_col_from_cellid(cellid):
+            """Helper function to extract row, col from various cellid formats including numpy.record"""
+            log(f"    Raw cellid: {cellid} (type: {type(cellid)})")
         
-        # Handle numpy.record objects (common in FloPy GridIntersect results)
-        if isinstance(cellid, np.record):
-            print(f"    Detected numpy.record, dtype: {cellid.dtype}")
-            print(f"    Record fields: {cellid.dtype.names if cellid.dtype.names else 'No named fields'}")
+            # Handle numpy.record objects (common in FloPy GridIntersect results)
+            if isinstance(cellid, np.record):
+                log(f"    Detected numpy.record, dtype: {cellid.dtype}")
+                log(f"    Record fields: {cellid.dtype.names if cellid.dtype.names else 'No named fields'}")
             
-            # Try to access the record as an array or tuple
-            try:
-                # Convert record to tuple/array
-                cellid_array = cellid.item() if hasattr(cellid, 'item') else cellid
-                print(f"    Converted record to: {cellid_array} (type: {type(cellid_array)})")
+                # Try to access the record as an array or tuple
+                try:
+                    # Convert record to tuple/array
+                    cellid_array = cellid.item() if hasattr(cellid, 'item') else cellid
+                    log(f"    Converted record to: {cellid_array} (type: {type(cellid_array)})")
                 
-                # Now process the converted data
-                if isinstance(cellid_array, tuple):
-                    if len(cellid_array) == 1 and isinstance(cellid_array[0], tuple):
-                        # Nested tuple case: ((40, 11),)
-                        inner_tuple = cellid_array[0]
-                        print(f"    Found nested tuple: {inner_tuple}")
-                        if len(inner_tuple) == 2:
-                            row, col = int(inner_tuple[0]), int(inner_tuple[1])
-                            print(f"    Extracted row={row}, col={col}")
+                    # Now process the converted data
+                    if isinstance(cellid_array, tuple):
+                        if len(cellid_array) == 1 and isinstance(cellid_array[0], tuple):
+                            # Nested tuple case: ((40, 11),)
+                            inner_tuple = cellid_array[0]
+                            log(f"    Found nested tuple: {inner_tuple}")
+                            if len(inner_tuple) == 2:
+                                row, col = int(inner_tuple[0]), int(inner_tuple[1])
+                                log(f"    Extracted row={row}, col={col}")
+                                return row, col, None
+                            elif len(inner_tuple) == 3:
+                                layer, row, col = int(inner_tuple[0]), int(inner_tuple[1]), int(inner_tuple[2])
+                                log(f"    Extracted layer={layer}, row={row}, col={col}")
+                                return row, col, layer
+                        elif len(cellid_array) == 2:
+                            # Direct tuple: (40, 11)
+                            row, col = int(cellid_array[0]), int(cellid_array[1])
+                            log(f"    Direct tuple: row={row}, col={col}")
                             return row, col, None
-                        elif len(inner_tuple) == 3:
-                            layer, row, col = int(inner_tuple[0]), int(inner_tuple[1]), int(inner_tuple[2])
-                            print(f"    Extracted layer={layer}, row={row}, col={col}")
+                        elif len(cellid_array) == 3:
+                            # 3D tuple: (0, 40, 11)
+                            layer, row, col = int(cellid_array[0]), int(cellid_array[1]), int(cellid_array[2])
+                            log(f"    3D tuple: layer={layer}, row={row}, col={col}")
                             return row, col, layer
-                    elif len(cellid_array) == 2:
-                        # Direct tuple: (40, 11)
-                        row, col = int(cellid_array[0]), int(cellid_array[1])
-                        print(f"    Direct tuple: row={row}, col={col}")
-                        return row, col, None
-                    elif len(cellid_array) == 3:
-                        # 3D tuple: (0, 40, 11)
-                        layer, row, col = int(cellid_array[0]), int(cellid_array[1]), int(cellid_array[2])
-                        print(f"    3D tuple: layer={layer}, row={row}, col={col}")
-                        return row, col, layer
                 
-                # Try accessing as array indices
-                elif hasattr(cellid_array, '__len__') and len(cellid_array) >= 2:
-                    if len(cellid_array) == 2:
-                        row, col = int(cellid_array[0]), int(cellid_array[1])
-                        print(f"    Array-like (2D): row={row}, col={col}")
-                        return row, col, None
-                    elif len(cellid_array) >= 3:
-                        layer, row, col = int(cellid_array[0]), int(cellid_array[1]), int(cellid_array[2])
-                        print(f"    Array-like (3D): layer={layer}, row={row}, col={col}")
-                        return row, col, layer
+                    # Try accessing as array indices
+                    elif hasattr(cellid_array, '__len__') and len(cellid_array) >= 2:
+                        if len(cellid_array) == 2:
+                            row, col = int(cellid_array[0]), int(cellid_array[1])
+                            log(f"    Array-like (2D): row={row}, col={col}")
+                            return row, col, None
+                        elif len(cellid_array) >= 3:
+                            layer, row, col = int(cellid_array[0]), int(cellid_array[1]), int(cellid_array[2])
+                            log(f"    Array-like (3D): layer={layer}, row={row}, col={col}")
+                            return row, col, layer
                 
-            except Exception as e:
-                print(f"    Error processing numpy.record: {e}")
+                except Exception as e:
+                    log(f"    Error processing numpy.record: {e}")
             
-            # Alternative: try to access record fields directly
-            try:
-                # Check if record has standard field names
-                if hasattr(cellid, 'dtype') and cellid.dtype.names:
-                    fields = cellid.dtype.names
-                    print(f"    Record has fields: {fields}")
+                # Alternative: try to access record fields directly
+                try:
+                    # Check if record has standard field names
+                    if hasattr(cellid, 'dtype') and cellid.dtype.names:
+                        fields = cellid.dtype.names
+                        log(f"    Record has fields: {fields}")
                     
-                    # Common field patterns in FloPy
-                    if 'cellids' in fields:
-                        cellids_value = cellid['cellids']
-                        print(f"    Found 'cellids' field: {cellids_value}")
-                        return extract_row_col_from_cellid(cellids_value)
-                    elif 'row' in fields and 'col' in fields:
-                        row, col = int(cellid['row']), int(cellid['col'])
-                        layer = int(cellid['layer']) if 'layer' in fields else None
-                        print(f"    Found row/col fields: row={row}, col={col}, layer={layer}")
-                        return row, col, layer
+                        # Common field patterns in FloPy
+                        if 'cellids' in fields:
+                            cellids_value = cellid['cellids']
+                            log(f"    Found 'cellids' field: {cellids_value}")
+                            return extract_row_col_from_cellid(cellids_value)
+                        elif 'row' in fields and 'col' in fields:
+                            row, col = int(cellid['row']), int(cellid['col'])
+                            layer = int(cellid['layer']) if 'layer' in fields else None
+                            log(f"    Found row/col fields: row={row}, col={col}, layer={layer}")
+                            return row, col, layer
                 
-                # Try treating the record as indexable
-                if len(cellid) >= 2:
-                    if len(cellid) == 2:
-                        row, col = int(cellid[0]), int(cellid[1])
-                        print(f"    Indexed record (2D): row={row}, col={col}")
-                        return row, col, None
-                    elif len(cellid) >= 3:
-                        layer, row, col = int(cellid[0]), int(cellid[1]), int(cellid[2])
-                        print(f"    Indexed record (3D): layer={layer}, row={row}, col={col}")
-                        return row, col, layer
+                    # Try treating the record as indexable
+                    if len(cellid) >= 2:
+                        if len(cellid) == 2:
+                            row, col = int(cellid[0]), int(cellid[1])
+                            log(f"    Indexed record (2D): row={row}, col={col}")
+                            return row, col, None
+                        elif len(cellid) >= 3:
+                            layer, row, col = int(cellid[0]), int(cellid[1]), int(cellid[2])
+                            log(f"    Indexed record (3D): layer={layer}, row={row}, col={col}")
+                            return row, col, layer
                         
-            except Exception as e:
-                print(f"    Error accessing record fields: {e}")
-        
-        # Handle nested tuples like ((40, 11),)
-        elif isinstance(cellid, tuple) and len(cellid) == 1 and isinstance(cellid[0], tuple):
-            inner_tuple = cellid[0]
-            print(f"    Detected nested tuple, extracting: {inner_tuple}")
-            if len(inner_tuple) == 2:
-                row, col = int(inner_tuple[0]), int(inner_tuple[1])
-                print(f"    Extracted row={row}, col={col}")
-                return row, col, None  # No layer info
-            elif len(inner_tuple) == 3:
-                layer, row, col = int(inner_tuple[0]), int(inner_tuple[1]), int(inner_tuple[2])
-                print(f"    Extracted layer={layer}, row={row}, col={col}")
-                return row, col, layer
+                except Exception as e:
+                    log(f"    Error accessing record fields: {e}")
         
-        # Handle regular tuples like (40, 11) or (0, 40, 11)
-        elif isinstance(cellid, (tuple, list, np.ndarray)):
-            if len(cellid) == 2:
-                row, col = int(cellid[0]), int(cellid[1])
-                print(f"    Direct 2D: row={row}, col={col}")
-                return row, col, None
-            elif len(cellid) == 3:
-                layer, row, col = int(cellid[0]), int(cellid[1]), int(cellid[2])
-                print(f"    Direct 3D: layer={layer}, row={row}, col={col}")
-                return row, col, layer
-        
-        # Handle single numbers (node numbers)
-        elif isinstance(cellid, (int, np.integer)):
-            print(f"    Single node number: {cellid}")
-            # Would need modelgrid.get_lrc() method to convert
-            if hasattr(modelgrid, 'get_lrc'):
-                lrc = modelgrid.get_lrc(cellid)
-                if len(lrc) == 3:
-                    layer, row, col = lrc[0], lrc[1], lrc[2]
-                    print(f"    Converted to layer={layer}, row={row}, col={col}")
+            # Handle nested tuples like ((40, 11),)
+            elif isinstance(cellid, tuple) and len(cellid) == 1 and isinstance(cellid[0], tuple):
+                inner_tuple = cellid[0]
+                log(f"    Detected nested tuple, extracting: {inner_tuple}")
+                if len(inner_tuple) == 2:
+                    row, col = int(inner_tuple[0]), int(inner_tuple[1])
+                    log(f"    Extracted row={row}, col={col}")
+                    return row, col, None  # No layer info
+                elif len(inner_tuple) == 3:
+                    layer, row, col = int(inner_tuple[0]), int(inner_tuple[1]), int(inner_tuple[2])
+                    log(f"    Extracted layer={layer}, row={row}, col={col}")
                     return row, col, layer
-                else:
-                    row, col = lrc[0], lrc[1]
-                    print(f"    Converted to row={row}, col={col}")
+        
+            # Handle regular tuples like (40, 11) or (0, 40, 11)
+            elif isinstance(cellid, (tuple, list, np.ndarray)):
+                if len(cellid) == 2:
+                    row, col = int(cellid[0]), int(cellid[1])
+                    log(f"    Direct 2D: row={row}, col={col}")
                     return row, col, None
+                elif len(cellid) == 3:
+                    layer, row, col = int(cellid[0]), int(cellid[1]), int(cellid[2])
+                    log(f"    Direct 3D: layer={layer}, row={row}, col={col}")
+                    return row, col, layer
         
-        print(f"    Could not parse cellid format: {cellid}")
-        return None, None, None
+            # Handle single numbers (node numbers)
+            elif isinstance(cellid, (int, np.integer)):
+                log(f"    Single node number: {cellid}")
+                # Would need modelgrid.get_lrc() method to convert
+                if hasattr(modelgrid, 'get_lrc'):
+                    lrc = modelgrid.get_lrc(cellid)
+                    if len(lrc) == 3:
+                        layer, row, col = lrc[0], lrc[1], lrc[2]
+                        log(f"    Converted to layer={layer}, row={row}, col={col}")
+                        return row, col, layer
+                    else:
+                        row, col = lrc[0], lrc[1]
+                        log(f"    Converted to row={row}, col={col}")
+                        return row, col, None
+        
+            log(f"    Could not parse cellid format: {cellid}")
+            return None, None, None
     
-    for idx, cellid in enumerate(intersected_cellids):
-        try:
-            print(f"\nProcessing cellid {idx}: {cellid}")
-            
-            # Extract row, col, layer from cellid
-            row, col, layer = extract_row_col_from_cellid(cellid)
-            
-            if row is None or col is None:
-                print(f"  Failed to extract row/col from cellid: {cellid}")
-                continue
+        for idx, cellid in enumerate(intersected_cellids):
+            try:
+                log(f"\nProcessing cellid {idx}: {cellid}")
             
-            # Validate indices against modelgrid
-            if not (0 <= row < modelgrid.nrow):
-                print(f"  Row {row} out of bounds (nrow={modelgrid.nrow})")
-                continue
-            if not (0 <= col < modelgrid.ncol):
-                print(f"  Col {col} out of bounds (ncol={modelgrid.ncol})")
-                continue
+                # Extract row, col, layer from cellid
+                row, col, layer = extract_row_col_from_cellid(cellid)
             
-            # Handle layer validation
-            if layer is not None:
-                if hasattr(modelgrid, 'nlay') and not (0 <= layer < modelgrid.nlay):
-                    print(f"  Layer {layer} out of bounds (nlay={modelgrid.nlay})")
+                if row is None or col is None:
+                    log(f"  Failed to extract row/col from cellid: {cellid}")
                     continue
             
-            print(f"  Valid indices: row={row}, col={col}, layer={layer}")
+                # Validate indices against modelgrid
+                if not (0 <= row < modelgrid.nrow):
+                    log(f"  Row {row} out of bounds (nrow={modelgrid.nrow})")
+                    continue
+                if not (0 <= col < modelgrid.ncol):
+                    log(f"  Col {col} out of bounds (ncol={modelgrid.ncol})")
+                    continue
             
-            # Map to ibound array indices and modify
-            if len(new_ibound.shape) == 3:  # 3D ibound
+                # Handle layer validation
                 if layer is not None:
-                    # Use specific layer
-                    if 0 <= layer < new_ibound.shape[0]:
-                        current_value = new_ibound[layer, row, col]
-                        print(f"  Current ibound[{layer}, {row}, {col}] = {current_value}")
+                    if hasattr(modelgrid, 'nlay') and not (0 <= layer < modelgrid.nlay):
+                        log(f"  Layer {layer} out of bounds (nlay={modelgrid.nlay})")
+                        continue
+            
+                log(f"  Valid indices: row={row}, col={col}, layer={layer}")
+            
+                # Map to ibound array indices and modify
+                if len(new_ibound.shape) == 3:  # 3D ibound
+                    if layer is not None:
+                        # Use specific layer
+                        if 0 <= layer < new_ibound.shape[0]:
+                            current_value = new_ibound[layer, row, col]
+                            log(f"  Current ibound[{layer}, {row}, {col}] = {current_value}")
                         
-                        if current_value == 1:  # Only modify active cells
-                            new_ibound[layer, row, col] = -1
-                            print(f"  ✓ Set ibound[{layer}, {row}, {col}] = -1")
-                            modifications_made += 1
+                            if current_value == 1:  # Only modify active cells
+                                new_ibound[layer, row, col] = -1
+                                log(f"  ✓ Set ibound[{layer}, {row}, {col}] = -1")
+                                modifications_made += 1
+                            else:
+                                log(f"  - Skipped (not active): ibound[{layer}, {row}, {col}] = {current_value}")
                         else:
-                            print(f"  - Skipped (not active): ibound[{layer}, {row}, {col}] = {current_value}")
+                            log(f"  Layer {layer} out of bounds for ibound shape {new_ibound.shape}")
                     else:
-                        print(f"  Layer {layer} out of bounds for ibound shape {new_ibound.shape}")
-                else:
-                    # Apply to all layers (since no layer specified)
-                    for k in range(new_ibound.shape[0]):
-                        current_value = new_ibound[k, row, col]
-                        print(f"  Current ibound[{k}, {row}, {col}] = {current_value}")
+                        # Apply to all layers (since no layer specified)
+                        for k in range(new_ibound.shape[0]):
+                            current_value = new_ibound[k, row, col]
+                            log(f"  Current ibound[{k}, {row}, {col}] = {current_value}")
                         
-                        if current_value == 1:  # Only modify active cells
-                            new_ibound[k, row, col] = -1
-                            print(f"  ✓ Set ibound[{k}, {row}, {col}] = -1")
-                            modifications_made += 1
-                        else:
-                            print(f"  - Skipped (not active): ibound[{k}, {row}, {col}] = {current_value}")
+                            if current_value == 1:  # Only modify active cells
+                                new_ibound[k, row, col] = -1
+                                log(f"  ✓ Set ibound[{k}, {row}, {col}] = -1")
+                                modifications_made += 1
+                            else:
+                                log(f"  - Skipped (not active): ibound[{k}, {row}, {col}] = {current_value}")
             
-            elif len(new_ibound.shape) == 2:  # 2D ibound
-                current_value = new_ibound[row, col]
-                print(f"  Current ibound[{row}, {col}] = {current_value}")
+                elif len(new_ibound.shape) == 2:  # 2D ibound
+                    current_value = new_ibound[row, col]
+                    log(f"  Current ibound[{row}, {col}] = {current_value}")
                 
-                if current_value == 1:  # Only modify active cells
-                    new_ibound[row, col] = -1
-                    print(f"  ✓ Set ibound[{row}, {col}] = -1")
-                    modifications_made += 1
-                else:
-                    print(f"  - Skipped (not active): ibound[{row}, {col}] = {current_value}")
+                    if current_value == 1:  # Only modify active cells
+                        new_ibound[row, col] = -1
+                        log(f"  ✓ Set ibound[{row}, {col}] = -1")
+                        modifications_made += 1
+                    else:
+                        log(f"  - Skipped (not active): ibound[{row}, {col}] = {current_value}")
             
-        except Exception as e:
-            print(f"  Error processing cellid {cellid}: {e}")
-            import traceback
-            traceback.print_exc()
-    
+            except Exception as e:
+                warnings.warn(f"Could not process cellid {cellid}: {e}", stacklevel=2)
+                if debug:
+                    import traceback
+                    traceback.print_exc()
+
     # Summary
     modified_cells = np.sum((ibound == 1) & (new_ibound == -1))
     print(f"\n=== SUMMARY ===")
@@ -881,6 +1010,13 @@ def plot_flopy_intersection_result(intersection_results, ibound):
     
     gix = intersection_results['grid_intersect']
     detailed_intersection = intersection_results['detailed_intersection']
+    if detailed_intersection is None:
+        # Not computed unless the intersect function was called with detailed=True
+        geometry = intersection_results.get('used_geometry', intersection_results['boundary_multiline'])
+        polygon = intersection_results.get('intersection_type') == "polygon_buffered"
+        detailed_intersection = gix.intersect(
+            geometry, shapetype="polygon" if polygon else "linestring"
+        )
     
     fig, ax = plt.subplots(figsize=(12, 8))
     
@@ -909,7 +1045,56 @@ def plot_flopy_intersection_result(intersection_results, ibound):
     plt.tight_layout()
     plt.show()
 
-def grid_to_gdf(modelgrid, crs=None) -> gpd.GeoDataFrame:
+def _grid_vertices(modelgrid):
+    """Cell vertex coordinates ``(xv, yv)``, each of shape (nrow+1, ncol+1)."""
+    return (
+        np.asarray(modelgrid.xvertices, dtype=float),
+        np.asarray(modelgrid.yvertices, dtype=float),
+    )
+
+
+def _cell_corners(xv: np.ndarray, yv: np.ndarray) -> np.ndarray:
+    """Corner coordinates of every cell as an ``(nrow * ncol, 4, 2)`` array.
+
+    ``xv``/``yv`` are the (nrow+1, ncol+1) vertex arrays of a structured grid
+    (or a band of consecutive rows of them).
+    Corner order: (r,c) -> (r,c+1) -> (r+1,c+1) -> (r+1,c)
+    """
+    x = np.stack([xv[:-1, :-1], xv[:-1, 1:], xv[1:, 1:], xv[1:, :-1]], axis=-1)
+    y = np.stack([yv[:-1, :-1], yv[:-1, 1:], yv[1:, 1:], yv[1:, :-1]], axis=-1)
+    return np.stack([x, y], axis=-1).reshape(-1, 4, 2)
+
+
+def grid_to_ragged_array(modelgrid):
+    """Cell polygons of a FloPy StructuredGrid in GeoArrow (ragged array) layout.
+
+    Same output format as ``shapely.to_ragged_array``, built straight from the
+    grid vertices without creating any geometry objects. Pass it to
+    ``shapely.from_ragged_array`` or to GeoArrow tooling as-is.
+
+    Parameters
+    ----------
+    modelgrid : flopy.discretization.StructuredGrid
+        The FloPy structured grid.
+
+    Returns
+    -------
+    tuple
+        ``(shapely.GeometryType.POLYGON, coords, (ring_offsets, polygon_offsets))``
+        with ``coords`` of shape (5 * ncells, 2) holding closed rings in
+        row-major cell order.
+    """
+    from shapely import GeometryType  # Shapely >= 2.0
+
+    corners = _cell_corners(*_grid_vertices(modelgrid))
+    n = len(corners)
+    coords = np.concatenate([corners, corners[:, :1]], axis=1).reshape(-1, 2)
+    ring_offsets = np.arange(0, 5 * n + 1, 5, dtype=np.int64)
+    polygon_offsets = np.arange(n + 1, dtype=np.int64)
+    return GeometryType.POLYGON, coords, (ring_offsets, polygon_offsets)
+
+
+def grid_to_gdf(modelgrid, crs=None, backend: str = "shapely") -> gpd.GeoDataFrame:
     """Convert a FloPy StructuredGrid to a GeoDataFrame of cell polygons.
 
     Parameters
@@ -918,30 +1103,46 @@ def grid_to_gdf(modelgrid, crs=None) -> gpd.GeoDataFrame:
         The FloPy structured grid.
     crs : any, optional
         CRS to assign to the output GeoDataFrame (e.g., from boundary_gdf.crs).
+    backend : {"shapely", "geoarrow"}, default "shapely"
+        "shapely" builds polygons from the corner array; "geoarrow" builds
+        them from :func:`grid_to_ragged_array` buffers via
+        ``shapely.from_ragged_array``. Both give the same cells; use
+        :func:`grid_to_ragged_array` directly when no geometry objects are
+        needed at all.
 
     Returns
     -------
     geopandas.GeoDataFrame
-        Columns: row, col, geometry (Polygon)
+        Columns: row, col (int32), geometry (Polygon)
     """
-    xv, yv = modelgrid.xvertices, modelgrid.yvertices  # shape (nrow+1, ncol+1)
+    if backend not in ("shapely", "geoarrow"):
+        raise ValueError(f"backend must be 'shapely' or 'geoarrow', got {backend!r}")
     nrow, ncol = modelgrid.nrow, modelgrid.ncol
-    polys, rows, cols = [], [], []
-    for r in range(nrow):
-        for c in range(ncol):
-            # Corner order: (r,c) -> (r,c+1) -> (r+1,c+1) -> (r+1,c)
-            polys.append(
-                Polygon(
-                    [
-                        (float(xv[r, c]), float(yv[r, c])),
-                        (float(xv[r, c + 1]), float(yv[r, c + 1])),
-                        (float(xv[r + 1, c + 1]), float(yv[r + 1, c + 1])),
-                        (float(xv[r + 1, c]), float(yv[r + 1, c])),
-                    ]
-                )
+    rows, cols = np.indices((nrow, ncol), dtype=np.int32)
+    rows, cols = rows.ravel(), cols.ravel()
+
+    try:
+        from shapely import from_ragged_array, polygons  # Shapely >= 2.0, vectorized constructors
+    except ImportError:  # pragma: no cover - Shapely 1.x
+        polygons = None
+
+    if polygons is not None and backend == "geoarrow":
+        polys = from_ragged_array(*grid_to_ragged_array(modelgrid))
+    elif polygons is not None:
+        polys = polygons(_cell_corners(*_grid_vertices(modelgrid)))
+    else:
+        xv, yv = _grid_vertices(modelgrid)
+        polys = [
+            Polygon(
+                [
+                    (xv[r, c], yv[r, c]),
+                    (xv[r, c + 1], yv[r, c + 1]),
+                    (xv[r + 1, c + 1], yv[r + 1, c + 1]),
+                    (xv[r + 1, c], yv[r + 1, c]),
+                ]
             )
-            rows.append(r)
-            cols.append(c)
+            for r, c in zip(rows.tolist(), cols.tolist())
+        ]
     g = gpd.GeoDataFrame({"row": rows, "col": cols, "geometry": polys}, crs=crs)
     return g
 
@@ -951,6 +1152,9 @@ def _unary_union(gdf: gpd.GeoDataFrame, repair: bool = False) -> BaseGeometry:
 
     Uses Shapely 2.0's union_all when available (faster, non-deprecated).
     Falls back to shapely.ops.unary_union for older Shapely versions.
+    With Shapely 2 the prepared result is memoized on the WKB of the input
+    geometries, so repeated calls with the same boundary (parameter sweeps)
+    skip the union; an edited boundary produces a different key.
 
     Parameters
     ----------
@@ -968,14 +1172,38 @@ def _unary_union(gdf: gpd.GeoDataFrame, repair: bool = False) -> BaseGeometry:
     if gdf is None or gdf.empty:
         raise ValueError("boundary_gdf is empty or None")
 
-    geoms = gdf.geometry
+    try:
+        from shapely import to_wkb  # Shapely >= 2.0
+    except ImportError:  # pragma: no cover - Shapely 1.x, no memoization
+        return _union_geometries(gdf.geometry, repair)
+    return _cached_union(tuple(to_wkb(np.asarray(gdf.geometry.values))), bool(repair))
+
+
+@lru_cache(maxsize=8)
+def _cached_union(wkb: tuple, repair: bool) -> BaseGeometry:
+    """Prepared union of WKB-encoded geometries (shared, Shapely 2 only)."""
+    from shapely import from_wkb, prepare
+
+    unified = _union_geometries(gpd.GeoSeries(from_wkb(np.array(wkb, dtype=object))), repair)
+    prepare(unified)
+    return unified
+
+
+def _union_geometries(geoms: gpd.GeoSeries, repair: bool) -> BaseGeometry:
     if repair:
-        # Attempt validity repair (Shapely 2 has make_valid)
+        # Attempt validity repair (Shapely 2 has vectorized make_valid);
+        # only the invalid geometries are touched
         try:
-            from shapely import make_valid  # type: ignore
-            geoms = geoms.apply(make_valid)
-        except Exception:
+            from shapely import is_missing, is_valid, make_valid  # type: ignore
+        except ImportError:  # pragma: no cover - Shapely 1.x
             geoms = geoms.apply(lambda g: g if g.is_valid else g.buffer(0))
+        else:
+            arr = np.asarray(geoms.values)
+            bad = ~(is_valid(arr) | is_missing(arr))
+            if bad.any():
+                arr = arr.copy()
+                arr[bad] = make_valid(arr[bad])
+                geoms = gpd.GeoSeries(arr)
 
     # Prefer Shapely 2 union_all
     try:
@@ -991,10 +1219,225 @@ def _unary_union(gdf: gpd.GeoDataFrame, repair: bool = False) -> BaseGeometry:
     return unified
 
 
+# Straddling cells above this count are intersected on a thread pool
+_PARALLEL_MIN_CELLS = 10_000
+
+
+def _intersection_areas(cells: np.ndarray, boundary: BaseGeometry, max_workers=None) -> np.ndarray:
+    """Area of each cell's intersection with ``boundary``.
+
+    Large batches are split into one chunk per worker and run on threads;
+    Shapely 2 releases the GIL inside vectorized GEOS calls.
+    """
+    from shapely import area, intersection
+
+    n_workers = max_workers or min(8, os.cpu_count() or 1)
+    if n_workers <= 1 or len(cells) < _PARALLEL_MIN_CELLS:
+        return area(intersection(cells, boundary))
+    chunks = np.array_split(cells, n_workers)
+    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+        parts = executor.map(lambda chunk: area(intersection(chunk, boundary)), chunks)
+        return np.concatenate(list(parts))
+
+
+def _fraction_inside(cells: np.ndarray, boundary: BaseGeometry, max_workers=None) -> np.ndarray:
+    """Area fraction of each cell polygon that lies inside ``boundary``.
+
+    Cells are first classified with an STRtree query and a prepared
+    ``contains`` test: cells not touching the boundary get 0, cells fully
+    inside get 1, and only the cells straddling the boundary edge go through
+    an actual polygon intersection. ``boundary`` is prepared in place
+    (a no-op when it comes prepared from :func:`_unary_union`).
+    """
+    from shapely import STRtree, area, contains, prepare  # Shapely >= 2.0
+
+    frac = np.zeros(len(cells), dtype=float)
+    candidates = STRtree(cells).query(boundary, predicate="intersects")
+    if candidates.size == 0:
+        return frac
+
+    prepare(boundary)
+    cand_cells = cells[candidates]
+    areas = area(cand_cells)  # zero-area cells stay at 0
+    valid = areas > 0
+    inside = contains(boundary, cand_cells) & valid
+    frac[candidates[inside]] = 1.0
+
+    straddle = valid & ~inside
+    if straddle.any():
+        inter = _intersection_areas(cand_cells[straddle], boundary, max_workers)
+        frac[candidates[straddle]] = inter / areas[straddle]
+    return frac
+
+
+# Grids at least this large use the numba kernels below (when numba is installed)
+_NUMBA_MIN_CELLS = 100_000
+
+
+@lru_cache(maxsize=1)
+def _numba_raster_kernels():
+    """Compile the raster reduce/sample kernels on first use; None without numba."""
+    try:  # optional JIT for large grids
+        from numba import njit, prange
+    except ImportError:
+        return None
+
+    @njit(parallel=True, cache=True)
+    def _fraction_reduce(burned, k, out):
+        nrow, ncol = out.shape
+        inv = 1.0 / (k * k)
+        for i in prange(nrow):
+            for j in range(ncol):
+                total = 0
+                for a in range(i * k, i * k + k):
+                    for b in range(j * k, j * k + k):
+                        total += burned[a, b]
+                out[i, j] = total * inv
+
+    @njit(parallel=True, cache=True)
+    def _sample_raster(raster, rows_f, cols_f, out):
+        height, width = raster.shape
+        for n in prange(out.shape[0]):
+            r = int(np.floor(rows_f[n]))
+            c = int(np.floor(cols_f[n]))
+            if 0 <= r < height and 0 <= c < width:
+                out[n] = raster[r, c]
+            else:
+                out[n] = np.nan
+
+    return _fraction_reduce, _sample_raster
+
+
+def _uniform_grid_layout(cells: np.ndarray, rows: np.ndarray, cols: np.ndarray):
+    """Origin, spacing and shape of an axis-aligned uniform grid of cell polygons.
+
+    Returns ``(xmin, ymax, dx, dy, nrow, ncol)``, or None if the cells are
+    rotated, unevenly spaced, or not laid out by their row/col labels.
+    """
+    from shapely import area, bounds
+
+    if len(cells) == 0:
+        return None
+    b = bounds(cells)
+    widths, heights = b[:, 2] - b[:, 0], b[:, 3] - b[:, 1]
+    dx, dy = float(widths[0]), float(heights[0])
+    if dx <= 0 or dy <= 0:
+        return None
+    tol = 1e-6 * min(dx, dy)
+    xmin, ymax = float(b[:, 0].min()), float(b[:, 3].max())
+    if not (
+        np.allclose(widths, dx, rtol=0, atol=tol)
+        and np.allclose(heights, dy, rtol=0, atol=tol)
+        and np.allclose(area(cells), dx * dy, rtol=1e-9)  # rectangles only
+        and np.allclose(b[:, 0], xmin + cols * dx, rtol=0, atol=tol)
+        and np.allclose(b[:, 3], ymax - rows * dy, rtol=0, atol=tol)
+    ):
+        return None
+    return xmin, ymax, dx, dy, int(rows.max()) + 1, int(cols.max()) + 1
+
+
+def _fraction_inside_raster(
+    cells: np.ndarray,
+    rows: np.ndarray,
+    cols: np.ndarray,
+    boundary: BaseGeometry,
+    supersample: int,
+):
+    """Approximate area fraction per cell from a supersampled rasterization.
+
+    Returns None when the cells do not form an axis-aligned uniform grid.
+    """
+    from rasterio.transform import Affine
+
+    if supersample < 1:
+        raise ValueError("supersample must be >= 1")
+    layout = _uniform_grid_layout(cells, rows, cols)
+    if layout is None:
+        return None
+    xmin, ymax, dx, dy, nrow, ncol = layout
+    k = supersample
+    transform = Affine(dx / k, 0.0, xmin, 0.0, -dy / k, ymax)
+    burned = rasterize(
+        [(boundary, 1)], out_shape=(nrow * k, ncol * k), transform=transform,
+        fill=0, dtype="uint8",
+    )
+    kernels = _numba_raster_kernels() if nrow * ncol >= _NUMBA_MIN_CELLS else None
+    if kernels is not None:
+        frac2d = np.empty((nrow, ncol), dtype=float)
+        kernels[0](burned, k, frac2d)
+    else:
+        frac2d = burned.reshape(nrow, k, ncol, k).mean(axis=(1, 3))
+    return frac2d[rows, cols]
+
+
+def _fraction_inside_uniform(
+    cells: np.ndarray,
+    rows: np.ndarray,
+    cols: np.ndarray,
+    layout: tuple,
+    boundary: BaseGeometry,
+    max_workers=None,
+) -> np.ndarray:
+    """Exact area fractions on an axis-aligned uniform grid, O(perimeter) polygon ops.
+
+    Only cells within the boundary bbox are considered. The boundary rings are
+    burned (all_touched, grown by one cell) to find the cells they may cross;
+    those get a polygon intersection, every other cell lies wholly inside or
+    outside and is classified by a point test on its centre.
+    """
+    from rasterio.transform import Affine
+    from shapely import boundary as boundary_, contains_xy, get_parts
+
+    xmin, ymax, dx, dy, nrow, ncol = layout
+    frac2d = np.zeros((nrow, ncol), dtype=float)
+    bx0, by0, bx1, by1 = boundary.bounds
+    c0 = max(int(np.floor((bx0 - xmin) / dx)), 0)
+    c1 = min(int(np.ceil((bx1 - xmin) / dx)), ncol)
+    r0 = max(int(np.floor((ymax - by1) / dy)), 0)
+    r1 = min(int(np.ceil((ymax - by0) / dy)), nrow)
+    if r0 >= r1 or c0 >= c1:
+        return frac2d[rows, cols]
+
+    transform = Affine(dx, 0.0, xmin + c0 * dx, 0.0, -dy, ymax - r0 * dy)
+    # Per part: a GeometryCollection (e.g. from a clip) has no .boundary itself
+    rings = [b for b in boundary_(get_parts(boundary)) if b is not None and not b.is_empty]
+    if not rings:
+        return frac2d[rows, cols]
+    edge = rasterize(
+        [(ring, 1) for ring in rings], out_shape=(r1 - r0, c1 - c0), transform=transform,
+        fill=0, all_touched=True, dtype="uint8",
+    ).astype(bool)
+    # 3x3 dilation so rounding in the burn cannot miss a crossed cell
+    grown = edge.copy()
+    grown[1:] |= edge[:-1]
+    grown[:-1] |= edge[1:]
+    edge = grown.copy()
+    edge[:, 1:] |= grown[:, :-1]
+    edge[:, :-1] |= grown[:, 1:]
+
+    sub = frac2d[r0:r1, c0:c1]
+    ii, jj = np.nonzero(~edge)
+    sub[ii, jj] = contains_xy(
+        boundary, xmin + (c0 + jj + 0.5) * dx, ymax - (r0 + ii + 0.5) * dy
+    )
+
+    index = np.full((nrow, ncol), -1, dtype=np.intp)
+    index[rows, cols] = np.arange(len(rows))
+    ii, jj = np.nonzero(edge)
+    idx = index[r0 + ii, c0 + jj]
+    keep = idx >= 0
+    ii, jj, idx = ii[keep], jj[keep], idx[keep]
+    sub[ii, jj] = _intersection_areas(cells[idx], boundary, max_workers) / (dx * dy)
+    return frac2d[rows, cols]
+
+
 def compute_active_mask(
     grid_gdf: gpd.GeoDataFrame,
     boundary_gdf: gpd.GeoDataFrame,
     frac_threshold: float = 0.5,
+    method: str = "exact",
+    supersample: int = 8,
+    max_workers: int | None = None,
 ) -> gpd.GeoDataFrame:
     """Compute area fraction of each cell inside the boundary and tag active cells.
 
@@ -1006,6 +1449,23 @@ def compute_active_mask(
         Boundary polygons (can be multi-part). Will be unioned.
     frac_threshold : float, default 0.5
         Minimum fraction of cell area within boundary to mark as active.
+    method : {"exact", "raster", "centers"}, default "exact"
+        "exact" intersects cell polygons with the boundary; on axis-aligned
+        uniform grids only the cells crossed by the boundary edge are
+        intersected and the rest are classified by their centre. "raster" burns the
+        boundary at ``supersample`` x ``supersample`` sub-pixels per cell and
+        averages them, which is much faster on large grids but approximates
+        the fraction to about 1/supersample**2 per straddling cell. It needs an
+        axis-aligned grid with uniform spacing and 'row'/'col' columns and
+        falls back to "exact" otherwise. "centers" only tests whether each cell centre lies inside
+        the boundary (frac_inside is 0 or 1); this is the fastest and matches
+        ``frac_threshold=0.5`` for cells cut by a straight boundary edge, but
+        can differ near corners, thin features, or for other thresholds.
+    supersample : int, default 8
+        Sub-pixels per cell side for ``method="raster"``.
+    max_workers : int, optional
+        Threads used for the polygon intersections of ``method="exact"`` when
+        many cells straddle the boundary (default: up to 8, by CPU count).
 
     Returns
     -------
@@ -1021,11 +1481,44 @@ def compute_active_mask(
         )
         grid_gdf = grid_gdf.to_crs(boundary_gdf.crs)
 
+    if method not in ("exact", "raster", "centers"):
+        raise ValueError(f"method must be 'exact', 'raster' or 'centers', got {method!r}")
+
     boundary = _unary_union(boundary_gdf)
-    areas = grid_gdf.geometry.area
-    inter_areas = grid_gdf.geometry.intersection(boundary).area
-    with np.errstate(divide="ignore", invalid="ignore"):
-        frac_inside = np.where(areas > 0, inter_areas / areas, 0.0)
+    cells = np.asarray(grid_gdf.geometry.values)
+    frac_inside = None
+    if method == "centers":
+        from shapely import centroid, contains_xy, get_coordinates
+
+        xy = get_coordinates(centroid(cells))
+        frac_inside = contains_xy(boundary, xy[:, 0], xy[:, 1]).astype(float)
+    elif method == "raster" and {"row", "col"} <= set(grid_gdf.columns):
+        frac_inside = _fraction_inside_raster(
+            cells,
+            grid_gdf["row"].to_numpy(),
+            grid_gdf["col"].to_numpy(),
+            boundary,
+            int(supersample),
+        )
+    try:
+        if frac_inside is None:
+            layout = None
+            if {"row", "col"} <= set(grid_gdf.columns):
+                rows = grid_gdf["row"].to_numpy()
+                cols = grid_gdf["col"].to_numpy()
+                layout = _uniform_grid_layout(cells, rows, cols)
+            if layout is not None:
+                frac_inside = _fraction_inside_uniform(
+                    cells, rows, cols, layout, boundary, max_workers
+                )
+            else:
+                frac_inside = _fraction_inside(cells, boundary, max_workers)
+    except ImportError:  # pragma: no cover - Shapely < 2.0
+        areas = grid_gdf.geometry.area.to_numpy()
+        inter_areas = grid_gdf.geometry.intersection(boundary).area.to_numpy()
+        frac_inside = np.divide(
+            inter_areas, areas, out=np.zeros_like(areas, dtype=float), where=areas > 0
+        )
 
     out = grid_gdf.copy()
     out["frac_inside"] = frac_inside
@@ -1039,6 +1532,8 @@ def ibound_from_active(
     active_field: str = "active",
     active_value: int = 1,
     inactive_value: int = 0,
+    as_view: bool = False,
+    dtype=np.int32,
 ) -> np.ndarray:
     """Build a 3D IBOUND array from a grid GeoDataFrame with an 'active' field.
 
@@ -1054,6 +1549,12 @@ def ibound_from_active(
         Value assigned to active cells in IBOUND.
     inactive_value : int
         Value assigned to inactive cells in IBOUND.
+    as_view : bool
+        If True, return a read-only broadcast view of one layer instead of
+        allocating every layer (for consumers that only read IBOUND).
+    dtype : numpy integer dtype
+        IBOUND dtype; int32 by default (what FloPy writes), int8 is enough
+        for the usual {-1, 0, 1} codes.
 
     Returns
     -------
@@ -1062,18 +1563,31 @@ def ibound_from_active(
     """
     if active_field not in grid_gdf.columns:
         raise KeyError(f"Column '{active_field}' not found in grid_gdf")
-
-    nrow = int(grid_gdf["row"].max()) + 1
-    ncol = int(grid_gdf["col"].max()) + 1
-    ib2d = np.full((nrow, ncol), inactive_value, dtype=int)
-
-    # Set active cells
-    active_rows = grid_gdf.loc[grid_gdf[active_field], "row"].to_numpy()
-    active_cols = grid_gdf.loc[grid_gdf[active_field], "col"].to_numpy()
-    ib2d[active_rows, active_cols] = active_value
+    dtype = np.dtype(dtype)
+    info = np.iinfo(dtype)  # raises ValueError for non-integer dtypes
+    for value in (active_value, inactive_value):
+        if not info.min <= value <= info.max:
+            raise ValueError(f"IBOUND value {value} does not fit in {dtype}")
+
+    rows = grid_gdf["row"].to_numpy()
+    cols = grid_gdf["col"].to_numpy()
+    active = grid_gdf[active_field].to_numpy(dtype=bool)
+    nrow = int(rows.max()) + 1
+    ncol = int(cols.max()) + 1
+
+    if len(rows) == nrow * ncol and np.array_equal(rows * ncol + cols, np.arange(len(rows))):
+        # Row-major cell order (as produced by grid_to_gdf): reshape, no scatter
+        ib2d = np.where(active.reshape(nrow, ncol), active_value, inactive_value).astype(dtype)
+    else:
+        ib2d = np.full((nrow, ncol), inactive_value, dtype=dtype)
+        ib2d[rows[active], cols[active]] = active_value
 
     # Stack across layers
-    ibound = np.repeat(ib2d[np.newaxis, :, :], repeats=int(nlay), axis=0)
+    shape = (int(nlay), nrow, ncol)
+    if as_view:
+        return np.broadcast_to(ib2d, shape)
+    ibound = np.empty(shape, dtype=ib2d.dtype)
+    ibound[:] = ib2d
     return ibound
 
 
@@ -1082,6 +1596,8 @@ def build_grid_gdf_and_ibound(
     boundary_gdf: gpd.GeoDataFrame,
     frac_threshold: float = 0.5,
     nlay: int = 1,
+    method: str = "exact",
+    dtype=np.int32,
 ) -> Tuple[gpd.GeoDataFrame, np.ndarray]:
     """Convenience wrapper: grid polygons + active tagging + IBOUND.
 
@@ -1095,6 +1611,10 @@ def build_grid_gdf_and_ibound(
         Minimum fraction of cell area within boundary to mark as active.
     nlay : int
         Number of layers for IBOUND.
+    method : str
+        Area-fraction method passed to :func:`compute_active_mask`.
+    dtype : numpy integer dtype
+        IBOUND dtype passed to :func:`ibound_from_active`.
 
     Returns
     -------
@@ -1103,10 +1623,112 @@ def build_grid_gdf_and_ibound(
         ibound is a (nlay, nrow, ncol) integer array.
     """
     grid_gdf = grid_to_gdf(modelgrid, crs=boundary_gdf.crs)
-    grid_gdf = compute_active_mask(grid_gdf, boundary_gdf, frac_threshold=frac_threshold)
-    ibound = ibound_from_active(grid_gdf, nlay=nlay)
+    grid_gdf = compute_active_mask(
+        grid_gdf, boundary_gdf, frac_threshold=frac_threshold, method=method
+    )
+    ibound = ibound_from_active(grid_gdf, nlay=nlay, dtype=dtype)
     return grid_gdf, ibound
 
+
+def build_ibound_by_row_bands(
+    modelgrid,
+    boundary_gdf: gpd.GeoDataFrame,
+    frac_threshold: float = 0.5,
+    nlay: int = 1,
+    chunk_rows: int = 256,
+    method: str = "exact",
+    dtype=np.int32,
+    max_workers: int | None = None,
+) -> np.ndarray:
+    """IBOUND for very large grids without building the full cell GeoDataFrame.
+
+    Same active tagging as :func:`build_grid_gdf_and_ibound`, but cell
+    polygons exist for only ``chunk_rows`` rows at a time: each row band is
+    built, tested against the part of the boundary overlapping the band and
+    written into the 2D result, so peak memory is bounded by the band size
+    rather than the grid size.
+
+    Parameters
+    ----------
+    modelgrid : flopy.discretization.StructuredGrid
+        The FloPy structured grid.
+    boundary_gdf : GeoDataFrame
+        Case-study boundary polygons (CRS should match model coordinates).
+    frac_threshold : float
+        Minimum fraction of cell area within boundary to mark as active.
+    nlay : int
+        Number of layers for IBOUND.
+    chunk_rows : int
+        Grid rows processed per band.
+    method : str
+        Area-fraction method passed to :func:`compute_active_mask`.
+    dtype : numpy integer dtype
+        IBOUND dtype.
+    max_workers : int, optional
+        Passed to :func:`compute_active_mask`.
+
+    Returns
+    -------
+    numpy.ndarray
+        (nlay, nrow, ncol) IBOUND array with 1 for active and 0 for inactive cells.
+    """
+    from shapely import box as box_, intersection, polygons, total_bounds
+
+    if chunk_rows < 1:
+        raise ValueError("chunk_rows must be >= 1")
+    xv, yv = _grid_vertices(modelgrid)
+    nrow, ncol = modelgrid.nrow, modelgrid.ncol
+    boundary = _unary_union(boundary_gdf)
+    ib2d = np.zeros((nrow, ncol), dtype=dtype)
+    for r0 in range(0, nrow, chunk_rows):
+        r1 = min(r0 + chunk_rows, nrow)
+        rows, cols = np.indices((r1 - r0, ncol))
+        rows, cols = rows.ravel(), cols.ravel()
+        cells = polygons(_cell_corners(xv[r0:r1 + 1], yv[r0:r1 + 1]))
+        part = intersection(boundary, box_(*total_bounds(cells)))
+        if part.is_empty:
+            continue
+        band = compute_active_mask(
+            gpd.GeoDataFrame({"row": rows, "col": cols, "geometry": cells}, crs=boundary_gdf.crs),
+            gpd.GeoDataFrame(geometry=[part], crs=boundary_gdf.crs),
+            frac_threshold=frac_threshold,
+            method=method,
+            max_workers=max_workers,
+        )
+        ib2d[r0 + rows, cols] = band["active"].to_numpy()
+    ibound = np.empty((int(nlay), nrow, ncol), dtype=ib2d.dtype)
+    ibound[:] = ib2d
+    return ibound
+
+
+# Column names tried, in order, for the isohypse elevation values
+_ELEVATION_COLUMNS = ("ELEVATION", "ELEV", "VALUE", "Z", "GW_ELEV", "HEIGHT", "H")
+
+
+def _detect_elevation_column(gdf):
+    """Elevation column of an isohypse GeoDataFrame, or None.
+
+    A standard name from ``_ELEVATION_COLUMNS`` wins; otherwise the first
+    numeric column. The lookup is memoized on the column names and dtypes.
+    """
+    return _elevation_column_for_schema(tuple(zip(gdf.columns, gdf.dtypes)))
+
+
+@lru_cache(maxsize=32)
+def _elevation_column_for_schema(schema: tuple):
+    """Elevation column for a ``((name, dtype), ...)`` schema, or None."""
+    from pandas.api.types import is_bool_dtype, is_numeric_dtype
+
+    names = [name for name, _ in schema]
+    for col in _ELEVATION_COLUMNS:
+        if col in names:
+            return col
+    for name, dtype in schema:
+        if is_numeric_dtype(dtype) and not is_bool_dtype(dtype):
+            return name
+    return None
+
+
 def interpolate_isohypses_to_grid(gdf_isohypses, modelgrid, buffer_distance=500):
     """
     Interpolate groundwater isohypses to a MODFLOW structured grid.
@@ -1126,26 +1748,27 @@ def interpolate_isohypses_to_grid(gdf_isohypses, modelgrid, buffer_distance=500)
         2D array of interpolated groundwater elevations matching the model grid
     """
     
-    # Create model grid boundary polygon for clipping
-    from shapely.geometry import Polygon
-    
-    # Get model grid extent
+    import shapely
+
+    # Buffered model grid extent used for clipping
     xmin, xmax, ymin, ymax = modelgrid.extent
+    x0, y0 = xmin - buffer_distance, ymin - buffer_distance
+    x1, y1 = xmax + buffer_distance, ymax + buffer_distance
     
-    # Create buffered boundary polygon
-    boundary = Polygon([
-        (xmin - buffer_distance, ymin - buffer_distance),
-        (xmax + buffer_distance, ymin - buffer_distance),
-        (xmax + buffer_distance, ymax + buffer_distance),
-        (xmin - buffer_distance, ymax + buffer_distance)
-    ])
-    
-    # Create boundary geodataframe with same CRS as isohypses
-    boundary_gdf = gpd.GeoDataFrame([1], geometry=[boundary], crs=gdf_isohypses.crs)
-    
-    # Clip isohypses to the buffered model grid extent
+    # Clip isohypses to the buffered extent: a spatial-index bbox filter first,
+    # then only features crossing the rectangle edge are actually cut
     print(f"Original isohypses: {len(gdf_isohypses)} features")
-    gdf_clipped = gpd.clip(gdf_isohypses, boundary_gdf)
+    gdf_clipped = gdf_isohypses.cx[x0:x1, y0:y1]
+    b = shapely.bounds(np.asarray(gdf_clipped.geometry.values))
+    straddle = ~((b[:, 0] >= x0) & (b[:, 1] >= y0) & (b[:, 2] <= x1) & (b[:, 3] <= y1))
+    if straddle.any():
+        geoms = np.asarray(gdf_clipped.geometry.values).copy()
+        # intersection (not clip_by_rect) keeps lines lying on the edge, as gpd.clip does
+        geoms[straddle] = shapely.intersection(geoms[straddle], shapely.box(x0, y0, x1, y1))
+        gdf_clipped = gdf_clipped.set_geometry(
+            gpd.GeoSeries(geoms, index=gdf_clipped.index, crs=gdf_clipped.crs)
+        )
+        gdf_clipped = gdf_clipped[~shapely.is_empty(geoms)]
     print(f"Clipped isohypses: {len(gdf_clipped)} features")
     
     if len(gdf_clipped) == 0:
@@ -1162,75 +1785,45 @@ def interpolate_isohypses_to_grid(gdf_isohypses, modelgrid, buffer_distance=500)
     x_flat = x_centers.flatten()
     y_flat = y_centers.flatten()
     
-    # Extract points and values from isohypse lines
-    points_x = []
-    points_y = []
-    values = []
-    
-    # Assuming the elevation values are in a column (adjust column name as needed)
-    # Common column names: 'ELEVATION', 'VALUE', 'Z', 'GW_ELEV', etc.
-    elevation_column = None
-    
-    # Try to identify the elevation column
-    possible_columns = ['ELEVATION', 'ELEV', 'VALUE', 'Z', 'GW_ELEV', 'HEIGHT', 'H']
-    for col in possible_columns:
-        if col in gdf_isohypses.columns:
-            elevation_column = col
-            break
-    
+    # Identify the elevation column (standard name, else first numeric column)
+    elevation_column = _detect_elevation_column(gdf_isohypses)
     if elevation_column is None:
-        # If no standard column found, use the first numeric column
-        numeric_columns = gdf_isohypses.select_dtypes(include=[np.number]).columns
-        if len(numeric_columns) > 0:
-            elevation_column = numeric_columns[0]
-            print(f"Using column '{elevation_column}' for elevation values")
-        else:
-            raise ValueError("No elevation column found in the geodataframe")
+        raise ValueError("No elevation column found in the geodataframe")
+    if elevation_column not in _ELEVATION_COLUMNS:
+        print(f"Using column '{elevation_column}' for elevation values")
+    
+    # Extract all vertices of the (multi)line features in one pass
+    geoms = gdf_isohypses.geometry.values
+    is_line = np.isin(shapely.get_type_id(geoms), (1, 5))  # LineString, MultiLineString
+    geoms = np.asarray(geoms)[is_line]
+    points = shapely.get_coordinates(geoms)
+    values = np.repeat(
+        gdf_isohypses[elevation_column].to_numpy()[is_line],
+        shapely.get_num_coordinates(geoms),
+    )
     
-    # Extract points along each isohypse line
-    for idx, row in gdf_isohypses.iterrows():
-        geom = row.geometry
-        elevation = row[elevation_column]
-        
-        if geom.geom_type == 'LineString':
-            # Sample points along the line
-            coords = list(geom.coords)
-            for coord in coords:
-                points_x.append(coord[0])
-                points_y.append(coord[1])
-                values.append(elevation)
-        
-        elif geom.geom_type == 'MultiLineString':
-            # Handle multipart lines
-            for line in geom.geoms:
-                coords = list(line.coords)
-                for coord in coords:
-                    points_x.append(coord[0])
-                    points_y.append(coord[1])
-                    values.append(elevation)
-    
-    # Convert to numpy arrays
-    points_x = np.array(points_x)
-    points_y = np.array(points_y)
-    values = np.array(values)
-    
-    # Create points array for scipy interpolation
-    points = np.column_stack((points_x, points_y))
+    # Grid points for scipy interpolation
     grid_points = np.column_stack((x_flat, y_flat))
     
     # Interpolate using different methods (you can choose the best one)
     print("Interpolating groundwater elevations...")
     
     # Method 1: Linear interpolation (recommended for most cases)
+    from scipy.interpolate import LinearNDInterpolator, NearestNDInterpolator
+    from scipy.spatial import Delaunay
+
     try:
-        interpolated_values = griddata(points, values, grid_points, method='linear')
+        # Triangulate once; the nearest-neighbour fill only queries the
+        # cells left outside the convex hull.
+        linear = LinearNDInterpolator(Delaunay(points), values)
+        interpolated_values = linear(grid_points)
         
         # Fill any NaN values with nearest neighbor interpolation
         nan_mask = np.isnan(interpolated_values)
         if np.any(nan_mask):
             print("Filling NaN values with nearest neighbor interpolation...")
-            interpolated_nearest = griddata(points, values, grid_points, method='nearest')
-            interpolated_values[nan_mask] = interpolated_nearest[nan_mask]
+            nearest = NearestNDInterpolator(points, values)
+            interpolated_values[nan_mask] = nearest(grid_points[nan_mask])
     
     except Exception as e:
         print(f"Linear interpolation failed: {e}")
@@ -1274,16 +1867,9 @@ def alternative_raster_interpolation(gdf_isohypses, modelgrid, cell_size=10):
     transform = from_bounds(xmin, ymin, xmax, ymax, width, height)
     
     # Identify elevation column (same logic as above)
-    elevation_column = None
-    possible_columns = ['ELEVATION', 'ELEV', 'VALUE', 'Z', 'GW_ELEV', 'HEIGHT', 'H']
-    for col in possible_columns:
-        if col in gdf_isohypses.columns:
-            elevation_column = col
-            break
-    
+    elevation_column = _detect_elevation_column(gdf_isohypses)
     if elevation_column is None:
-        numeric_columns = gdf_isohypses.select_dtypes(include=[np.number]).columns
-        elevation_column = numeric_columns[0] if len(numeric_columns) > 0 else 'value'
+        elevation_column = 'value'
     
     # Create shapes for rasterization
     shapes = [(geom, value) for geom, value in zip(gdf_isohypses.geometry, gdf_isohypses[elevation_column])]
@@ -1295,19 +1881,32 @@ def alternative_raster_interpolation(gdf_isohypses, modelgrid, cell_size=10):
     x_centers = modelgrid.xcellcenters.flatten()
     y_centers = modelgrid.ycellcenters.flatten()
     
-    # Sample the raster at model grid points
-    from rasterio.transform import rowcol
-    interpolated_values = []
-    
-    for x, y in zip(x_centers, y_centers):
-        row, col = rowcol(transform, x, y)
-        if 0 <= row < height and 0 <= col < width:
-            interpolated_values.append(raster[row, col])
-        else:
-            interpolated_values.append(np.nan)
+    # Sample the raster at model grid points (inverse affine, all points at once)
+    cols_f, rows_f = ~transform * (x_centers, y_centers)
+    rows = np.floor(rows_f).astype(np.intp)
+    cols = np.floor(cols_f).astype(np.intp)
+    # Visit the raster in memory order (matters for rotated grids, whose
+    # cell order scatters across raster rows); scatter back afterwards
+    flat = rows * width + cols
+    order = None
+    if flat.size > 1 and (np.diff(flat) < 0).any():
+        order = np.argsort(flat, kind="stable")
+        rows_f, cols_f, rows, cols = rows_f[order], cols_f[order], rows[order], cols[order]
+    kernels = _numba_raster_kernels() if x_centers.size >= _NUMBA_MIN_CELLS else None
+    if kernels is not None:
+        sampled = np.empty(x_centers.shape, dtype=np.float32)
+        kernels[1](raster, rows_f, cols_f, sampled)
+    else:
+        valid = (rows >= 0) & (rows < height) & (cols >= 0) & (cols < width)
+        sampled = np.full(x_centers.shape, np.nan, dtype=np.float32)
+        sampled[valid] = raster[rows[valid], cols[valid]]
+    if order is None:
+        interpolated_values = sampled
+    else:
+        interpolated_values = np.empty_like(sampled)
+        interpolated_values[order] = sampled
     
-    # Convert to numpy array and reshape
-    interpolated_values = np.array(interpolated_values)
+    # Reshape to the grid
     gw_elevations = interpolated_values.reshape(modelgrid.xcellcenters.shape)
     
     return gw_elevations
@@ -0,0 +1,302 @@
+"""
+Unit tests for case_utils helpers.
+
+Tests cover:
+- unzip_file: extraction target, member subsets, verbose output
+- recarray_from_wells: column layout and values
+- sample_heads: vectorised gather, list and DataFrame output, record-index
+  reuse keyed on mtime_ns/size, file closed between reads
+- summarize_budget: per-term sums for a time step
+- lazy imports: flopy/pyplot not loaded on import, figure defaults applied
+  once matplotlib is imported
+
+Run with: uv run pytest _SUPPORT/tests/test_case_utils.py -q
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import zipfile
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add src to path (mirrors the style in other tests in this directory)
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import case_utils
+from case_utils import recarray_from_wells, sample_heads, summarize_budget, unzip_file
+
+
+# =============================================================================
+# Test Fixtures
+# =============================================================================
+
+@pytest.fixture
+def sample_zip(tmp_path: Path) -> Path:
+    """Small archive with a nested member."""
+    zip_path = tmp_path / "archive.zip"
+    with zipfile.ZipFile(zip_path, "w") as zf:
+        zf.writestr("a.txt", "alpha")
+        zf.writestr("sub/b.txt", "beta")
+    return zip_path
+
+
+# =============================================================================
+# unzip_file
+# =============================================================================
+
+class TestUnzipFile:
+
+    def test_extracts_to_caller_supplied_folder(self, sample_zip, tmp_path):
+        target = tmp_path / "out"
+        names = unzip_file(str(sample_zip), extract_to=str(target))
+        assert sorted(names) == ["a.txt", "sub/b.txt"]
+        assert (target / "a.txt").read_text() == "alpha"
+        assert (target / "sub" / "b.txt").read_text() == "beta"
+        # Nothing is extracted next to the archive when a target is given
+        assert not (sample_zip.parent / "a.txt").exists()
+
+    def test_defaults_to_archive_folder(self, sample_zip):
+        unzip_file(str(sample_zip))
+        assert (sample_zip.parent / "a.txt").exists()
+
+    def test_members_subset(self, sample_zip, tmp_path):
+        target = tmp_path / "out"
+        names = unzip_file(str(sample_zip), extract_to=str(target), members=["sub/b.txt"])
+        assert names == ["sub/b.txt"]
+        assert (target / "sub" / "b.txt").exists()
+        assert not (target / "a.txt").exists()
+
+    def test_parallel_matches_serial(self, tmp_path):
+        zip_path = tmp_path / "many.zip"
+        with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            for n in range(20):
+                zf.writestr(f"dir{n % 3}/nested/file{n}.txt", f"payload {n}" * 100)
+        serial, parallel = tmp_path / "serial", tmp_path / "parallel"
+        unzip_file(str(zip_path), extract_to=str(serial), max_workers=1)
+        unzip_file(str(zip_path), extract_to=str(parallel), max_workers=4)
+        for n in range(20):
+            rel = Path(f"dir{n % 3}") / "nested" / f"file{n}.txt"
+            assert (parallel / rel).read_text() == (serial / rel).read_text()
+
+    def test_quiet_by_default(self, sample_zip, tmp_path, capsys):
+        unzip_file(str(sample_zip), extract_to=str(tmp_path / "out"))
+        assert capsys.readouterr().out == ""
+
+    def test_verbose_prints_preview(self, sample_zip, tmp_path, capsys):
+        unzip_file(str(sample_zip), extract_to=str(tmp_path / "out"), verbose=True)
+        out = capsys.readouterr().out
+        assert "Contains 2 files" in out
+        assert "Extraction successful" in out
+
+    def test_bad_zip_raises(self, tmp_path):
+        bogus = tmp_path / "bogus.zip"
+        bogus.write_bytes(b"not a zip archive")
+        with pytest.raises(zipfile.BadZipFile):
+            unzip_file(str(bogus))
+
+
+# =============================================================================
+# recarray_from_wells
+# =============================================================================
+
+class TestRecarrayFromWells:
+
+    def test_fields_and_values(self):
+        wells = [
+            {'layer': 0, 'row': 5, 'col': 7, 'rate': -150.0},
+            {'layer': 1, 'row': 2, 'col': 3, 'rate': 80.5},
+        ]
+        arr = recarray_from_wells(wells)
+        assert arr.dtype.names == ('k', 'i', 'j', 'flux')
+        np.testing.assert_array_equal(arr['k'], [0, 1])
+        np.testing.assert_array_equal(arr['i'], [5, 2])
+        np.testing.assert_array_equal(arr['j'], [7, 3])
+        np.testing.assert_allclose(arr['flux'], [-150.0, 80.5])
+
+    def test_empty(self):
+        arr = recarray_from_wells([])
+        assert arr.shape == (0,)
+        assert arr.dtype.names == ('k', 'i', 'j', 'flux')
+
+
+# =============================================================================
+# sample_heads
+# =============================================================================
+
+class _FakeHeadFile:
+    """Stand-in for flopy HeadFile with two saved records."""
+
+    heads = np.arange(2 * 3 * 4, dtype=np.float32).reshape(2, 3, 4)
+    opened = 0
+    last = None
+
+    def __init__(self, path):
+        self.filename = path
+        self.file = open(path, "rb")
+        type(self).opened += 1
+        type(self).last = self
+
+    def close(self):
+        self.file.close()
+
+    def get_data(self, kstpkper=None):
+        if kstpkper == (0, 0):
+            return self.heads - 100.0
+        return self.heads  # last record
+
+
+class _FakeBudgetFile:
+    """Stand-in for flopy CellBudgetFile with two time steps."""
+
+    def __init__(self, path):
+        self.filename = path
+        self.file = open(path, "rb")
+        self.recordarray = np.array(
+            [
+                (1, 1, b'     CONSTANT HEAD'),
+                (1, 1, b'             WELLS'),
+                (1, 1, b'   RIVER LEAKAGE  '),
+                (1, 2, b'             WELLS'),
+            ],
+            dtype=[('kstp', 'i4'), ('kper', 'i4'), ('text', 'S18')],
+        )
+        self._data = {0: np.ones((2, 2)), 1: np.full((2, 2), -2.0),
+                      2: np.full((2, 2), 0.5), 3: np.full((2, 2), -4.0)}
+
+    def get_record(self, idx):
+        return self._data[idx]
+
+    def close(self):
+        self.file.close()
+
+
+@pytest.fixture
+def output_files(tmp_path, monkeypatch):
+    """Fake head/budget readers plus on-disk placeholder files."""
+    # case_utils imports the readers lazily from flopy.utils
+    monkeypatch.setattr("flopy.utils.HeadFile", _FakeHeadFile)
+    monkeypatch.setattr("flopy.utils.CellBudgetFile", _FakeBudgetFile)
+    case_utils.clear_output_file_cache()
+    _FakeHeadFile.opened = 0
+    hds = tmp_path / "model.hds"
+    cbc = tmp_path / "model.cbc"
+    hds.write_bytes(b"")
+    cbc.write_bytes(b"")
+    yield str(hds), str(cbc)
+    case_utils.clear_output_file_cache()
+
+
+class TestSampleHeads:
+
+    def test_list_output(self, output_files):
+        hds, _ = output_files
+        out = sample_heads(hds, [(0, 1, 2), (1, 2, 3)])
+        assert out == [
+            {'k': 0, 'i': 1, 'j': 2, 'head': 6.0},
+            {'k': 1, 'i': 2, 'j': 3, 'head': 23.0},
+        ]
+        assert all(type(s['k']) is int and type(s['head']) is float for s in out)
+
+    def test_kstpkper(self, output_files):
+        hds, _ = output_files
+        out = sample_heads(hds, [(0, 0, 1)], kstpkper=(0, 0))
+        assert out[0]['head'] == -99.0
+
+    def test_dataframe_output(self, output_files):
+        hds, _ = output_files
+        df = sample_heads(hds, [(0, 1, 2), (1, 2, 3)], as_dataframe=True)
+        assert list(df.columns) == ['k', 'i', 'j', 'head']
+        np.testing.assert_allclose(df['head'], [6.0, 23.0])
+
+    def test_empty_lrc_list(self, output_files):
+        hds, _ = output_files
+        assert sample_heads(hds, []) == []
+
+    def test_head_file_is_parsed_once(self, output_files):
+        hds, _ = output_files
+        sample_heads(hds, [(0, 0, 0)])
+        sample_heads(hds, [(1, 1, 1)])
+        assert _FakeHeadFile.opened == 1
+
+    def test_file_is_closed_between_reads(self, output_files):
+        hds, _ = output_files
+        sample_heads(hds, [(0, 0, 0)])
+        assert _FakeHeadFile.last.file.closed
+
+    def test_rewrite_with_same_mtime_is_reparsed(self, output_files):
+        hds, _ = output_files
+        sample_heads(hds, [(0, 0, 0)])
+        st = os.stat(hds)
+        Path(hds).write_bytes(b"rerun")
+        os.utime(hds, ns=(st.st_atime_ns, st.st_mtime_ns))
+        sample_heads(hds, [(0, 0, 0)])
+        assert _FakeHeadFile.opened == 2
+
+    def test_clear_output_file_cache(self, output_files):
+        hds, _ = output_files
+        sample_heads(hds, [(0, 0, 0)])
+        case_utils.clear_output_file_cache()
+        sample_heads(hds, [(0, 0, 0)])
+        assert _FakeHeadFile.opened == 2
+
+
+class TestGatherHeads:
+
+    def test_large_request_matches_numpy(self, monkeypatch):
+        monkeypatch.setattr(case_utils, "_NUMBA_GATHER_MIN_POINTS", 10)
+        rng = np.random.default_rng(0)
+        arr = rng.random((3, 40, 50)).astype(np.float32)
+        ks = rng.integers(0, 3, 500).astype(np.intp)
+        is_ = rng.integers(0, 40, 500).astype(np.intp)
+        js = rng.integers(0, 50, 500).astype(np.intp)
+        out = case_utils._gather_heads(arr, ks, is_, js)
+        assert out.dtype == np.float64
+        np.testing.assert_array_equal(out, arr[ks, is_, js].astype(float))
+
+    def test_out_of_bounds_still_raises(self, monkeypatch):
+        monkeypatch.setattr(case_utils, "_NUMBA_GATHER_MIN_POINTS", 1)
+        arr = np.zeros((1, 2, 2))
+        idx = np.array([0], dtype=np.intp)
+        with pytest.raises(IndexError):
+            case_utils._gather_heads(arr, idx, idx, np.array([5], dtype=np.intp))
+
+
+class TestLazyImports:
+
+    def test_import_does_not_load_flopy_or_pyplot(self):
+        code = (
+            "import sys; sys.path.insert(0, %r); import case_utils; "
+            "print('flopy' in sys.modules, 'matplotlib.pyplot' in sys.modules)"
+        ) % str(Path(case_utils.__file__).parent)
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        assert out.stdout.strip() == "False False"
+
+    def test_figure_defaults_apply_on_first_matplotlib_import(self):
+        code = (
+            "import sys; sys.path.insert(0, %r); import case_utils; "
+            "import matplotlib.pyplot as plt; print(tuple(plt.rcParams['figure.figsize']))"
+        ) % str(Path(case_utils.__file__).parent)
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        assert out.stdout.strip() == "(8.0, 6.0)"
+
+
+class TestSummarizeBudget:
+
+    def test_sums_terms_for_time_step(self, output_files):
+        _, cbc = output_files
+        out = summarize_budget(cbc, ['WELLS', 'river leakage', 'CONSTANT HEAD'])
+        assert out == {'WELLS': -8.0, 'river leakage': 2.0, 'CONSTANT HEAD': 4.0}
+
+    def test_other_time_step(self, output_files):
+        _, cbc = output_files
+        out = summarize_budget(cbc, ['WELLS', 'CONSTANT HEAD'], kstpkper=(0, 1))
+        assert out == {'WELLS': -16.0, 'CONSTANT HEAD': None}
+
+    def test_missing_term(self, output_files):
+        _, cbc = output_files
+        assert summarize_budget(cbc, ['DRAINS']) == {'DRAINS': None}
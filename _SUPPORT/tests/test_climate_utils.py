@@ -0,0 +1,196 @@
+"""
+Unit tests for climate_utils.read_climate_data.
+
+Tests cover:
+- parsing synthetic MeteoSwiss normtable files (header + tab-separated table)
+- station filtering and output column layout
+- non-UTF-8 (cp1252) encoded files
+- on-disk cache of the parsed result (plain .npz arrays), its invalidation on
+  file changes and cache-format version bumps
+- plot_climate_data: annual totals in the caption
+
+Run with: uv run pytest _SUPPORT/tests/test_climate_utils.py -q
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add src to path (mirrors the style in other tests in this directory)
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import climate_utils
+from climate_utils import MONTHS, plot_climate_data, read_climate_data
+
+
+# =============================================================================
+# Test Fixtures
+# =============================================================================
+
+def _write_normtable(folder: Path, shortname: str, longname: str, rows: dict,
+                     encoding: str = "utf-8") -> Path:
+    """Write a minimal MeteoSwiss-style normtable file."""
+    header = [
+        "MeteoSwiss",
+        "Climate normals",
+        "",
+        "Reference period 1991-2020",
+        "",
+        "",
+        longname,
+    ]
+    table = ["\t".join(["Station"] + MONTHS + ["Year"])]
+    for station, values in rows.items():
+        table.append("\t".join([station] + [str(v) for v in values] + [str(sum(values))]))
+    path = folder / f"climate-reports-normtables_{shortname}_1991-2020.txt"
+    path.write_text("\n".join(header + table) + "\n", encoding=encoding)
+    return path
+
+
+@pytest.fixture
+def climate_folder(tmp_path: Path) -> Path:
+    precip = [float(10 * m) for m in range(1, 13)]
+    temp = [float(m) for m in range(1, 13)]
+    _write_normtable(tmp_path, "rre150m0", "Precipitation (mm)",
+                     {"Zürich / Fluntern": precip, "Basel / Binningen": temp})
+    _write_normtable(tmp_path, "tre200m0", "Air temperature 2 m (°C)",
+                     {"Zürich / Fluntern": temp}, encoding="cp1252")
+    return tmp_path
+
+
+# =============================================================================
+# read_climate_data
+# =============================================================================
+
+class TestReadClimateData:
+
+    def test_columns_and_rows(self, climate_folder):
+        df = read_climate_data(str(climate_folder), station_string="Fluntern")
+        assert list(df.columns) == ["shortname", "longname", "station"] + MONTHS
+        assert sorted(df["shortname"]) == ["rre150m0", "tre200m0"]
+        assert (df["station"] == "Fluntern").all()
+
+    def test_monthly_values(self, climate_folder):
+        df = read_climate_data(str(climate_folder), station_string="Fluntern")
+        precip = df.loc[df["shortname"] == "rre150m0", MONTHS].to_numpy().ravel()
+        assert precip.tolist() == pytest.approx([10 * m for m in range(1, 13)])
+
+    def test_monthly_block_is_float32(self, climate_folder):
+        df = read_climate_data(str(climate_folder), use_cache=False)
+        assert all(df[m].dtype == np.float32 for m in MONTHS)
+
+    def test_cp1252_file_decoded(self, climate_folder):
+        df = read_climate_data(str(climate_folder), station_string="Fluntern")
+        longname = df.loc[df["shortname"] == "tre200m0", "longname"].iloc[0]
+        assert longname == "Air temperature 2 m (°C)"
+
+    def test_serial_matches_parallel(self, climate_folder):
+        serial = read_climate_data(str(climate_folder), max_workers=1, use_cache=False)
+        parallel = read_climate_data(str(climate_folder), max_workers=4, use_cache=False)
+        assert serial.equals(parallel)
+
+    def test_unknown_station_returns_empty(self, climate_folder):
+        df = read_climate_data(str(climate_folder), station_string="Nowhere")
+        assert df.empty
+
+    def test_missing_folder_raises(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            read_climate_data(str(tmp_path / "missing"))
+
+
+class TestReadClimateDataCache:
+
+    def test_second_call_uses_cache(self, climate_folder, monkeypatch):
+        first = read_climate_data(str(climate_folder))
+        assert list(climate_folder.glob(".climate_cache_*.npz"))
+
+        def _fail(*args, **kwargs):
+            raise AssertionError("files should not be re-parsed")
+
+        monkeypatch.setattr(climate_utils, "_parse_normtable", _fail)
+        second = read_climate_data(str(climate_folder))
+        assert second.equals(first)
+
+    def test_modified_file_invalidates_cache(self, climate_folder):
+        read_climate_data(str(climate_folder))
+        precip = [1.0] * 12
+        path = _write_normtable(climate_folder, "rre150m0", "Precipitation (mm)",
+                                {"Zürich / Fluntern": precip})
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        df = read_climate_data(str(climate_folder))
+        values = df.loc[df["shortname"] == "rre150m0", MONTHS].to_numpy().ravel()
+        assert values.tolist() == pytest.approx(precip)
+
+    def test_cache_is_per_station(self, climate_folder):
+        read_climate_data(str(climate_folder), station_string="Fluntern")
+        df = read_climate_data(str(climate_folder), station_string="Binningen")
+        assert df["shortname"].tolist() == ["rre150m0"]
+
+    def test_cache_is_plain_arrays(self, climate_folder):
+        first = read_climate_data(str(climate_folder))
+        (cache,) = climate_folder.glob(".climate_cache_*.npz")
+        with np.load(cache, allow_pickle=False) as npz:
+            assert npz["values"].dtype == np.float32
+        second = read_climate_data(str(climate_folder))
+        assert second[MONTHS].dtypes.eq(np.float32).all()
+        assert second.equals(first)
+
+    def test_format_version_invalidates_cache(self, climate_folder, monkeypatch):
+        read_climate_data(str(climate_folder))
+        monkeypatch.setattr(climate_utils, "_CLIMATE_CACHE_VERSION", -1)
+        calls = []
+        real_parse = climate_utils._parse_normtable
+
+        def _spy(*args, **kwargs):
+            calls.append(args[0])
+            return real_parse(*args, **kwargs)
+
+        monkeypatch.setattr(climate_utils, "_parse_normtable", _spy)
+        read_climate_data(str(climate_folder))
+        assert calls
+
+    def test_use_cache_false_writes_nothing(self, climate_folder):
+        read_climate_data(str(climate_folder), use_cache=False)
+        assert not list(climate_folder.glob(".climate_cache_*.npz"))
+
+
+# =============================================================================
+# plot_climate_data
+# =============================================================================
+
+class TestPlotClimateData:
+
+    @staticmethod
+    def _frame():
+        rows = {
+            "rre150m0": [60.0] * 12,
+            "tre200m0": [float(m) for m in range(12)],
+            "tre2dymn": [float(m) - 3 for m in range(12)],
+            "tre2dymx": [float(m) + 3 for m in range(12)],
+        }
+        return pd.DataFrame([
+            {"shortname": k, "longname": k, "station": "Fluntern", **dict(zip(MONTHS, v))}
+            for k, v in rows.items()
+        ])
+
+    def test_caption_reports_annual_totals(self):
+        _, fig = plot_climate_data(self._frame(), station_string="Fluntern")
+        title = fig.axes[0].get_title().replace("\n", " ")
+        assert "Annual precipitation 720 mm" in title
+        assert "mean temperature 5.5" in title
+        plt.close(fig)
+
+    def test_unknown_station(self):
+        assert plot_climate_data(self._frame(), station_string="Nowhere") == (None, None)
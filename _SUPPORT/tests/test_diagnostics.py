@@ -0,0 +1,534 @@
+"""
+Unit tests for the environment checks in diagnostics.
+
+Tests cover:
+- parse_environment: conda + pip dependencies, name cleaning, exclusions
+- _DEP_CLEAN_RE: comments, extras, direct references, version specifiers
+- parse_environment: cached YAML parse and its invalidation on file change
+- parse_environment: missing file note
+- run_import_checks: import-name candidates, missing vs optional, result order,
+  serial retry of packages that failed on the thread pool
+- _module: heavy imports resolved once per session
+- viz_smoke_test: warning/logging setup applied once
+- plotly_3d_test: surface capability probe
+- geospatial_smoke_test / build_summary: failed checks tracked in "errors"
+- modflow_minimal_model: cached result keyed on model inputs and executable
+- _clean_diag_workspace: removes only diagtest* entries and the stamp, keeps
+  the workspace directory itself
+- _run_with_tail: bounded stdout/stderr tails, timeout, undecodable output
+- _read_first_head_record: single/double precision MODFLOW head files
+
+Run with: uv run pytest _SUPPORT/tests/test_diagnostics.py -q
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import types
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add src to path (mirrors the style in other tests in this directory)
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import diagnostics
+from diagnostics import parse_environment, run_import_checks
+
+
+# =============================================================================
+# Test Fixtures
+# =============================================================================
+
+ENV_YAML = """\
+name: gw
+channels:
+  - conda-forge
+dependencies:
+  - python=3.12
+  - numpy>=1.26
+  - flopy  # modelling
+  - geopandas
+  - pip
+  - pip:
+      - rich[jupyter]>=13
+      - mypkg @ git+https://example.invalid/mypkg.git
+      - requests~=2.31
+"""
+
+
+@pytest.fixture
+def env_file(tmp_path: Path) -> Path:
+    path = tmp_path / "environment.yml"
+    path.write_text(ENV_YAML, encoding="utf-8")
+    diagnostics._load_env_dependencies.cache_clear()
+    yield path
+    diagnostics._load_env_dependencies.cache_clear()
+
+
+# =============================================================================
+# parse_environment
+# =============================================================================
+
+class TestParseEnvironment:
+
+    def test_required_list(self, env_file):
+        out = parse_environment(str(env_file), exclude_packages=["Python", "pip"])
+        assert out["required_list"] == [
+            "flopy", "geopandas", "mypkg", "numpy", "requests", "rich",
+        ]
+
+    def test_case_insensitive_dedup_keeps_first_casing(self, tmp_path):
+        path = tmp_path / "environment.yml"
+        path.write_text(
+            "dependencies:\n  - GeoPandas\n  - pip:\n      - geopandas>=1\n",
+            encoding="utf-8",
+        )
+        assert parse_environment(str(path))["required_list"] == ["GeoPandas"]
+
+    def test_raw_strings_include_pip_section(self, env_file):
+        out = parse_environment(str(env_file))
+        assert "python=3.12" in out["raw_dependency_strings"]
+        assert "requests~=2.31" in out["raw_dependency_strings"]
+        assert out["source"] == str(env_file)
+
+    def test_optional_packages_sorted(self, env_file):
+        out = parse_environment(str(env_file), optional_packages={"rich", "flopy"})
+        assert out["optional_packages"] == ["flopy", "rich"]
+
+    @pytest.mark.parametrize("dep, name", [
+        ("numpy", "numpy"),
+        ("  numpy  ", "numpy"),
+        ("numpy>=1.26", "numpy"),
+        ("python=3.12", "python"),
+        ("requests~=2.31", "requests"),
+        ("scipy!=1.0", "scipy"),
+        ("flopy  # modelling", "flopy"),
+        ("flopy#modelling", "flopy"),
+        ("rich[jupyter]>=13", "rich"),
+        ("mypkg @ git+https://example.invalid/mypkg.git", "mypkg"),
+        ("mypkg@git+https://example.invalid/mypkg.git", "mypkg"),
+        ("pywin32; sys_platform == 'win32'", "pywin32"),
+        ("scikit-image 0.22", "scikit-image"),
+    ])
+    def test_clean_name(self, tmp_path, dep, name):
+        path = tmp_path / "environment.yml"
+        path.write_text(f"dependencies:\n  - \"{dep}\"\n", encoding="utf-8")
+        assert parse_environment(str(path))["required_list"] == [name]
+
+    def test_missing_file_returns_note(self, tmp_path):
+        out = parse_environment(str(tmp_path / "missing.yml"))
+        assert out["required_list"] == []
+        assert "not found" in out["note"]
+
+
+class TestParseEnvironmentCache:
+
+    def test_second_call_reuses_parse(self, env_file, monkeypatch):
+        first = parse_environment(str(env_file))
+
+        import yaml
+
+        def _fail(*args, **kwargs):
+            raise AssertionError("file should not be re-parsed")
+
+        monkeypatch.setattr(yaml, "load", _fail)
+        assert parse_environment(str(env_file)) == first
+
+    def test_modified_file_is_reparsed(self, env_file):
+        parse_environment(str(env_file))
+        env_file.write_text("dependencies:\n  - scipy\n", encoding="utf-8")
+        st = env_file.stat()
+        os.utime(env_file, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        assert parse_environment(str(env_file))["required_list"] == ["scipy"]
+
+    def test_pure_python_loader_fallback(self, env_file, monkeypatch):
+        import yaml
+
+        expected = parse_environment(str(env_file))
+        diagnostics._load_env_dependencies.cache_clear()
+        monkeypatch.delattr(yaml, "CSafeLoader", raising=False)
+        assert parse_environment(str(env_file)) == expected
+
+
+# =============================================================================
+# run_import_checks
+# =============================================================================
+
+class TestRunImportChecks:
+
+    def test_present_package(self):
+        out = run_import_checks(["numpy"])
+        entry = out["status"]["numpy"]
+        assert entry["ok"] is True
+        assert entry["import_name"] == "numpy"
+        assert entry["version"] not in ("", None)
+
+    def test_special_import_name(self):
+        out = run_import_checks(["pyyaml"])
+        assert out["status"]["pyyaml"]["import_name"] == "yaml"
+
+    @pytest.mark.parametrize("pkg, expected", [
+        ("numpy", ("numpy",)),
+        ("scikit-image", ("scikit_image", "skimage", "scikit-image")),
+        ("GDAL", ("GDAL", "osgeo")),
+        ("pyyaml", ("pyyaml", "yaml")),
+    ])
+    def test_candidates(self, pkg, expected):
+        assert diagnostics._candidates(pkg) == expected
+
+    def test_missing_essential_and_optional(self):
+        out = run_import_checks(
+            ["no-such-pkg-a", "no_such_pkg_b"], optional_packages={"no_such_pkg_b"}
+        )
+        assert out["missing_essential"] == ["no-such-pkg-a"]
+        assert out["missing_optional"] == ["no_such_pkg_b"]
+        entry = out["status"]["no-such-pkg-a"]
+        assert entry["ok"] is False and entry["optional"] is False
+        assert entry["attempts"] == [
+            "no_such_pkg_a: ModuleNotFoundError",
+            "no-such-pkg-a: ModuleNotFoundError",
+        ]
+        assert entry["error"] == entry["attempts"][-1]
+
+    def test_absent_candidates_are_not_imported(self, monkeypatch):
+        import importlib
+
+        real_import = importlib.import_module
+        imported: list[str] = []
+
+        def _spy(name, *args, **kwargs):
+            imported.append(name)
+            return real_import(name, *args, **kwargs)
+
+        monkeypatch.setattr(importlib, "import_module", _spy)
+        out = run_import_checks(
+            ["python-graphviz-missing", "pyyaml"], max_workers=1, import_modules=True
+        )
+        assert out["missing_essential"] == ["python-graphviz-missing"]
+        assert imported == ["yaml"]
+
+    def test_metadata_version_skips_import(self, monkeypatch):
+        import importlib
+        import importlib.metadata
+
+        def _fail(*args, **kwargs):
+            raise AssertionError("installed distributions should not be imported")
+
+        monkeypatch.setattr(importlib, "import_module", _fail)
+        entry = run_import_checks(["pyyaml"])["status"]["pyyaml"]
+        assert entry == {
+            "ok": True,
+            "version": importlib.metadata.version("pyyaml"),
+            "import_name": "yaml",
+        }
+
+    def test_import_modules_uses_module_version(self):
+        import yaml
+
+        entry = run_import_checks(["pyyaml"], import_modules=True)["status"]["pyyaml"]
+        assert entry["version"] == yaml.__version__
+
+    def test_broken_package_reports_import_error(self, tmp_path, monkeypatch):
+        (tmp_path / "broken_pkg_for_tests.py").write_text("raise ImportError('boom')\n")
+        monkeypatch.syspath_prepend(str(tmp_path))
+        entry = run_import_checks(["broken_pkg_for_tests"])["status"]["broken_pkg_for_tests"]
+        assert entry["ok"] is False
+        assert entry["error"] == "broken_pkg_for_tests: ImportError"
+
+    def test_parallel_matches_serial(self):
+        pkgs = ["numpy", "no-such-pkg", "pyyaml", "json", "missing_opt", "re"]
+        serial = run_import_checks(pkgs, {"missing_opt"}, max_workers=1)
+        parallel = run_import_checks(pkgs, {"missing_opt"}, max_workers=4)
+        assert parallel == serial
+        assert list(parallel["status"]) == pkgs
+
+    def test_parallel_failure_is_retried_serially(self, monkeypatch):
+        real_check = diagnostics._check_import
+        failed: list[str] = []
+
+        def _flaky(pkg, optional_set, import_modules=False):
+            if pkg == "numpy" and not failed:
+                failed.append(pkg)  # e.g. a _DeadlockError from a concurrent import
+                return {"ok": False, "error": "numpy: _DeadlockError",
+                        "attempts": [], "optional": False}
+            return real_check(pkg, optional_set, import_modules)
+
+        monkeypatch.setattr(diagnostics, "_check_import", _flaky)
+        out = run_import_checks(["numpy", "json"], max_workers=2)
+        assert failed == ["numpy"]
+        assert out["status"]["numpy"]["ok"] is True
+        assert out["missing_essential"] == []
+
+    def test_empty_list(self):
+        out = run_import_checks([])
+        assert out == {"status": {}, "missing_essential": [], "missing_optional": []}
+
+
+# =============================================================================
+# modflow_minimal_model
+# =============================================================================
+
+@pytest.fixture
+def fake_flopy(tmp_path, monkeypatch):
+    """A flopy module that finds a dummy mf2005 but cannot build models."""
+    exe = tmp_path / "bin" / "mf2005"
+    exe.parent.mkdir()
+    exe.write_bytes(b"binary")
+
+    def _no_model(*args, **kwargs):
+        raise AssertionError("model should not be rebuilt")
+
+    module = types.ModuleType("flopy")
+    module.__version__ = "0.0-test"
+    module.which_calls = []
+
+    def _which(name):
+        module.which_calls.append(name)
+        return str(exe) if name == "mf2005" else None
+
+    module.which = _which
+    module.modflow = types.SimpleNamespace(Modflow=_no_model)
+    monkeypatch.setitem(sys.modules, "flopy", module)
+    diagnostics._module.cache_clear()
+    diagnostics._find_mf_exe.cache_clear()
+    yield exe
+    diagnostics._module.cache_clear()
+    diagnostics._find_mf_exe.cache_clear()
+
+
+class TestModflowMinimalModelCache:
+
+    def _stamp(self, ws, exe, diag):
+        key = diagnostics._diag_stamp_key(str(exe), "0.0-test")
+        (ws / ".diag_stamp.json").write_text(json.dumps({"key": key, "diag": diag}))
+
+    def test_matching_stamp_returns_cached_result(self, fake_flopy, tmp_path):
+        ws = tmp_path / "ws"
+        ws.mkdir()
+        self._stamp(ws, fake_flopy, {"run_success": True, "analytical_ok": True})
+        diag = diagnostics.modflow_minimal_model(persistent_workspace=ws)
+        assert diag["from_cache"] is True
+        assert diag["run_success"] is True and diag["analytical_ok"] is True
+        assert diag["executable_path"] == str(fake_flopy)
+
+    def test_changed_executable_invalidates_stamp(self, fake_flopy, tmp_path):
+        ws = tmp_path / "ws"
+        ws.mkdir()
+        self._stamp(ws, fake_flopy, {"run_success": True})
+        fake_flopy.write_bytes(b"rebuilt binary")
+        with pytest.raises(AssertionError, match="rebuilt"):
+            diagnostics.modflow_minimal_model(persistent_workspace=ws)
+
+    def test_executable_lookup_is_cached(self, fake_flopy, tmp_path):
+        ws = tmp_path / "ws"
+        ws.mkdir()
+        self._stamp(ws, fake_flopy, {"run_success": True})
+        diagnostics.modflow_minimal_model(persistent_workspace=ws)
+        diagnostics.modflow_minimal_model(persistent_workspace=ws)
+        assert sys.modules["flopy"].which_calls == ["mf2005"]
+
+    def test_executable_found_in_cwd(self, fake_flopy, tmp_path):
+        sys.modules["flopy"].which = lambda name: None
+        (tmp_path / "mfnwt").write_bytes(b"binary")
+        found = diagnostics._find_mf_exe(
+            diagnostics._MF_EXE_CANDIDATES, "", str(tmp_path)
+        )
+        assert found == os.path.realpath(tmp_path / "mfnwt")
+
+    def test_use_cache_false_ignores_stamp(self, fake_flopy, tmp_path):
+        ws = tmp_path / "ws"
+        ws.mkdir()
+        self._stamp(ws, fake_flopy, {"run_success": True})
+        with pytest.raises(AssertionError, match="rebuilt"):
+            diagnostics.modflow_minimal_model(persistent_workspace=ws, use_cache=False)
+
+
+class TestRunWithTail:
+
+    def test_keeps_only_the_tail(self):
+        code = (
+            "import sys\n"
+            "for i in range(5000): print(f'line {i}')\n"
+            "print('oops', file=sys.stderr)\n"
+            "sys.exit(3)\n"
+        )
+        rc, out, err = diagnostics._run_with_tail([sys.executable, "-c", code], timeout=60)
+        assert rc == 3
+        assert out.endswith("line 4999\n")
+        assert "line 4900" not in out and len(out) <= 2000
+        assert err == "oops\n"
+
+    def test_non_utf8_output_is_replaced(self):
+        code = (
+            "import sys\n"
+            "sys.stdout.buffer.write(b'caf\\xe9\\n' * 20000)\n"
+            "print('done')\n"
+        )
+        rc, out, _ = diagnostics._run_with_tail([sys.executable, "-c", code], timeout=60)
+        assert rc == 0
+        assert out.endswith("caf\ufffd\ndone\n")
+
+    def test_timeout_raises(self):
+        import subprocess
+
+        with pytest.raises(subprocess.TimeoutExpired):
+            diagnostics._run_with_tail(
+                [sys.executable, "-c", "import time; time.sleep(30)"], timeout=0.5
+            )
+
+    def test_missing_command(self):
+        with pytest.raises(FileNotFoundError):
+            diagnostics._run_with_tail(["no-such-command-for-tests"], timeout=5)
+
+
+class TestCleanDiagWorkspace:
+
+    def test_keeps_other_files(self, tmp_path):
+        (tmp_path / "diagtest.nam").write_text("x")
+        (tmp_path / "diagtest_dir").mkdir()
+        (tmp_path / "notes.txt").write_text("keep")
+        diagnostics._clean_diag_workspace(tmp_path)
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["notes.txt"]
+
+    def test_diag_only_workspace_is_emptied_in_place(self, tmp_path):
+        ws = tmp_path / "ws"
+        ws.mkdir(mode=0o750)
+        for name in ("diagtest.nam", "diagtest.hds", ".diag_stamp.json"):
+            (ws / name).write_text("x")
+        before = ws.stat()
+        diagnostics._clean_diag_workspace(ws)
+        after = ws.stat()
+        assert list(ws.iterdir()) == []
+        assert (after.st_ino, after.st_mode) == (before.st_ino, before.st_mode)
+
+    def test_symlinked_workspace_is_cleaned(self, tmp_path):
+        real = tmp_path / "real"
+        real.mkdir()
+        (real / "diagtest.nam").write_text("x")
+        link = tmp_path / "link"
+        link.symlink_to(real, target_is_directory=True)
+        diagnostics._clean_diag_workspace(link)
+        assert link.is_symlink() and list(real.iterdir()) == []
+
+    def test_empty_workspace(self, tmp_path):
+        diagnostics._clean_diag_workspace(tmp_path)
+        assert tmp_path.is_dir()
+
+
+def _write_head_file(path: Path, heads: np.ndarray, real: str = "<f4",
+                     text: bytes = b"            HEAD") -> Path:
+    """Write one MODFLOW binary head record (stream access, no markers)."""
+    nrow, ncol = heads.shape
+    header = (
+        np.array([1, 1], dtype="<i4").tobytes()
+        + np.array([1.0, 1.0], dtype=real).tobytes()
+        + text
+        + np.array([ncol, nrow, 1], dtype="<i4").tobytes()
+    )
+    path.write_bytes(header + heads.astype(real).tobytes())
+    return path
+
+
+class TestReadFirstHeadRecord:
+
+    @pytest.mark.parametrize("real", ["<f4", "<f8"])
+    def test_reads_heads(self, tmp_path, real):
+        heads = np.linspace(10.0, 0.0, 10).reshape(1, 10)
+        path = _write_head_file(tmp_path / "diagtest.hds", heads, real)
+        out = diagnostics._read_first_head_record(path, 1, 10)
+        np.testing.assert_allclose(out, heads, rtol=1e-6)
+
+    def test_grid_mismatch_returns_none(self, tmp_path):
+        path = _write_head_file(tmp_path / "diagtest.hds", np.zeros((1, 10)))
+        assert diagnostics._read_first_head_record(path, 1, 12) is None
+
+    def test_other_record_type_returns_none(self, tmp_path):
+        path = _write_head_file(tmp_path / "diagtest.hds", np.zeros((1, 10)),
+                                text=b"        DRAWDOWN")
+        assert diagnostics._read_first_head_record(path, 1, 10) is None
+
+
+class TestModuleCache:
+
+    def test_module_is_resolved_once(self, monkeypatch):
+        import importlib
+
+        diagnostics._module.cache_clear()
+        calls: list[str] = []
+        real_import = importlib.import_module
+
+        def _spy(name, *args, **kwargs):
+            calls.append(name)
+            return real_import(name, *args, **kwargs)
+
+        monkeypatch.setattr(importlib, "import_module", _spy)
+        assert diagnostics._module("json") is diagnostics._module("json")
+        assert calls == ["json"]
+        diagnostics._module.cache_clear()
+
+    def test_missing_module_raises_each_time(self):
+        for _ in range(2):
+            with pytest.raises(ImportError):
+                diagnostics._module("no_such_module_for_tests")
+
+
+class TestVizSmokeTest:
+
+    def test_warning_setup_runs_once(self):
+        diagnostics._silence_viz_warnings.cache_clear()
+        diagnostics.viz_smoke_test()
+        diagnostics.viz_smoke_test()
+        info = diagnostics._silence_viz_warnings.cache_info()
+        assert (info.misses, info.hits) == (1, 1)
+        diagnostics._silence_viz_warnings.cache_clear()
+
+    def test_matplotlib_without_pyplot(self):
+        pytest.importorskip("matplotlib")
+        status = diagnostics.viz_smoke_test()
+        assert status["matplotlib"] == "ok (simple plot created)"
+        assert status["matplotlib_backend_used"] == "Agg (direct)"
+
+
+class TestPlotly3dTest:
+
+    def test_surface_probe(self):
+        pytest.importorskip("plotly")
+        assert diagnostics.plotly_3d_test() == {"success": True}
+
+
+# =============================================================================
+# geospatial_smoke_test / build_summary
+# =============================================================================
+
+class TestGeospatialErrors:
+
+    def test_missing_core_stack_is_an_error(self, monkeypatch):
+        def _missing(name):
+            raise ImportError(f"No module named {name!r}")
+
+        monkeypatch.setattr(diagnostics, "_module", _missing)
+        checks = diagnostics.geospatial_smoke_test()
+        assert checks["errors"] == ["geopandas"]
+        assert "No module named" in checks["error"]
+
+    def test_summary_reads_errors_list(self):
+        summary = diagnostics.build_summary({"geospatial": {"errors": ["fiona"]}})
+        assert summary["geospatial_errors"] == ["fiona"]
+        assert not summary["overall_ready"]
+
+    def test_summary_scans_legacy_results(self):
+        geospatial = {"geopandas": True, "fiona": "ERROR: boom", "rasterio": True}
+        summary = diagnostics.build_summary({"geospatial": geospatial})
+        assert summary["geospatial_errors"] == ["fiona"]
+
+    def test_summary_ready(self):
+        summary = diagnostics.build_summary({
+            "packages": {"missing_essential": []},
+            "modflow": {"executable_found": True, "run_success": True},
+            "geospatial": {"errors": []},
+        })
+        assert summary["overall_ready"] is True
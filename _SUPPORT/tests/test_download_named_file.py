@@ -0,0 +1,165 @@
+"""
+Unit tests for data_utils.download_named_file (network-free).
+
+Tests cover:
+- streaming the response body to disk in large chunks
+- existing file is reused unless force=True
+- failed transfers keep only a .part file, which the next call resumes
+- download_named_files fetches several names through the shared session
+- README sidecars are fetched alongside the data file
+
+Run with: uv run pytest _SUPPORT/tests/test_download_named_file.py -q
+"""
+
+from __future__ import annotations
+
+import io
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path (mirrors the style in other tests in this directory)
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import data_utils
+from data_utils import download_named_file, download_named_files
+
+
+# =============================================================================
+# Helpers
+# =============================================================================
+
+class _FakeResponse:
+    """Minimal stand-in for a streamed requests.Response."""
+
+    def __init__(self, payload: bytes, fail_after: int | None = None, status_code: int = 200):
+        self.status_code = status_code
+        self.headers = {"content-length": str(len(payload))}
+        self.raw = _FakeRaw(payload, fail_after)
+
+    def raise_for_status(self):
+        return None
+
+    def close(self):
+        return None
+
+
+class _FakeRaw(io.BytesIO):
+    def __init__(self, payload: bytes, fail_after: int | None):
+        super().__init__(payload)
+        self.decode_content = False
+        self.read_sizes: list[int] = []
+        self._fail_after = fail_after
+
+    def read(self, size=-1):
+        self.read_sizes.append(size)
+        if self._fail_after is not None and self.tell() >= self._fail_after:
+            raise ConnectionError("connection dropped")
+        return super().read(size)
+
+
+@pytest.fixture
+def fake_source(monkeypatch):
+    """Route download_named_file to an in-memory payload."""
+    state = {
+        "payload": b"0123456789" * 1000,
+        "fail_after": None,
+        "supports_range": True,
+        "responses": [],
+        "headers": [],
+    }
+
+    def fake_get(url, *args, headers=None, **kwargs):
+        headers = dict(headers or {})
+        state["headers"].append(headers)
+        payload = state["payload"]
+        status = 200
+        if "Range" in headers and state["supports_range"]:
+            offset = int(headers["Range"].split("=")[1].rstrip("-"))
+            payload, status = payload[offset:], 206
+        resp = _FakeResponse(payload, state["fail_after"], status_code=status)
+        state["responses"].append(resp)
+        return resp
+
+    monkeypatch.setattr(data_utils, "get_data_urls", lambda: {
+        "sample": {"url": "https://example.invalid/sample.bin", "filename": "sample.bin"},
+        "other": {"url": "https://example.invalid/other.bin", "filename": "other.bin"},
+        "documented": {
+            "url": "https://example.invalid/documented.bin", "filename": "documented.bin",
+            "readme_url": "https://example.invalid/notes.md",
+        },
+    })
+    monkeypatch.setattr(data_utils._SESSION, "get", fake_get)
+    return state
+
+
+# =============================================================================
+# download_named_file
+# =============================================================================
+
+class TestDownloadNamedFile:
+
+    def test_writes_payload(self, fake_source, tmp_path):
+        path = download_named_file("sample", dest_folder=str(tmp_path))
+        assert Path(path).read_bytes() == fake_source["payload"]
+
+    def test_reads_in_large_chunks(self, fake_source, tmp_path):
+        download_named_file("sample", dest_folder=str(tmp_path))
+        raw = fake_source["responses"][0].raw
+        assert raw.decode_content is True
+        assert max(raw.read_sizes) >= data_utils._DOWNLOAD_CHUNK_SIZE
+
+    def test_existing_file_is_reused(self, fake_source, tmp_path):
+        (tmp_path / "sample.bin").write_bytes(b"cached")
+        path = download_named_file("sample", dest_folder=str(tmp_path))
+        assert Path(path).read_bytes() == b"cached"
+        assert fake_source["responses"] == []
+
+    def test_force_redownloads(self, fake_source, tmp_path):
+        (tmp_path / "sample.bin").write_bytes(b"cached")
+        path = download_named_file("sample", dest_folder=str(tmp_path), force=True)
+        assert Path(path).read_bytes() == fake_source["payload"]
+
+    def test_failed_transfer_keeps_only_part_file(self, fake_source, tmp_path):
+        fake_source["fail_after"] = 0
+        with pytest.raises(ConnectionError):
+            download_named_file("sample", dest_folder=str(tmp_path))
+        assert not (tmp_path / "sample.bin").exists()
+        assert (tmp_path / "sample.bin.part").exists()
+
+    def test_resumes_partial_download(self, fake_source, tmp_path):
+        payload = fake_source["payload"]
+        (tmp_path / "sample.bin.part").write_bytes(payload[:3000])
+        path = download_named_file("sample", dest_folder=str(tmp_path))
+        assert Path(path).read_bytes() == payload
+        assert fake_source["headers"][0]["Range"] == "bytes=3000-"
+        assert not (tmp_path / "sample.bin.part").exists()
+
+    def test_server_without_range_support_restarts(self, fake_source, tmp_path):
+        fake_source["supports_range"] = False
+        (tmp_path / "sample.bin.part").write_bytes(b"stale")
+        path = download_named_file("sample", dest_folder=str(tmp_path))
+        assert Path(path).read_bytes() == fake_source["payload"]
+
+    def test_force_discards_partial_download(self, fake_source, tmp_path):
+        (tmp_path / "sample.bin.part").write_bytes(b"stale")
+        download_named_file("sample", dest_folder=str(tmp_path), force=True)
+        assert "Range" not in fake_source["headers"][0]
+
+
+    def test_readme_sidecar(self, fake_source, tmp_path):
+        path = download_named_file("documented", dest_folder=str(tmp_path))
+        assert Path(path).name == "documented.bin"
+        assert (tmp_path / "documented_readme.md").read_bytes() == fake_source["payload"]
+
+
+class TestDownloadNamedFiles:
+
+    def test_downloads_all_names_in_order(self, fake_source, tmp_path):
+        paths = download_named_files(["sample", "other"], dest_folder=str(tmp_path))
+        assert [Path(p).name for p in paths] == ["sample.bin", "other.bin"]
+        assert all(Path(p).read_bytes() == fake_source["payload"] for p in paths)
+
+    def test_empty_list(self, fake_source, tmp_path):
+        assert download_named_files([], dest_folder=str(tmp_path)) == []
@@ -0,0 +1,304 @@
+"""
+Unit tests for the DEM sampling helpers behind data_utils.fast_resample_dem_to_modelgrid.
+
+Tests cover:
+- bilinear gather at pixel centres, between pixels and outside the array
+- nearest-neighbour gather with constant fill and edge clamping
+- detection of axis-aligned grids that GDAL can warp onto directly
+- fused numba sampling kernel agrees with the NumPy path
+- fast_resample_dem_to_modelgrid on a GeoTIFF, including the per-file cache
+  and clear_dem_cache
+- integer quantization of the result and dequantize_dem
+- build_sampling_plan / apply_sampling_plan reuse across rasters
+
+Run with: uv run pytest _SUPPORT/tests/test_fast_resample_dem.py -q
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+# Add src to path (mirrors the style in other tests in this directory)
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import data_utils
+from data_utils import (
+    _axis_aligned_transform,
+    _bilinear_gather,
+    _nearest_gather,
+    apply_sampling_plan,
+    build_sampling_plan,
+    dequantize_dem,
+    fast_resample_dem_to_modelgrid,
+)
+
+
+ARR = np.arange(12, dtype=np.float32).reshape(3, 4)
+
+
+# =============================================================================
+# _bilinear_gather
+# =============================================================================
+
+class TestBilinearGather:
+
+    def test_pixel_values_are_exact(self):
+        rows = np.array([0.0, 1.0, 2.0])
+        cols = np.array([0.0, 2.0, 3.0])
+        np.testing.assert_array_equal(_bilinear_gather(ARR, rows, cols, np.nan), [0.0, 6.0, 11.0])
+
+    def test_blends_neighbours(self):
+        vals = _bilinear_gather(ARR, np.array([0.5, 2.0]), np.array([0.5, 1.25]), np.nan)
+        np.testing.assert_allclose(vals, [2.5, 9.25])
+
+    def test_outside_gets_fill_value(self):
+        vals = _bilinear_gather(ARR, np.array([-0.6, 1.0]), np.array([0.0, 3.5]), -1.0)
+        np.testing.assert_array_equal(vals, [-1.0, -1.0])
+
+    def test_outer_half_pixel_takes_edge_values(self):
+        vals = _bilinear_gather(ARR, np.array([-0.3, 2.4, 1.0]), np.array([0.5, 3.0, 3.2]), -1.0)
+        np.testing.assert_allclose(vals, [0.5, 11.0, 7.0])
+
+    def test_nan_neighbour_propagates(self):
+        arr = ARR.copy()
+        arr[0, 1] = np.nan
+        vals = _bilinear_gather(arr, np.array([0.5, 2.0]), np.array([0.5, 2.0]), 0.0)
+        assert np.isnan(vals[0])
+        assert vals[1] == 10.0
+
+
+# =============================================================================
+# _nearest_gather
+# =============================================================================
+
+class TestNearestGather:
+
+    def test_rounds_to_nearest_pixel(self):
+        vals = _nearest_gather(ARR, np.array([0.4, 1.6]), np.array([2.6, 0.2]), np.nan)
+        np.testing.assert_array_equal(vals, [3.0, 8.0])
+
+    def test_outside_gets_fill_value(self):
+        vals = _nearest_gather(ARR, np.array([-1.0, 0.0]), np.array([0.0, 9.0]), -5.0)
+        np.testing.assert_array_equal(vals, [-5.0, -5.0])
+
+    def test_clamps_to_edge_without_fill_value(self):
+        vals = _nearest_gather(ARR, np.array([-3.0, 10.0]), np.array([-3.0, 10.0]))
+        np.testing.assert_array_equal(vals, [0.0, 11.0])
+
+
+# =============================================================================
+# _axis_aligned_transform
+# =============================================================================
+
+def _grid(delr, delc, angrot=0.0, xoff=1000.0, yoff=2000.0):
+    return SimpleNamespace(
+        delr=np.asarray(delr, dtype=float), delc=np.asarray(delc, dtype=float), angrot=angrot,
+        extent=(xoff, xoff + np.sum(delr), yoff, yoff + np.sum(delc)),
+    )
+
+
+class TestAxisAlignedTransform:
+
+    def test_uniform_unrotated_grid(self):
+        tr = _axis_aligned_transform(_grid([50.0] * 4, [25.0] * 3))
+        assert (tr.a, tr.e) == (50.0, -25.0)
+        assert (tr.c, tr.f) == (1000.0, 2075.0)
+
+    def test_rotated_grid_is_rejected(self):
+        assert _axis_aligned_transform(_grid([50.0] * 4, [25.0] * 3, angrot=15.0)) is None
+
+    def test_variable_spacing_is_rejected(self):
+        assert _axis_aligned_transform(_grid([50.0, 50.0, 10.0], [25.0] * 3)) is None
+
+
+# =============================================================================
+# _numba_sample_kernel
+# =============================================================================
+
+class TestNumbaSampleKernel:
+
+    @pytest.mark.parametrize("linear", [True, False])
+    @pytest.mark.parametrize("cval", [np.nan, -9.0])
+    def test_matches_numpy_path(self, linear, cval):
+        pytest.importorskip("numba")
+        kernel = data_utils._numba_sample_kernel()
+        rng = np.random.default_rng(1)
+        arr = rng.random((30, 40)).astype(np.float32) + 0.5
+        arr[3, 4] = np.nan
+        arr[10, 10] = -1.0
+        xs = rng.uniform(-3, 45, 2000)
+        ys = rng.uniform(-3, 33, 2000)
+
+        # Identity inverse transform: col = x, row = y
+        out = np.empty(xs.size, dtype=np.float32)
+        kernel(arr, 1.0, 0.0, 0.0, 0.0, 1.0, 0.0, xs, ys, linear, cval, True, out)
+
+        gather = _bilinear_gather if linear else _nearest_gather
+        ref = gather(arr, ys, xs, cval)
+        missing = ~np.isfinite(ref)
+        ref[missing] = _nearest_gather(arr, ys[missing], xs[missing])
+        ref = np.where(ref <= 0.0, np.nan, ref)
+        np.testing.assert_allclose(out, ref, atol=1e-5)
+
+
+# =============================================================================
+# fast_resample_dem_to_modelgrid
+# =============================================================================
+
+@pytest.fixture
+def dem_and_grid(tmp_path):
+    """20 x 20 GeoTIFF (10 m pixels) and a model grid matching it cell for cell."""
+    rasterio = pytest.importorskip("rasterio")
+    from rasterio.transform import from_origin
+
+    values = (np.arange(20)[:, None] * 100 + np.arange(20)[None, :] + 1).astype(np.float32)
+    path = tmp_path / "dem.tif"
+    with rasterio.open(
+        path, "w", driver="GTiff", width=20, height=20, count=1, dtype="float32",
+        crs="EPSG:2056", transform=from_origin(2600000.0, 1200200.0, 10.0, 10.0),
+    ) as dst:
+        dst.write(values, 1)
+
+    xc = 2600005.0 + 10.0 * np.arange(20)
+    yc = 1200195.0 - 10.0 * np.arange(20)
+    grid = SimpleNamespace(
+        nrow=20, ncol=20, delr=np.full(20, 10.0), delc=np.full(20, 10.0), angrot=0.0,
+        extent=(2600000.0, 2600200.0, 1200000.0, 1200200.0), crs="EPSG:2056",
+        xcellcenters=np.tile(xc, (20, 1)), ycellcenters=np.tile(yc[:, None], (1, 20)),
+    )
+    data_utils.clear_dem_cache()
+    yield path, grid, values
+    data_utils.clear_dem_cache()
+
+
+class TestFastResampleDem:
+
+    def test_matching_grid_reproduces_dem(self, dem_and_grid):
+        path, grid, values = dem_and_grid
+        out = fast_resample_dem_to_modelgrid(path, grid, method="nearest")
+        np.testing.assert_array_equal(out, values)
+
+    def test_repeated_calls_reuse_cached_warp(self, dem_and_grid):
+        path, grid, values = dem_and_grid
+        first = fast_resample_dem_to_modelgrid(path, grid, method="nearest")
+        first[:] = -1.0  # callers may modify the result freely
+        second = fast_resample_dem_to_modelgrid(path, grid, method="nearest")
+        assert data_utils._cached_dem_warp.cache_info().hits == 1
+        np.testing.assert_array_equal(second, values)
+
+    def test_clear_dem_cache_releases_arrays(self, dem_and_grid):
+        path, grid, values = dem_and_grid
+        fast_resample_dem_to_modelgrid(path, grid, method="nearest", fill_value=-9999.0)
+        fast_resample_dem_to_modelgrid(path, grid, method="nearest")
+        assert data_utils._cached_dem_window.cache_info().currsize == 1
+        assert data_utils._cached_dem_warp.cache_info().currsize == 1
+        data_utils.clear_dem_cache()
+        assert data_utils._cached_dem_window.cache_info().currsize == 0
+        assert data_utils._cached_dem_warp.cache_info().currsize == 0
+
+    def test_fine_dem_is_read_decimated(self, dem_and_grid):
+        path, grid, values = dem_and_grid
+        arr, tr, _ = data_utils._cached_dem_window(
+            str(path), None, "EPSG:2056", grid.extent, max_pixel=20.0, method="nearest",
+        )
+        assert arr.shape == (10, 10)
+        assert (tr.a, tr.e) == (20.0, -20.0)
+
+    def test_close_resolution_is_read_in_full(self, dem_and_grid):
+        path, grid, values = dem_and_grid
+        arr, tr, _ = data_utils._cached_dem_window(
+            str(path), None, "EPSG:2056", grid.extent, max_pixel=15.0,
+        )
+        np.testing.assert_array_equal(arr, values)
+        assert tr.a == 10.0
+
+    @pytest.mark.parametrize("method", ["nearest", "linear"])
+    def test_gather_path_samples_pixel_centres(self, dem_and_grid, method):
+        path, grid, values = dem_and_grid
+        # A finite fill_value routes the grid through the windowed gather path
+        out = fast_resample_dem_to_modelgrid(path, grid, method=method, fill_value=-9999.0)
+        np.testing.assert_allclose(out, values)
+
+    def test_small_blocks_match_single_block(self, dem_and_grid, monkeypatch):
+        path, grid, _ = dem_and_grid
+        whole = fast_resample_dem_to_modelgrid(path, grid, method="linear", fill_value=-1.0)
+        monkeypatch.setattr(data_utils, "_SAMPLE_BLOCK", 7)
+        blocked = fast_resample_dem_to_modelgrid(path, grid, method="linear", fill_value=-1.0)
+        np.testing.assert_array_equal(blocked, whole)
+
+
+# =============================================================================
+# Integer output
+# =============================================================================
+
+class TestQuantizedOutput:
+
+    def test_cast_rounds_and_marks_missing(self):
+        vals = np.array([[412.345, np.nan], [0.004, 1999.996]], dtype=np.float32)
+        out = data_utils._cast_dem(vals, "int32", 100)
+        assert out.dtype == np.int32
+        np.testing.assert_array_equal(out, [[41234, np.iinfo(np.int32).min], [0, 200000]])
+
+    def test_out_of_range_raises(self):
+        with pytest.raises(ValueError, match="int16"):
+            data_utils._cast_dem(np.array([450.0]), "int16", 100)
+
+    def test_round_trip(self):
+        vals = np.array([[412.0, np.nan], [3999.0, 1.0]], dtype=np.float32)
+        out = dequantize_dem(data_utils._cast_dem(vals, "int16", 1), scale=1)
+        np.testing.assert_array_equal(out, vals)
+        assert out.dtype == np.float32
+
+    def test_resample_to_int16(self, dem_and_grid):
+        path, grid, values = dem_and_grid
+        out = fast_resample_dem_to_modelgrid(path, grid, dtype="int16")
+        assert out.dtype == np.int16
+        np.testing.assert_array_equal(out, values.astype(np.int16))
+
+
+# =============================================================================
+# Sampling plans
+# =============================================================================
+
+def _write_like(path, src_path, values, transform=None):
+    import rasterio
+
+    with rasterio.open(src_path) as src:
+        profile = src.profile
+    if transform is not None:
+        profile.update(transform=transform)
+    with rasterio.open(path, "w", **profile) as dst:
+        dst.write(values, 1)
+    return path
+
+
+class TestSamplingPlan:
+
+    @pytest.mark.parametrize("method", ["nearest", "linear"])
+    def test_matches_direct_resample(self, dem_and_grid, method):
+        path, grid, values = dem_and_grid
+        plan = build_sampling_plan(path, grid, method=method)
+        out = apply_sampling_plan(plan, path, fill_value=-9999.0)
+        direct = fast_resample_dem_to_modelgrid(path, grid, method=method, fill_value=-9999.0)
+        np.testing.assert_array_equal(out, direct)
+
+    def test_reused_for_second_raster(self, dem_and_grid, tmp_path):
+        path, grid, values = dem_and_grid
+        plan = build_sampling_plan(path, grid)
+        bottom = _write_like(tmp_path / "bottom.tif", path, values * 0.5)
+        np.testing.assert_array_equal(apply_sampling_plan(plan, bottom), values * 0.5)
+
+    def test_other_pixel_grid_is_rejected(self, dem_and_grid, tmp_path):
+        from rasterio.transform import from_origin
+
+        path, grid, values = dem_and_grid
+        plan = build_sampling_plan(path, grid)
+        coarse = _write_like(tmp_path / "coarse.tif", path, values,
+                             transform=from_origin(2600000.0, 1200200.0, 20.0, 20.0))
+        with pytest.raises(ValueError, match="sampling plan"):
+            apply_sampling_plan(plan, coarse)
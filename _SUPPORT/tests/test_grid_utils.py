@@ -0,0 +1,832 @@
+"""
+Unit tests for the grid/boundary helpers in grid_utils.
+
+Tests cover:
+- grid_to_gdf: cell polygons, corner order, row/col columns, rotated grids
+- grid_to_ragged_array / backend="geoarrow": GeoArrow-layout buffers
+- _unary_union: memoized prepared union, invalidation on edits, repair
+- compute_active_mask: area fractions against a per-cell intersection reference,
+  uniform-grid fast path, irregular/rotated grids, threaded intersections
+- compute_active_mask(method="raster"): supersampled fractions, fallback
+- compute_active_mask(method="centers"): cell-centre containment
+- interpolate_isohypses_to_grid: clipping, vertex extraction, linear field,
+  multi-part lines
+- _detect_elevation_column: standard names, numeric fallback
+- alternative_raster_interpolation: vectorised raster sampling, rotated grids
+- numba raster kernels match the NumPy paths
+- ibound_from_active: layer stacking, read-only view, dtype
+- build_grid_gdf_and_ibound: end-to-end wrapper
+- build_ibound_by_row_bands: banded IBOUND matches the full-grid result
+- intersect_boundary_with_flopy_grid(_buffer_opt): boundary line parts, extent
+  clipping, cellids, buffered fallback only when the lines miss
+- GridIntersect cache: reuse per modelgrid, invalidation, clearing
+- assign_ibound_from_intersection: vectorized cellid assignment vs per-cell path
+- debug_grid_and_boundary: whole grid drawn as a single PolyCollection
+
+Run with: uv run pytest _SUPPORT/tests/test_grid_utils.py -q
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import flopy
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pytest
+import shapely
+import shapely.affinity
+from shapely.geometry import LineString, MultiLineString, Point, Polygon, box
+
+# Add src to path (mirrors the style in other tests in this directory)
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import grid_utils
+from grid_utils import (
+    alternative_raster_interpolation,
+    compute_active_mask,
+    grid_to_gdf,
+    ibound_from_active,
+    interpolate_isohypses_to_grid,
+)
+
+
+# =============================================================================
+# Test Fixtures
+# =============================================================================
+
+def _structured_grid(delr, delc, xoff=0.0, yoff=0.0, angrot=0.0):
+    delr = np.asarray(delr, dtype=float)
+    delc = np.asarray(delc, dtype=float)
+    nrow, ncol = len(delc), len(delr)
+    return flopy.discretization.StructuredGrid(
+        delc=delc,
+        delr=delr,
+        top=np.ones((nrow, ncol)) * 100.0,
+        botm=np.zeros((1, nrow, ncol)),
+        nlay=1,
+        xoff=xoff,
+        yoff=yoff,
+        angrot=angrot,
+    )
+
+
+@pytest.fixture
+def uniform_grid():
+    """4 x 5 grid of 100 m cells with its lower-left corner at (1000, 2000)."""
+    return _structured_grid([100.0] * 5, [100.0] * 4, xoff=1000.0, yoff=2000.0)
+
+
+@pytest.fixture
+def boundary_gdf():
+    """Boundary with a notch, cutting through several cells of uniform_grid."""
+    shell = Polygon([
+        (1050.0, 2030.0), (1420.0, 2030.0), (1420.0, 2370.0),
+        (1250.0, 2370.0), (1250.0, 2200.0), (1050.0, 2200.0),
+    ])
+    return gpd.GeoDataFrame({"id": [1]}, geometry=[shell], crs="EPSG:2056")
+
+
+def _reference_fraction(grid_gdf, boundary_gdf):
+    """Per-cell intersection area over cell area (the original implementation)."""
+    boundary = boundary_gdf.geometry.union_all()
+    areas = grid_gdf.geometry.area.to_numpy()
+    inter = grid_gdf.geometry.intersection(boundary).area.to_numpy()
+    return np.where(areas > 0, inter / areas, 0.0)
+
+
+def _reference_polygons(modelgrid):
+    """Cell polygons built one by one (the original implementation)."""
+    xv, yv = modelgrid.xvertices, modelgrid.yvertices
+    return [
+        Polygon([
+            (xv[r, c], yv[r, c]),
+            (xv[r, c + 1], yv[r, c + 1]),
+            (xv[r + 1, c + 1], yv[r + 1, c + 1]),
+            (xv[r + 1, c], yv[r + 1, c]),
+        ])
+        for r in range(modelgrid.nrow)
+        for c in range(modelgrid.ncol)
+    ]
+
+
+# =============================================================================
+# grid_to_gdf
+# =============================================================================
+
+class TestGridToGdf:
+
+    def test_rows_cols_and_crs(self, uniform_grid):
+        gdf = grid_to_gdf(uniform_grid, crs="EPSG:2056")
+        assert list(gdf.columns) == ["row", "col", "geometry"]
+        assert len(gdf) == 20
+        assert gdf["row"].tolist() == [r for r in range(4) for _ in range(5)]
+        assert gdf["col"].tolist() == list(range(5)) * 4
+        assert gdf.crs.to_epsg() == 2056
+        assert gdf["row"].dtype == np.int32 and gdf["col"].dtype == np.int32
+
+    def test_first_cell_is_top_left(self, uniform_grid):
+        gdf = grid_to_gdf(uniform_grid)
+        assert gdf.geometry.iloc[0].equals(box(1000.0, 2300.0, 1100.0, 2400.0))
+
+    @pytest.mark.parametrize("angrot", [0.0, 30.0])
+    def test_matches_per_cell_construction(self, angrot):
+        grid = _structured_grid([10.0, 20.0, 40.0], [5.0, 15.0], xoff=7.0, yoff=3.0,
+                                angrot=angrot)
+        gdf = grid_to_gdf(grid)
+        for got, ref in zip(gdf.geometry, _reference_polygons(grid)):
+            assert got.equals_exact(ref, 0.0)
+
+    @pytest.mark.parametrize("angrot", [0.0, 30.0])
+    def test_geoarrow_backend_matches(self, angrot):
+        grid = _structured_grid([10.0, 20.0, 40.0], [5.0, 15.0], xoff=7.0, yoff=3.0,
+                                angrot=angrot)
+        gdf = grid_to_gdf(grid, backend="geoarrow")
+        for got, ref in zip(gdf.geometry, _reference_polygons(grid)):
+            assert got.equals_exact(ref, 0.0)
+
+    def test_ragged_array_matches_shapely_layout(self, uniform_grid):
+        geom_type, coords, offsets = grid_utils.grid_to_ragged_array(uniform_grid)
+        ref_type, ref_coords, ref_offsets = shapely.to_ragged_array(
+            grid_to_gdf(uniform_grid).geometry.values
+        )
+        assert geom_type == ref_type
+        np.testing.assert_array_equal(coords, ref_coords)
+        for got, ref in zip(offsets, ref_offsets):
+            np.testing.assert_array_equal(got, ref)
+
+    def test_unknown_backend(self, uniform_grid):
+        with pytest.raises(ValueError):
+            grid_to_gdf(uniform_grid, backend="arrow")
+
+
+# =============================================================================
+# _unary_union
+# =============================================================================
+
+class TestUnaryUnion:
+
+    def test_repeated_calls_reuse_prepared_union(self, boundary_gdf):
+        grid_utils._cached_union.cache_clear()
+        first = grid_utils._unary_union(boundary_gdf)
+        second = grid_utils._unary_union(boundary_gdf.copy())
+        assert second is first
+        assert shapely.is_prepared(first)
+        assert grid_utils._cached_union.cache_info().hits == 1
+
+    def test_edited_boundary_is_recomputed(self, boundary_gdf):
+        first = grid_utils._unary_union(boundary_gdf)
+        edited = boundary_gdf.copy()
+        edited.geometry = edited.geometry.translate(xoff=1.0)
+        second = grid_utils._unary_union(edited)
+        assert second is not first
+        assert second.equals(shapely.affinity.translate(first, xoff=1.0))
+
+    def test_multi_part_union(self):
+        gdf = gpd.GeoDataFrame(geometry=[box(0, 0, 2, 2), box(1, 1, 3, 3)])
+        assert grid_utils._unary_union(gdf).area == pytest.approx(7.0)
+
+    def test_repair_fixes_only_invalid_geometries(self):
+        bowtie = Polygon([(0, 0), (2, 2), (2, 0), (0, 2)])
+        gdf = gpd.GeoDataFrame(geometry=[bowtie, box(5, 5, 6, 6), None])
+        unified = grid_utils._unary_union(gdf, repair=True)
+        assert unified.is_valid
+        assert unified.area == pytest.approx(shapely.make_valid(bowtie).area + 1.0)
+
+    def test_empty_raises(self):
+        with pytest.raises(ValueError):
+            grid_utils._unary_union(gpd.GeoDataFrame(geometry=[]))
+
+
+# =============================================================================
+# compute_active_mask
+# =============================================================================
+
+class TestComputeActiveMask:
+
+    def test_matches_reference_fraction(self, uniform_grid, boundary_gdf):
+        grid_gdf = grid_to_gdf(uniform_grid, crs=boundary_gdf.crs)
+        out = compute_active_mask(grid_gdf, boundary_gdf)
+        expected = _reference_fraction(grid_gdf, boundary_gdf)
+        np.testing.assert_allclose(out["frac_inside"], expected, atol=1e-12)
+        np.testing.assert_array_equal(out["active"], expected >= 0.5)
+        # The boundary produces all three classes of cells
+        assert (expected == 0).any() and (expected == 1).any()
+        assert ((expected > 0) & (expected < 1)).any()
+
+    def test_threshold(self, uniform_grid, boundary_gdf):
+        grid_gdf = grid_to_gdf(uniform_grid, crs=boundary_gdf.crs)
+        out = compute_active_mask(grid_gdf, boundary_gdf, frac_threshold=0.0)
+        assert out["active"].all()
+
+    def test_boundary_outside_grid(self, uniform_grid):
+        far = gpd.GeoDataFrame(geometry=[box(0.0, 0.0, 10.0, 10.0)], crs="EPSG:2056")
+        out = compute_active_mask(grid_to_gdf(uniform_grid, crs=far.crs), far)
+        assert (out["frac_inside"] == 0).all() and not out["active"].any()
+
+    def test_uniform_grid_fast_path(self, monkeypatch):
+        grid = _structured_grid([10.0] * 60, [10.0] * 50, xoff=-3.0, yoff=4.0)
+        disk = Point(290.0, 260.0).buffer(180.0)
+        ring = disk.difference(Point(310.0, 240.0).buffer(60.0))
+        boundary = gpd.GeoDataFrame(geometry=[ring, box(-50.0, -50.0, 20.0, 600.0)])
+        grid_gdf = grid_to_gdf(grid)
+
+        def _unused(*args):
+            raise AssertionError("uniform grids should not take the STRtree path")
+
+        monkeypatch.setattr(grid_utils, "_fraction_inside", _unused)
+        out = compute_active_mask(grid_gdf, boundary)
+        np.testing.assert_allclose(
+            out["frac_inside"], _reference_fraction(grid_gdf, boundary), atol=1e-12
+        )
+
+    @pytest.mark.parametrize("angrot", [0.0, 25.0])
+    def test_irregular_grids_match_reference(self, boundary_gdf, angrot):
+        grid = _structured_grid([60.0, 90.0, 120.0, 100.0], [80.0, 150.0, 130.0],
+                                xoff=1000.0, yoff=2000.0, angrot=angrot)
+        grid_gdf = grid_to_gdf(grid, crs=boundary_gdf.crs)
+        out = compute_active_mask(grid_gdf, boundary_gdf)
+        np.testing.assert_allclose(
+            out["frac_inside"], _reference_fraction(grid_gdf, boundary_gdf), atol=1e-12
+        )
+
+    @pytest.mark.parametrize("angrot", [0.0, 25.0])
+    def test_threaded_intersections_match(self, monkeypatch, boundary_gdf, angrot):
+        monkeypatch.setattr(grid_utils, "_PARALLEL_MIN_CELLS", 1)
+        grid = _structured_grid([40.0] * 12, [40.0] * 10, xoff=1000.0, yoff=2000.0,
+                                angrot=angrot)
+        grid_gdf = grid_to_gdf(grid, crs=boundary_gdf.crs)
+        out = compute_active_mask(grid_gdf, boundary_gdf, max_workers=4)
+        np.testing.assert_allclose(
+            out["frac_inside"], _reference_fraction(grid_gdf, boundary_gdf), atol=1e-12
+        )
+
+    def test_intersection_areas_keep_order(self, monkeypatch):
+        monkeypatch.setattr(grid_utils, "_PARALLEL_MIN_CELLS", 1)
+        cells = shapely.box(np.arange(7.0), 0.0, np.arange(7.0) + 1.0, 1.0)
+        boundary = Point(3.5, 0.5).buffer(2.2)
+        serial = grid_utils._intersection_areas(cells, boundary, max_workers=1)
+        threaded = grid_utils._intersection_areas(cells, boundary, max_workers=3)
+        np.testing.assert_array_equal(threaded, serial)
+
+    def test_zero_area_cells(self, boundary_gdf):
+        cells = np.array([box(1100, 2100, 1200, 2200), Polygon([(1100, 2100)] * 3),
+                          box(1040, 2100, 1060, 2120)])
+        frac = grid_utils._fraction_inside(cells, grid_utils._unary_union(boundary_gdf))
+        np.testing.assert_allclose(frac, [1.0, 0.0, 0.5])
+
+    def test_input_is_not_modified(self, uniform_grid, boundary_gdf):
+        grid_gdf = grid_to_gdf(uniform_grid, crs=boundary_gdf.crs)
+        compute_active_mask(grid_gdf, boundary_gdf)
+        assert list(grid_gdf.columns) == ["row", "col", "geometry"]
+
+
+class TestComputeActiveMaskRaster:
+
+    def test_aligned_boundary_is_exact(self, uniform_grid):
+        # Vertices on the 12.5 m sub-pixel lattice of an 8x supersample
+        shell = Polygon([(1050.0, 2025.0), (1412.5, 2025.0), (1412.5, 2362.5),
+                         (1050.0, 2362.5)])
+        boundary = gpd.GeoDataFrame(geometry=[shell], crs="EPSG:2056")
+        grid_gdf = grid_to_gdf(uniform_grid, crs=boundary.crs)
+        out = compute_active_mask(grid_gdf, boundary, method="raster")
+        np.testing.assert_allclose(
+            out["frac_inside"], _reference_fraction(grid_gdf, boundary), atol=1e-12
+        )
+
+    def test_close_to_exact(self, uniform_grid, boundary_gdf):
+        grid_gdf = grid_to_gdf(uniform_grid, crs=boundary_gdf.crs)
+        out = compute_active_mask(grid_gdf, boundary_gdf, method="raster", supersample=16)
+        expected = _reference_fraction(grid_gdf, boundary_gdf)
+        np.testing.assert_allclose(out["frac_inside"], expected, atol=0.05)
+
+    def test_rotated_grid_falls_back_to_exact(self, boundary_gdf):
+        grid = _structured_grid([100.0] * 5, [100.0] * 4, xoff=1000.0, yoff=2000.0,
+                                angrot=10.0)
+        grid_gdf = grid_to_gdf(grid, crs=boundary_gdf.crs)
+        out = compute_active_mask(grid_gdf, boundary_gdf, method="raster")
+        np.testing.assert_allclose(
+            out["frac_inside"], _reference_fraction(grid_gdf, boundary_gdf), atol=1e-12
+        )
+
+    def test_missing_row_col_falls_back_to_exact(self, uniform_grid, boundary_gdf):
+        grid_gdf = grid_to_gdf(uniform_grid, crs=boundary_gdf.crs).drop(columns=["row", "col"])
+        out = compute_active_mask(grid_gdf, boundary_gdf, method="raster")
+        np.testing.assert_allclose(
+            out["frac_inside"], _reference_fraction(grid_gdf, boundary_gdf), atol=1e-12
+        )
+
+    def test_unknown_method(self, uniform_grid, boundary_gdf):
+        with pytest.raises(ValueError, match="method"):
+            compute_active_mask(grid_to_gdf(uniform_grid), boundary_gdf, method="fast")
+
+
+class TestComputeActiveMaskCenters:
+
+    def test_cell_centres_inside(self, uniform_grid, boundary_gdf):
+        grid_gdf = grid_to_gdf(uniform_grid, crs=boundary_gdf.crs)
+        out = compute_active_mask(grid_gdf, boundary_gdf, method="centers")
+        centres = grid_gdf.geometry.centroid
+        expected = centres.within(boundary_gdf.geometry.iloc[0]).to_numpy()
+        np.testing.assert_array_equal(out["active"], expected)
+        assert set(out["frac_inside"]) <= {0.0, 1.0}
+
+    def test_matches_half_threshold_for_straight_edge(self, uniform_grid):
+        half_plane = gpd.GeoDataFrame(
+            geometry=[box(1000.0, 2000.0, 1230.0, 2400.0)], crs="EPSG:2056"
+        )
+        grid_gdf = grid_to_gdf(uniform_grid, crs=half_plane.crs)
+        centers = compute_active_mask(grid_gdf, half_plane, method="centers")
+        exact = compute_active_mask(grid_gdf, half_plane)
+        np.testing.assert_array_equal(centers["active"], exact["active"])
+
+
+# =============================================================================
+# interpolate_isohypses_to_grid
+# =============================================================================
+
+@pytest.fixture
+def isohypses():
+    """North-south contour lines whose elevation equals their x coordinate."""
+    xs = np.arange(900.0, 1650.0, 50.0)
+    lines = [LineString([(x, 1900.0), (x, 2150.0), (x, 2500.0)]) for x in xs]
+    lines[3] = MultiLineString([[(xs[3], 1900.0), (xs[3], 2200.0)],
+                                [(xs[3], 2200.0), (xs[3], 2500.0)]])
+    return gpd.GeoDataFrame({"ELEV": xs}, geometry=lines, crs="EPSG:2056")
+
+
+class TestInterpolateIsohypses:
+
+    def test_reproduces_linear_field(self, uniform_grid, isohypses, capsys):
+        heads = interpolate_isohypses_to_grid(isohypses, uniform_grid, buffer_distance=100)
+        assert heads.shape == (4, 5)
+        np.testing.assert_allclose(heads, uniform_grid.xcellcenters, atol=1e-6)
+
+    def test_non_line_features_are_ignored(self, uniform_grid, isohypses, capsys):
+        extra = gpd.GeoDataFrame({"ELEV": [-999.0]}, geometry=[Point(1200.0, 2200.0)],
+                                 crs=isohypses.crs)
+        mixed = gpd.GeoDataFrame(
+            pd.concat([isohypses, extra], ignore_index=True), crs=isohypses.crs
+        )
+        heads = interpolate_isohypses_to_grid(mixed, uniform_grid, buffer_distance=100)
+        np.testing.assert_allclose(heads, uniform_grid.xcellcenters, atol=1e-6)
+
+    def test_clips_to_buffered_extent(self, uniform_grid, isohypses, capsys):
+        far = gpd.GeoDataFrame(
+            {"ELEV": [-999.0, 5000.0]},
+            geometry=[LineString([(5000.0, 5000.0), (5100.0, 5100.0)]),
+                      LineString([(1000.0, 9000.0), (1500.0, 9000.0)])],
+            crs=isohypses.crs,
+        )
+        gdf = gpd.GeoDataFrame(pd.concat([isohypses, far], ignore_index=True),
+                               crs=isohypses.crs)
+        heads = interpolate_isohypses_to_grid(gdf, uniform_grid, buffer_distance=50)
+        np.testing.assert_allclose(heads, uniform_grid.xcellcenters, atol=1e-6)
+        out = capsys.readouterr().out
+        # 15 contours in total, of which x = 900 and x = 1600 fall outside
+        assert "Original isohypses: 17 features" in out
+        assert "Clipped isohypses: 13 features" in out
+
+    def test_clipping_matches_geopandas(self, uniform_grid, isohypses, capsys):
+        window = box(950.0, 1950.0, 1550.0, 2450.0)
+        ref = interpolate_isohypses_to_grid(
+            gpd.clip(isohypses, window), uniform_grid, buffer_distance=1e6
+        )
+        heads = interpolate_isohypses_to_grid(isohypses, uniform_grid, buffer_distance=50)
+        np.testing.assert_allclose(heads, ref, atol=1e-9)
+
+    def test_outside_hull_filled_with_nearest(self, uniform_grid, isohypses, capsys):
+        # Contours only cover the western half; the rest is nearest-filled
+        west = isohypses[isohypses["ELEV"] <= 1250.0]
+        heads = interpolate_isohypses_to_grid(west, uniform_grid, buffer_distance=100)
+        assert not np.isnan(heads).any()
+        np.testing.assert_allclose(heads[:, -1], 1250.0)
+        assert "nearest neighbor" in capsys.readouterr().out
+
+
+class TestDetectElevationColumn:
+
+    def test_standard_name_wins(self, isohypses):
+        gdf = isohypses.assign(id=np.arange(len(isohypses)), Z=0.0)
+        assert grid_utils._detect_elevation_column(gdf) == "ELEV"
+
+    def test_first_numeric_column(self, isohypses):
+        gdf = isohypses.rename(columns={"ELEV": "kote"})
+        gdf.insert(0, "name", "x")
+        gdf.insert(1, "flag", True)
+        assert grid_utils._detect_elevation_column(gdf) == "kote"
+
+    def test_none_without_numeric_columns(self, isohypses):
+        gdf = isohypses.drop(columns="ELEV").assign(name="x")
+        assert grid_utils._detect_elevation_column(gdf) is None
+
+    def test_non_standard_column_is_used(self, uniform_grid, isohypses, capsys):
+        gdf = isohypses.rename(columns={"ELEV": "kote"})
+        heads = interpolate_isohypses_to_grid(gdf, uniform_grid, buffer_distance=100)
+        np.testing.assert_allclose(heads, uniform_grid.xcellcenters, atol=1e-6)
+        assert "Using column 'kote'" in capsys.readouterr().out
+
+
+class TestAlternativeRasterInterpolation:
+
+    def test_matches_per_point_rowcol(self, uniform_grid, isohypses):
+        from rasterio.features import rasterize
+        from rasterio.transform import from_bounds, rowcol
+
+        out = alternative_raster_interpolation(isohypses, uniform_grid, cell_size=10)
+        assert out.shape == (4, 5)
+
+        xmin, xmax, ymin, ymax = uniform_grid.extent
+        transform = from_bounds(xmin, ymin, xmax, ymax, 50, 40)
+        raster = rasterize(list(zip(isohypses.geometry, isohypses["ELEV"])),
+                           out_shape=(40, 50), transform=transform, dtype=np.float32)
+        expected = [
+            raster[rowcol(transform, x, y)]
+            for x, y in zip(uniform_grid.xcellcenters.ravel(), uniform_grid.ycellcenters.ravel())
+        ]
+        np.testing.assert_array_equal(out.ravel(), expected)
+
+
+    @pytest.mark.parametrize("numba_min_cells", [10**9, 1])
+    def test_rotated_grid_sorted_sampling(self, monkeypatch, isohypses, numba_min_cells):
+        from rasterio.features import rasterize
+        from rasterio.transform import from_bounds, rowcol
+
+        if numba_min_cells == 1:
+            pytest.importorskip("numba")
+        monkeypatch.setattr(grid_utils, "_NUMBA_MIN_CELLS", numba_min_cells)
+        grid = _structured_grid([50.0] * 8, [50.0] * 6, xoff=1100.0, yoff=2000.0,
+                                angrot=35.0)
+        out = alternative_raster_interpolation(isohypses, grid, cell_size=10)
+
+        xmin, xmax, ymin, ymax = grid.extent
+        width, height = int((xmax - xmin) / 10), int((ymax - ymin) / 10)
+        transform = from_bounds(xmin, ymin, xmax, ymax, width, height)
+        raster = rasterize(list(zip(isohypses.geometry, isohypses["ELEV"])),
+                           out_shape=(height, width), transform=transform, dtype=np.float32)
+        expected = []
+        for x, y in zip(grid.xcellcenters.ravel(), grid.ycellcenters.ravel()):
+            r, c = rowcol(transform, x, y)
+            inside = 0 <= r < height and 0 <= c < width
+            expected.append(raster[r, c] if inside else np.nan)
+        np.testing.assert_array_equal(out.ravel(), expected)
+
+
+class TestNumbaRasterKernels:
+
+    @pytest.fixture(autouse=True)
+    def _kernels(self):
+        pytest.importorskip("numba")
+        self.reduce, self.sample = grid_utils._numba_raster_kernels()
+
+    def test_fraction_reduce(self):
+        rng = np.random.default_rng(0)
+        burned = rng.integers(0, 2, size=(3 * 4, 5 * 4)).astype(np.uint8)
+        out = np.empty((3, 5))
+        self.reduce(burned, 4, out)
+        np.testing.assert_allclose(out, burned.reshape(3, 4, 5, 4).mean(axis=(1, 3)))
+
+    def test_sample_raster(self):
+        raster = np.arange(12, dtype=np.float32).reshape(3, 4)
+        rows_f = np.array([0.2, 2.9, -0.1, 1.5, 3.0])
+        cols_f = np.array([0.0, 3.5, 1.0, 4.0, 0.0])
+        out = np.empty(5, dtype=np.float32)
+        self.sample(raster, rows_f, cols_f, out)
+        np.testing.assert_array_equal(out, [0.0, 11.0, np.nan, np.nan, np.nan])
+
+    def test_compute_active_mask_raster_uses_kernel(self, monkeypatch, uniform_grid,
+                                                    boundary_gdf):
+        grid_gdf = grid_to_gdf(uniform_grid, crs=boundary_gdf.crs)
+        expected = compute_active_mask(grid_gdf, boundary_gdf, method="raster")
+        monkeypatch.setattr(grid_utils, "_NUMBA_MIN_CELLS", 1)
+        out = compute_active_mask(grid_gdf, boundary_gdf, method="raster")
+        np.testing.assert_allclose(out["frac_inside"], expected["frac_inside"])
+
+    def test_alternative_raster_interpolation_uses_kernel(self, monkeypatch, uniform_grid,
+                                                          isohypses):
+        expected = alternative_raster_interpolation(isohypses, uniform_grid, cell_size=10)
+        monkeypatch.setattr(grid_utils, "_NUMBA_MIN_CELLS", 1)
+        out = alternative_raster_interpolation(isohypses, uniform_grid, cell_size=10)
+        np.testing.assert_array_equal(out, expected)
+
+
+# =============================================================================
+# ibound_from_active
+# =============================================================================
+
+@pytest.fixture
+def active_gdf(uniform_grid, boundary_gdf):
+    grid_gdf = grid_to_gdf(uniform_grid, crs=boundary_gdf.crs)
+    return compute_active_mask(grid_gdf, boundary_gdf)
+
+
+class TestIboundFromActive:
+
+    def test_layers(self, active_gdf):
+        ibound = ibound_from_active(active_gdf, nlay=3)
+        assert ibound.shape == (3, 4, 5)
+        expected = active_gdf["active"].to_numpy().reshape(4, 5).astype(int)
+        for layer in ibound:
+            np.testing.assert_array_equal(layer, expected)
+        ibound[0, 0, 0] = -1  # writable, layers independent
+        assert ibound[1, 0, 0] == expected[0, 0]
+
+    def test_custom_values(self, active_gdf):
+        ibound = ibound_from_active(active_gdf, active_value=2, inactive_value=-1)
+        assert set(np.unique(ibound)) == {-1, 2}
+
+    def test_shuffled_and_partial_rows(self, active_gdf):
+        expected = ibound_from_active(active_gdf)
+        shuffled = active_gdf.sample(frac=1.0, random_state=0)
+        np.testing.assert_array_equal(ibound_from_active(shuffled), expected)
+        # A missing cell (here the last one) stays inactive
+        partial = active_gdf.iloc[:-1]
+        out = ibound_from_active(partial)
+        assert out[0, -1, -1] == 0
+        np.testing.assert_array_equal(out[0].ravel()[:-1], expected[0].ravel()[:-1])
+
+    def test_view(self, active_gdf):
+        view = ibound_from_active(active_gdf, nlay=20, as_view=True)
+        np.testing.assert_array_equal(view, ibound_from_active(active_gdf, nlay=20))
+        assert not view.flags.writeable
+        assert view.base is not None and view.strides[0] == 0
+
+    def test_dtype(self, active_gdf):
+        assert ibound_from_active(active_gdf).dtype == np.int32
+        small = ibound_from_active(active_gdf, dtype=np.int8)
+        assert small.dtype == np.int8
+        np.testing.assert_array_equal(small, ibound_from_active(active_gdf))
+
+    def test_value_must_fit_dtype(self, active_gdf):
+        with pytest.raises(ValueError, match="int8"):
+            ibound_from_active(active_gdf, active_value=300, dtype=np.int8)
+
+    def test_missing_field(self, active_gdf):
+        with pytest.raises(KeyError):
+            ibound_from_active(active_gdf, active_field="inside")
+
+
+class TestBuildGridGdfAndIbound:
+
+    def test_wrapper(self, uniform_grid, boundary_gdf):
+        grid_gdf, ibound = grid_utils.build_grid_gdf_and_ibound(
+            uniform_grid, boundary_gdf, nlay=2, dtype=np.int8
+        )
+        assert {"frac_inside", "active"} <= set(grid_gdf.columns)
+        assert ibound.shape == (2, 4, 5) and ibound.dtype == np.int8
+        np.testing.assert_array_equal(
+            ibound[1], grid_gdf["active"].to_numpy().reshape(4, 5)
+        )
+
+
+class TestBuildIboundByRowBands:
+
+    @pytest.mark.parametrize("chunk_rows", [1, 3, 500])
+    @pytest.mark.parametrize("angrot", [0.0, 25.0])
+    def test_matches_full_grid(self, boundary_gdf, chunk_rows, angrot):
+        grid = _structured_grid([40.0] * 12, [40.0] * 10, xoff=1000.0, yoff=2000.0,
+                                angrot=angrot)
+        _, expected = grid_utils.build_grid_gdf_and_ibound(grid, boundary_gdf, nlay=2)
+        got = grid_utils.build_ibound_by_row_bands(
+            grid, boundary_gdf, nlay=2, chunk_rows=chunk_rows
+        )
+        assert got.dtype == expected.dtype
+        np.testing.assert_array_equal(got, expected)
+
+    def test_invalid_chunk_rows(self, uniform_grid, boundary_gdf):
+        with pytest.raises(ValueError):
+            grid_utils.build_ibound_by_row_bands(uniform_grid, boundary_gdf, chunk_rows=0)
+
+
+# =============================================================================
+# GridIntersect boundary helpers
+# =============================================================================
+
+@pytest.fixture
+def boundary_segments():
+    """West boundary split over a LineString and a MultiLineString, plus an east edge."""
+    return gpd.GeoDataFrame(
+        {"desc": ["west", "west", "east"]},
+        geometry=[
+            LineString([(1050.0, 2000.0), (1050.0, 2150.0)]),
+            MultiLineString([[(1050.0, 2150.0), (1050.0, 2300.0)],
+                             [(1050.0, 2300.0), (1050.0, 2400.0)]]),
+            LineString([(1450.0, 2000.0), (1450.0, 2400.0)]),
+        ],
+        crs="EPSG:2056",
+    )
+
+
+def _cellid_set(cellids):
+    return {tuple(int(v) for v in c) for c in cellids["cellids"]}
+
+
+class TestIntersectBoundaryWithFlopyGrid:
+
+    def test_line_parts_in_row_order(self, boundary_segments):
+        parts = grid_utils._boundary_line_parts(boundary_segments)
+        assert len(parts) == 4
+        assert [p.coords[0][1] for p in parts[:3]] == [2000.0, 2150.0, 2300.0]
+
+    def test_line_parts_clipped_to_bounds(self, boundary_segments):
+        far = gpd.GeoDataFrame(
+            {"desc": ["west", "west"]},
+            geometry=[LineString([(0.0, 0.0), (10.0, 0.0)]),
+                      LineString([(900.0, 2200.0), (1200.0, 2200.0)])],
+            crs=boundary_segments.crs,
+        )
+        gdf = pd.concat([boundary_segments.iloc[:2], far], ignore_index=True)
+        parts = grid_utils._boundary_line_parts(gdf, clip_bounds=(1000, 2000, 1500, 2400))
+        assert len(parts) == 4  # three west parts kept whole, one cut, one dropped
+        assert parts[-1].equals(LineString([(1000.0, 2200.0), (1200.0, 2200.0)]))
+        assert parts[0].equals(gdf.geometry.iloc[0])
+
+    def test_line_on_grid_edge_is_kept(self, uniform_grid, capsys):
+        edge = gpd.GeoDataFrame(
+            {"desc": ["west"]}, geometry=[LineString([(1000.0, 1500.0), (1000.0, 2900.0)])]
+        )
+        res = grid_utils.intersect_boundary_with_flopy_grid(edge, uniform_grid)
+        assert res["boundary_multiline"].equals(LineString([(1000.0, 2000.0), (1000.0, 2400.0)]))
+        assert _cellid_set(res["intersected_cellids"]) >= {(r, 0) for r in range(4)}
+
+    def test_boundary_outside_grid(self, uniform_grid, capsys):
+        far = gpd.GeoDataFrame(
+            {"desc": ["west"]}, geometry=[LineString([(0.0, 0.0), (10.0, 0.0)])]
+        )
+        res = grid_utils.intersect_boundary_with_flopy_grid(far, uniform_grid)
+        assert len(res["intersected_cellids"]) == 0
+        res = grid_utils.intersect_boundary_with_flopy_grid_buffer_opt(
+            far, uniform_grid, buffer_distance=10.0, check_crs=False, debug=False
+        )
+        assert res["intersection_type"] == "none"
+
+    def test_cells_along_west_edge(self, uniform_grid, boundary_segments, capsys):
+        res = grid_utils.intersect_boundary_with_flopy_grid(boundary_segments, uniform_grid)
+        assert _cellid_set(res["intersected_cellids"]) == {(r, 0) for r in range(4)}
+        assert res["boundary_multiline"].geom_type == "MultiLineString"
+        assert len(res["boundary_multiline"].geoms) == 3
+
+    def test_buffer_opt_geometries(self, uniform_grid, boundary_segments, capsys):
+        res = grid_utils.intersect_boundary_with_flopy_grid_buffer_opt(
+            boundary_segments, uniform_grid, buffer_distance=10.0, check_crs=False,
+            debug=False,
+        )
+        assert res["intersection_type"] == "linestring"
+        assert _cellid_set(res["intersected_cellids"]) == {(r, 0) for r in range(4)}
+        # Lines hit, so the buffered fallback is never built
+        assert res["boundary_buffered"] is None
+
+    def test_buffer_opt_falls_back_to_buffer(self, uniform_grid, capsys):
+        # Just west of the grid: the lines miss, their 10 m buffers reach column 0
+        near = gpd.GeoDataFrame(
+            {"desc": ["west", "west"]},
+            geometry=[LineString([(995.0, 2000.0), (995.0, 2150.0)]),
+                      LineString([(995.0, 2150.0), (995.0, 2400.0)])],
+        )
+        res = grid_utils.intersect_boundary_with_flopy_grid_buffer_opt(
+            near, uniform_grid, buffer_distance=10.0, check_crs=False, debug=False,
+        )
+        assert res["intersection_type"] == "polygon_buffered"
+        assert _cellid_set(res["intersected_cellids"]) == {(r, 0) for r in range(4)}
+        buffered = res["boundary_buffered"]
+        assert res["used_geometry"] is buffered
+        assert buffered.geom_type == "MultiPolygon" and len(buffered.geoms) == 2
+        ref = [g.buffer(10.0) for g in res["boundary_multiline"].geoms]
+        assert all(a.equals(b) for a, b in zip(buffered.geoms, ref))
+
+    def test_detailed_on_request(self, uniform_grid, boundary_segments, capsys):
+        plain = grid_utils.intersect_boundary_with_flopy_grid(boundary_segments, uniform_grid)
+        assert plain["detailed_intersection"] is None
+        res = grid_utils.intersect_boundary_with_flopy_grid(
+            boundary_segments, uniform_grid, detailed=True
+        )
+        np.testing.assert_allclose(res["detailed_intersection"]["lengths"].sum(), 400.0)
+
+    def test_buffer_opt_detailed_on_request(self, uniform_grid, boundary_segments, capsys):
+        kwargs = dict(buffer_distance=10.0, check_crs=False, debug=False)
+        plain = grid_utils.intersect_boundary_with_flopy_grid_buffer_opt(
+            boundary_segments, uniform_grid, **kwargs
+        )
+        assert plain["detailed_intersection"] is None
+        res = grid_utils.intersect_boundary_with_flopy_grid_buffer_opt(
+            boundary_segments, uniform_grid, detailed=True, **kwargs
+        )
+        assert len(res["detailed_intersection"]) == 4
+
+    def test_missing_desc(self, uniform_grid, boundary_segments, capsys):
+        assert grid_utils.intersect_boundary_with_flopy_grid(
+            boundary_segments, uniform_grid, desc_filter="north"
+        ) is None
+
+
+class TestGridIntersectCache:
+
+    @pytest.fixture(autouse=True)
+    def _clear(self):
+        grid_utils.clear_gix_cache()
+        yield
+        grid_utils.clear_gix_cache()
+
+    def test_reused_across_boundaries(self, uniform_grid, boundary_segments, capsys):
+        west = grid_utils.intersect_boundary_with_flopy_grid(boundary_segments, uniform_grid)
+        east = grid_utils.intersect_boundary_with_flopy_grid(
+            boundary_segments, uniform_grid, desc_filter="east"
+        )
+        assert west["grid_intersect"] is east["grid_intersect"]
+        assert _cellid_set(east["intersected_cellids"]) == {(r, 4) for r in range(4)}
+
+    def test_rebuilt_after_grid_moves(self, uniform_grid):
+        first = grid_utils._grid_intersect(uniform_grid)
+        uniform_grid.set_coord_info(xoff=0.0, yoff=0.0)
+        assert grid_utils._grid_intersect(uniform_grid) is not first
+
+    def test_clear(self, uniform_grid):
+        first = grid_utils._grid_intersect(uniform_grid)
+        grid_utils.clear_gix_cache()
+        assert grid_utils._grid_intersect(uniform_grid) is not first
+
+
+class TestAssignIboundFromIntersection:
+
+    @staticmethod
+    def _results(cellids):
+        rec = np.empty(len(cellids), dtype=[("cellids", "O")])
+        rec["cellids"] = cellids
+        return {"intersected_cellids": rec.view(np.recarray)}
+
+    @pytest.fixture
+    def ibound3d(self):
+        ib = np.ones((2, 4, 5), dtype=np.int32)
+        ib[:, 0, 0] = 0
+        return ib
+
+    @pytest.mark.parametrize("cellids", [
+        [(0, 0), (1, 0), (1, 0), (3, 4), (9, 9)],
+        [(1, 1, 0), (0, 2, 3), (0, 0, 0), (5, 1, 1)],
+    ])
+    @pytest.mark.parametrize("ndim", [2, 3])
+    def test_vectorized_matches_per_cell(self, monkeypatch, uniform_grid, ibound3d,
+                                         cellids, ndim, capsys):
+        ibound = ibound3d if ndim == 3 else ibound3d[0].copy()
+        results = self._results(cellids)
+        fast = grid_utils.assign_ibound_from_intersection(ibound, results, uniform_grid)
+        monkeypatch.setattr(grid_utils, "_cellid_index_array", lambda cellids: None)
+        slow = grid_utils.assign_ibound_from_intersection(ibound, results, uniform_grid)
+        np.testing.assert_array_equal(fast, slow)
+        assert (fast == -1).any()
+        assert "Discrepancy" not in capsys.readouterr().out
+
+    def test_only_active_cells_change(self, uniform_grid, ibound3d, capsys):
+        out = grid_utils.assign_ibound_from_intersection(
+            ibound3d, self._results([(0, 0), (2, 2)]), uniform_grid
+        )
+        assert (out[:, 0, 0] == 0).all() and (out[:, 2, 2] == -1).all()
+        assert (ibound3d == 1).sum() == 38  # input untouched
+
+    def test_gridintersect_output(self, uniform_grid, boundary_segments, ibound3d, capsys):
+        res = grid_utils.intersect_boundary_with_flopy_grid(boundary_segments, uniform_grid)
+        out = grid_utils.assign_ibound_from_intersection(ibound3d, res, uniform_grid)
+        expected = ibound3d.copy()
+        expected[:, 1:, 0] = -1
+        np.testing.assert_array_equal(out, expected)
+
+    def test_per_cell_trace_only_with_debug(self, uniform_grid, ibound3d, capsys):
+        results = {"intersected_cellids": [((0, 1),), ((1, 2),)]}  # per-cell path
+        quiet = grid_utils.assign_ibound_from_intersection(ibound3d, results, uniform_grid)
+        assert "Processing cellid" not in capsys.readouterr().out
+        loud = grid_utils.assign_ibound_from_intersection(
+            ibound3d, results, uniform_grid, debug=True
+        )
+        assert "Processing cellid 1: ((1, 2),)" in capsys.readouterr().out
+        np.testing.assert_array_equal(quiet, loud)
+        assert quiet[0, 0, 1] == -1 and quiet[0, 1, 2] == -1
+
+    def test_per_cell_errors_warn_instead_of_print(self, uniform_grid, ibound3d, capsys):
+        results = {"intersected_cellids": [("a", "b"), ((1, 2),)]}  # per-cell path
+        with pytest.warns(UserWarning, match="Could not process cellid"):
+            out = grid_utils.assign_ibound_from_intersection(ibound3d, results, uniform_grid)
+        assert "Error" not in capsys.readouterr().out
+        assert out[0, 1, 2] == -1
+
+
+class TestDebugGridAndBoundary:
+
+    def test_overview_draws_every_cell_as_one_collection(self, uniform_grid, boundary_segments,
+                                                         monkeypatch, capsys):
+        matplotlib = pytest.importorskip("matplotlib")
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+        from matplotlib.collections import PolyCollection
+
+        monkeypatch.setattr(plt, "show", lambda *a, **k: None)
+        grid_utils.debug_grid_and_boundary(boundary_segments, uniform_grid)
+        try:
+            ax1 = plt.gcf().axes[0]
+            polys = [c for c in ax1.collections if isinstance(c, PolyCollection)]
+            assert len(polys) == 1
+            assert len(polys[0].get_paths()) == uniform_grid.nrow * uniform_grid.ncol
+            assert not ax1.patches
+        finally:
+            plt.close("all")
@@ -8,6 +8,7 @@ Tests cover:
 - Mixed scenario: one raise, others succeed
 - Report structure and counts
 - format_cache_report output
+- Concurrent fetching keeps report items in input order; workers overlap
 
 Run with: uv run pytest _SUPPORT/tests/test_warm_data_cache.py -v
 """
@@ -206,6 +207,64 @@ class TestFailureIsolation:
         assert report["counts"]["FAILED"] == 2
 
 
+# =============================================================================
+# Tests: concurrent fetching
+# =============================================================================
+
+class TestConcurrentFetch:
+    """Items are fetched in parallel but reported in the order of gis_names."""
+
+    def test_items_keep_input_order(self, monkeypatch, tmp_path):
+        import time
+
+        names = [f"layer_{n}" for n in range(6)]
+        fake_dl, _ = _make_fake_download(tmp_path)
+
+        def slow_dl(name, dest_folder=None, data_type=None):
+            # Later names finish first when run in parallel
+            time.sleep(0.05 * (len(names) - int(name.split("_")[1])))
+            return fake_dl(name, dest_folder=dest_folder, data_type=data_type)
+
+        monkeypatch.setattr(data_utils, "download_named_file", slow_dl)
+        monkeypatch.setattr(data_utils, "get_data_urls", _make_fake_get_data_urls(names))
+
+        report = warm_data_cache(gis_names=names, data_dir=str(tmp_path), verbose=False, max_workers=3)
+
+        assert [i["key"] for i in report["items"]] == names
+        assert report["counts"]["DOWNLOADED"] == len(names)
+
+    def test_workers_run_concurrently(self, monkeypatch, tmp_path):
+        import threading
+
+        names = [f"layer_{n}" for n in range(6)]
+        # Every download waits until three are in flight; a serial run breaks the barrier
+        barrier = threading.Barrier(3, timeout=10)
+        fake_dl, _ = _make_fake_download(tmp_path)
+
+        def gated_dl(name, dest_folder=None, data_type=None):
+            barrier.wait()
+            return fake_dl(name, dest_folder=dest_folder, data_type=data_type)
+
+        monkeypatch.setattr(data_utils, "download_named_file", gated_dl)
+        monkeypatch.setattr(data_utils, "get_data_urls", _make_fake_get_data_urls(names))
+
+        report = warm_data_cache(gis_names=names, data_dir=str(tmp_path), verbose=False, max_workers=3)
+
+        assert not barrier.broken
+        assert report["counts"]["DOWNLOADED"] == len(names)
+
+    def test_single_worker(self, monkeypatch, tmp_path):
+        names = ["layer_a", "layer_b"]
+        fake_dl, calls = _make_fake_download(tmp_path)
+        monkeypatch.setattr(data_utils, "download_named_file", fake_dl)
+        monkeypatch.setattr(data_utils, "get_data_urls", _make_fake_get_data_urls(names))
+
+        report = warm_data_cache(gis_names=names, data_dir=str(tmp_path), verbose=False, max_workers=1)
+
+        assert [c[0] for c in calls] == names
+        assert report["ok"] is True
+
+
 # =============================================================================
 # Tests: total_mb accounting
 # =============================================================================